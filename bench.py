@@ -0,0 +1,331 @@
+# bench.py
+"""
+Reproduzierbare Benchmarks über synthetische Bestandsexporte (siehe herdgen.py).
+
+    python bench.py --rows 1000 10000 100000 --label v1.4
+    python bench.py --compare v1.3 v1.4
+    python bench.py --rows --cards 100 1000     # nur Kartenraster zeichnen
+
+Gemessen werden die echten Methoden des Hauptfensters (offscreen, ohne
+sichtbares Fenster): CSV laden, Index bauen, IDs auflösen, Datumsrechnung,
+Zustand speichern/laden, HTML-Erzeugung und das Befüllen der Kartenraster.
+Die Ergebnisse landen als JSON in bench_results/<label>.json und können
+zwischen zwei Ständen verglichen werden.
+
+Mit --cards wird zusätzlich das Kartenraster mit N Karten gemessen (Aufbau,
+Stylesheet-Polish, Layout, erstes Zeichnen, Bildzeit beim Scrollen), jeweils in der
+Standard- und der sparsamen Darstellung. Ziel ist eine Bildzeit unter
+FRAME_BUDGET_MS auch bei reinem Software-Rendering.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pandas as pd  # noqa: E402
+import PySide6  # noqa: E402
+from PySide6.QtCore import QSettings  # noqa: E402
+from PySide6.QtWidgets import QApplication, QGridLayout, QScrollArea, QWidget  # noqa: E402
+
+import herdgen  # noqa: E402
+import main  # noqa: E402
+from report import ReportSection, render_row, tier_key  # noqa: E402
+
+RESULTS_DIR = "bench_results"
+DEFAULT_ROWS = (1_000, 10_000, 100_000)
+# Anzahl aufzulösender IDs je Lauf (unabhängig von der Bestandsgröße begrenzt)
+MAX_RESOLVE_IDS = 10_000
+# Ab diesem Faktor gilt eine Stufe beim Vergleich als langsamer geworden
+REGRESSION_FACTOR = 1.2
+# … und mindestens so viel absolut (Stufen unter 1 ms schwanken stark)
+REGRESSION_MIN_MS = 1.0
+# Bildzeit für flüssiges Scrollen (60 Hz)
+FRAME_BUDGET_MS = 1000 / 60
+SCROLL_FRAMES = 60
+RENDER_MODES = {"standard": False, "sparsam": True}
+
+
+def _timed(func, repeat: int) -> tuple[dict, object]:
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": round(min(durations), 3), "median_ms": round(statistics.median(durations), 3),
+            "runs": repeat}, result
+
+
+def run_size(window: main.MainWindow, rows: int, repeat: int, workdir: str) -> dict:
+    csv_path = os.path.join(workdir, f"bestand_{rows}.csv")
+    if not os.path.isfile(csv_path):
+        herdgen.write_herd_csv(csv_path, rows)
+    results: dict[str, dict] = {}
+
+    results["csv_load"], df = _timed(lambda: window.load_csv_data(csv_path), repeat)
+    results["index_build"], index = _timed(lambda: window.build_index(df), repeat)
+    window._herd = index
+    results["lineage_build"], window._lineage = _timed(lambda: main.LineageIndex(index), repeat)
+
+    # nächster Tagesexport: 1 % Abgänge, 1 % geänderte Zeilen, 1 % Zugänge
+    results["export_fingerprint"], fingerprint = _timed(lambda: main.ExportFingerprint.from_frame(df), repeat)
+    step = 100
+    changed = df.drop(df.index[::step])
+    changed.iloc[1::step, changed.columns.get_loc("Rasse(n)")] = "PI"
+    arrivals = df.iloc[::step].assign(**{"Ohrmarke-Name": lambda d: d["Ohrmarke-Name"].str.replace("AT", "AT9", n=1)})
+    next_fingerprint = main.ExportFingerprint.from_frame(pd.concat([changed, arrivals]))
+    results["export_diff"], _ = _timed(lambda: main.diff_exports(fingerprint, next_fingerprint), repeat)
+
+    ids = herdgen.sample_ids(df, min(rows, MAX_RESOLVE_IDS))
+    results["id_resolution"], processed = _timed(lambda: window.process_tier_ids(ids, index), repeat)
+    results["date_math"], _ = _timed(lambda: window.reprocess_data(processed), repeat)
+    results["plan_index"], _ = _timed(window._rebuild_plan_index, repeat)
+
+    def stats():
+        window._herd_stats.invalidate()
+        return window._herd_stats.compute(index, window.schlachtalter_rules, datetime.now().date())
+    results["herd_stats"], _ = _timed(stats, repeat)
+
+    # Stallplätze wie im Betrieb belegen
+    slots_einzel = main.NUM_EINZELPLAETZE
+    slots_gruppe = main.NUM_GRUPPENBOXEN * main.GRUPPENBOX_SLOTS
+    window.model.set_raw_ids(main.SECTION_EINZELPLAETZE, ids[:slots_einzel])
+    window.model.set_raw_ids(main.SECTION_GRUPPENBOXEN, ids[slots_einzel:slots_einzel + slots_gruppe])
+    window.model.set_slots(main.SECTION_EINZELPLAETZE, processed[:slots_einzel])
+    window.model.set_slots(main.SECTION_GRUPPENBOXEN, processed[slots_einzel:slots_einzel + slots_gruppe])
+    window._index_rule_dependencies(main.SECTION_EINZELPLAETZE)
+    window._index_rule_dependencies(main.SECTION_GRUPPENBOXEN)
+
+    results["state_save"], _ = _timed(window.save_state, repeat)
+    results["state_load"], _ = _timed(window.load_state, repeat)
+    # eine Platzänderung im Journal (inkl. fsync) – das kostet jede Umstallung
+    results["journal_append"], _ = _timed(lambda: window._journal_slots(main.SECTION_EINZELPLAETZE, [0]), repeat)
+
+    def html_board():
+        render_row.cache_clear()
+        return window.generate_print_html_einzelplaetze() + window.generate_print_html_gruppenboxen()
+    results["html_board"], _ = _timed(html_board, repeat)
+
+    def html_herd():
+        render_row.cache_clear()
+        rows_html = [render_row((str(n + 1),), tier_key(t)) for n, t in enumerate(processed)]
+        return window._report_renderer.render("Bestand", [ReportSection(heading=None, rows=rows_html)], ("Nr.",))
+    results["html_resolved"], _ = _timed(html_herd, repeat)
+
+    def populate():
+        window.rebuild_boards()
+        QApplication.processEvents()
+    results["grid_populate"], _ = _timed(populate, repeat)
+
+    memory = {"dataframe_mb": round(df.memory_usage(deep=True).sum() / 2**20, 2),
+              "store_mb": round(index.nbytes() / 2**20, 2)}
+    return {"ids": len(ids), "stages": results, "memory": memory}
+
+
+def _render_tiers(window: main.MainWindow) -> list[dict | None]:
+    """Gemischte Karteninhalte (belegt, frei, unbekannt) wie auf einer echten Stalltafel."""
+    df = herdgen.generate_herd(2_000)
+    index = window.build_index(df)
+    return window.process_tier_ids(herdgen.sample_ids(df, 500), index)
+
+
+def run_cards(window: main.MainWindow, count: int, low_cost: bool, tiers: list[dict | None],
+              repeat: int) -> dict:
+    """Misst Aufbau, erstes Zeichnen und Scrollen eines Rasters mit `count` Einzelplatz-Karten."""
+    window.low_cost_rendering = low_cost
+    samples: dict[str, list[float]] = {"construct": [], "polish": [], "layout": [], "first_paint": [], "scroll_frame": []}
+    for _ in range(repeat):
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.resize(1600, 900)
+        content = QWidget()
+        grid = QGridLayout(content)
+        grid.setSpacing(20)
+        grid.setContentsMargins(10, 10, 10, 10)
+
+        start = time.perf_counter()
+        for i in range(count):
+            card = window.create_einzelplatz_card(i + 1, tiers[i % len(tiers)])
+            grid.addWidget(card, *divmod(i, main.EINZELPLATZ_COLUMNS))
+        samples["construct"].append(time.perf_counter() - start)
+
+        # Stylesheets auflösen und anwenden (QStyle::polish für alle Karten-Widgets)
+        start = time.perf_counter()
+        content.ensurePolished()
+        samples["polish"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        scroll.setWidget(content)
+        grid.activate()
+        samples["layout"].append(time.perf_counter() - start)
+
+        # erstes Zeichnen: Fenster anzeigen und die Ereignisse bis zum Expose abarbeiten
+        start = time.perf_counter()
+        scroll.show()
+        QApplication.processEvents()
+        samples["first_paint"].append(time.perf_counter() - start)
+
+        bar = scroll.verticalScrollBar()
+        step = max(1, bar.maximum() // SCROLL_FRAMES) if bar.maximum() else 0
+        for n in range(SCROLL_FRAMES if step else 0):
+            bar.setValue(n * step)
+            start = time.perf_counter()
+            scroll.viewport().repaint()
+            samples["scroll_frame"].append(time.perf_counter() - start)
+
+        scroll.close()
+        scroll.deleteLater()
+        QApplication.processEvents()
+
+    stages = {}
+    for name, values in samples.items():
+        if not values:
+            continue
+        ms = sorted(v * 1000 for v in values)
+        stages[name] = {"min_ms": round(ms[0], 3), "median_ms": round(statistics.median(ms), 3),
+                        "runs": len(ms)}
+        if name == "scroll_frame":
+            p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+            stages[name]["p95_ms"] = round(p95, 3)
+            stages[name]["budget_ok"] = p95 <= FRAME_BUDGET_MS
+    return {"cards": count, "stages": stages}
+
+
+def _version_label() -> str:
+    try:
+        out = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        if out.returncode == 0 and out.stdout.strip():
+            return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+@contextlib.contextmanager
+def isolated_app(workdir: str):
+    """
+    Hauptfenster nur mit Dateien und Einstellungen im Arbeitsordner.
+
+    Zustand, Journale, Startbild und Einstellungen des Anwenders bleiben
+    unberührt; Stallnetz, Web-Ansicht und Register starten nicht, damit keine
+    Testbelegung an echte Terminals geht.
+    """
+    files = {
+        "DATA_DIR": workdir,
+        "STATE_FILE": "state.json",
+        "WAL_FILE": "state.wal",
+        "SYNC_STATE_FILE": "sync.json",
+        "MOVES_FILE": "umstallungen.jsonl",
+        "FINGERPRINT_FILE": "bestand_fingerabdruck.npz",
+        "START_IMAGE_FILE": main.START_IMAGE_NAME,
+    }
+    settings_path = os.path.join(workdir, "einstellungen.ini")
+    with contextlib.ExitStack() as stack:
+        for name, file_name in files.items():
+            stack.enter_context(mock.patch.object(main, name, os.path.join(workdir, file_name)))
+        stack.enter_context(mock.patch.object(
+            main, "QSettings", lambda *_args: QSettings(settings_path, QSettings.Format.IniFormat)))
+        for name in ("start_sync", "start_dashboard", "start_registry"):
+            stack.enter_context(mock.patch.object(main.MainWindow, name, lambda self: None))
+        yield
+
+
+def run(rows_list: list[int], repeat: int, label: str | None, out_dir: str,
+        card_counts: list[int] = ()) -> str:
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory(prefix="stalltafel_bench_") as workdir, isolated_app(workdir):
+        window = main.MainWindow()
+        results = {}
+        for rows in rows_list:
+            print(f"{rows:>9} Zeilen …", flush=True)
+            results[str(rows)] = run_size(window, rows, repeat, workdir)
+            for stage, values in results[str(rows)]["stages"].items():
+                print(f"    {stage:<16}{values['median_ms']:>11.1f} ms")
+            memory = results[str(rows)]["memory"]
+            print(f"    Speicher: DataFrame {memory['dataframe_mb']} MB, Store {memory['store_mb']} MB")
+        if card_counts:
+            tiers = _render_tiers(window)
+            for count in card_counts:
+                for mode, low_cost in RENDER_MODES.items():
+                    print(f"{count:>9} Karten ({mode}) …", flush=True)
+                    key = f"karten_{count}_{mode}"
+                    results[key] = run_cards(window, count, low_cost, tiers, repeat)
+                    for stage, values in results[key]["stages"].items():
+                        extra = ""
+                        if "p95_ms" in values:
+                            extra = (f"   p95 {values['p95_ms']:.1f} ms "
+                                     f"({'im' if values['budget_ok'] else 'über'} Budget {FRAME_BUDGET_MS:.1f} ms)")
+                        print(f"    {stage:<16}{values['median_ms']:>11.1f} ms{extra}")
+        window.close()
+        app.processEvents()
+
+    label = label or _version_label()
+    report = {
+        "label": label,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pyside6": PySide6.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{label}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Ergebnisse gespeichert: {path}")
+    return path
+
+
+def _load(label_or_path: str, out_dir: str) -> dict:
+    path = label_or_path if label_or_path.endswith(".json") else os.path.join(out_dir, f"{label_or_path}.json")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(old: str, new: str, out_dir: str) -> int:
+    """Vergleicht zwei Läufe; Rückgabewert 1, wenn eine Stufe langsamer geworden ist."""
+    before, after = _load(old, out_dir), _load(new, out_dir)
+    print(f"{'Lauf':>20}  {'Stufe':<16}{before['label']:>14}{after['label']:>14}   Faktor")
+    regressions = 0
+    for rows, result in after["results"].items():
+        old_stages = before["results"].get(rows, {}).get("stages", {})
+        for stage, values in result["stages"].items():
+            if stage not in old_stages:
+                continue
+            a, b = old_stages[stage]["median_ms"], values["median_ms"]
+            factor = b / a if a else float("inf")
+            slower = factor > REGRESSION_FACTOR and b - a > REGRESSION_MIN_MS
+            flag = "  ← langsamer" if slower else ""
+            regressions += bool(flag)
+            print(f"{rows:>20}  {stage:<16}{a:>11.1f} ms{b:>11.1f} ms   {factor:5.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks der Stalltafel mit synthetischen Beständen")
+    parser.add_argument("--rows", type=int, nargs="*", default=list(DEFAULT_ROWS),
+                        help="Bestandsgrößen (Zeilen), z. B. 1000 10000 1000000; leer = keine")
+    parser.add_argument("--cards", type=int, nargs="*", default=[],
+                        help="Kartenanzahlen für den Zeichen-Benchmark, z. B. 100 1000")
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen je Stufe")
+    parser.add_argument("--label", help="Name des Laufs (Standard: git describe)")
+    parser.add_argument("--out", default=RESULTS_DIR, help="Ordner für die Ergebnisse")
+    parser.add_argument("--compare", nargs=2, metavar=("ALT", "NEU"), help="zwei gespeicherte Läufe vergleichen")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(args.compare[0], args.compare[1], args.out))
+    run(args.rows, args.repeat, args.label, args.out, args.cards)
@@ -0,0 +1,248 @@
+# board.py
+"""
+Kartenraster der Stalltafel, gebunden an das gemeinsame Modell (model.py).
+
+`BoardGrid` füllt ein QGridLayout mit Karten und hört auf die Signale des
+Modells: bei `sectionReset` wird das Raster neu aufgebaut, bei `slotsChanged`
+werden nur die Karten der betroffenen Plätze ersetzt. Dasselbe Modell kann
+beliebig viele Raster speisen – im Hauptfenster und in abgelösten
+`BoardWindow`s, etwa auf einem Wandbildschirm im Stall.
+
+Karten lassen sich per Ziehen und Ablegen auf andere Plätze ziehen (auch in
+ein anderes Raster); das Raster meldet das nur (`slotDropped`), die
+Umstallung selbst übernimmt moves.py.
+
+Treffer der Suche (search.py) werden über die Eigenschaft `highlight` der
+Karten markiert; das Raster merkt sie sich, damit auch neu erzeugte Karten
+markiert bleiben.
+"""
+from typing import Callable, Iterable
+
+from PySide6.QtCore import QEvent, QMimeData, QObject, QPoint, Qt, Signal
+from PySide6.QtGui import QDrag, QKeySequence, QShortcut
+from PySide6.QtWidgets import QApplication, QGridLayout, QLayout, QScrollArea, QVBoxLayout, QWidget
+
+from cards import PaintedCard
+from model import StallModel
+from profiling import PROFILER
+
+
+def clear_grid_layout(layout: QLayout):
+    while layout.count():
+        item = layout.takeAt(0)
+        widget = item.widget()
+        if widget is not None:
+            widget.deleteLater()
+        child_layout = item.layout()
+        if child_layout is not None:
+            clear_grid_layout(child_layout)
+
+
+SLOT_MIME = "application/x-stalltafel-platz"
+
+
+def card_slot_at(card: QWidget, pos: QPoint) -> int:
+    """Platz innerhalb einer Karte unter `pos`; Widgets sind über die Eigenschaft `slot` zugeordnet."""
+    if isinstance(card, PaintedCard):
+        return card.slot_at(pos)
+    best, best_distance = 0, None
+    for child in card.findChildren(QWidget):
+        slot = child.property("slot")
+        if slot is None:
+            continue
+        top = child.mapTo(card, QPoint(0, 0)).y()
+        bottom = top + child.height()
+        distance = 0 if top <= pos.y() < bottom else min(abs(pos.y() - top), abs(pos.y() - bottom))
+        if best_distance is None or distance < best_distance:
+            best, best_distance = slot, distance
+    return best
+
+
+def replace_grid_card(layout: QGridLayout, index: int, cols: int, card: QWidget):
+    row, col = divmod(index, cols)
+    item = layout.itemAtPosition(row, col)
+    if item is not None and item.widget() is not None:
+        old = item.widget()
+        layout.removeWidget(old)
+        old.deleteLater()
+    layout.addWidget(card, row, col)
+
+
+class BoardGrid(QObject):
+    """
+    Ein Kartenraster für einen Bereich des Modells. Karte `n` zeigt die Plätze
+    `n * slots_per_card` bis `(n + 1) * slots_per_card - 1` (Einzelplätze: 1,
+    Gruppenboxen: Plätze je Box); `card_factory(n)` erzeugt die Karte.
+    """
+    slotDropped = Signal(str, int, str, int)
+    slotMenuRequested = Signal(str, int, QPoint)
+
+    def __init__(self, model: StallModel, section: str, layout: QGridLayout, cards: int, columns: int,
+                 slots_per_card: int, card_factory: Callable[[int], QWidget], parent: QObject | None = None):
+        super().__init__(parent)
+        self.model = model
+        self.section = section
+        self.layout = layout
+        self.cards = cards
+        self.columns = columns
+        self.slots_per_card = slots_per_card
+        self.card_factory = card_factory
+        self._press: tuple[QWidget, QPoint] | None = None
+        self._highlighted: set[int] = set()
+        model.sectionReset.connect(self._on_section_reset)
+        model.slotsChanged.connect(self._on_slots_changed)
+
+    def rebuild(self):
+        with PROFILER.span("render.populate", bereich=self.section):
+            clear_grid_layout(self.layout)
+            for n in range(self.cards):
+                row, col = divmod(n, self.columns)
+                self.layout.addWidget(self._prepare(n), row, col)
+        self._profile_paint()
+
+    def refresh_cards(self, card_indices: list[int]):
+        with PROFILER.span("render.slots", bereich=self.section, karten=len(card_indices)):
+            for n in card_indices:
+                replace_grid_card(self.layout, n, self.columns, self._prepare(n))
+
+    def _prepare(self, n: int) -> QWidget:
+        card = self.card_factory(n)
+        card.setProperty("board_card", n)
+        if n in self._highlighted:
+            card.setProperty("highlight", True)
+        card.setAcceptDrops(True)
+        card.installEventFilter(self)
+        return card
+
+    def card_widget(self, n: int) -> QWidget | None:
+        row, col = divmod(n, self.columns)
+        item = self.layout.itemAtPosition(row, col)
+        return item.widget() if item is not None else None
+
+    # --- Suchtreffer ---
+    def set_highlighted_slots(self, slots: Iterable[int]):
+        """Markiert die Karten mit diesen Plätzen; nur Karten, deren Markierung wechselt, werden angefasst."""
+        cards = {i // self.slots_per_card for i in slots if i // self.slots_per_card < self.cards}
+        for n in cards ^ self._highlighted:
+            card = self.card_widget(n)
+            if card is not None:
+                card.setProperty("highlight", n in cards)
+                if not isinstance(card, PaintedCard):
+                    card.style().unpolish(card)
+                    card.style().polish(card)
+                card.update()
+        self._highlighted = cards
+
+    def scroll_to_slot(self, index: int):
+        card = self.card_widget(index // self.slots_per_card)
+        parent = card.parentWidget() if card is not None else None
+        while parent is not None and not isinstance(parent, QScrollArea):
+            parent = parent.parentWidget()
+        if parent is not None:
+            parent.ensureWidgetVisible(card, 40, 40)
+
+    def _slot(self, card: QWidget, pos: QPoint) -> int:
+        local = min(card_slot_at(card, pos), self.slots_per_card - 1)
+        return card.property("board_card") * self.slots_per_card + local
+
+    # --- Ziehen und Ablegen ---
+    def eventFilter(self, card: QObject, event: QEvent) -> bool:
+        kind = event.type()
+        if kind == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            self._press = (card, event.position().toPoint())
+        elif kind == QEvent.Type.MouseMove and self._press and self._press[0] is card \
+                and event.buttons() & Qt.MouseButton.LeftButton:
+            start = self._press[1]
+            if (event.position().toPoint() - start).manhattanLength() >= QApplication.startDragDistance():
+                self._press = None
+                self._start_drag(card, start)
+                return True
+        elif kind in (QEvent.Type.DragEnter, QEvent.Type.DragMove):
+            if event.mimeData().hasFormat(SLOT_MIME):
+                event.acceptProposedAction()
+                return True
+        elif kind == QEvent.Type.Drop and event.mimeData().hasFormat(SLOT_MIME):
+            section, _, index = bytes(event.mimeData().data(SLOT_MIME)).decode().rpartition("/")
+            event.acceptProposedAction()
+            self.slotDropped.emit(section, int(index), self.section, self._slot(card, event.position().toPoint()))
+            return True
+        elif kind == QEvent.Type.ContextMenu:
+            self.slotMenuRequested.emit(self.section, self._slot(card, event.pos()), event.globalPos())
+            return True
+        return super().eventFilter(card, event)
+
+    def _start_drag(self, card: QWidget, pos: QPoint):
+        index = self._slot(card, pos)
+        if self.model.tier(self.section, index) is None:
+            return
+        mime = QMimeData()
+        mime.setData(SLOT_MIME, f"{self.section}/{index}".encode())
+        drag = QDrag(card)
+        drag.setMimeData(mime)
+        preview = card.grab()
+        drag.setPixmap(preview.scaledToWidth(max(1, preview.width() // 2),
+                                             Qt.TransformationMode.SmoothTransformation))
+        drag.exec(Qt.DropAction.MoveAction)
+
+    def _on_section_reset(self, section: str):
+        if section == self.section:
+            self.rebuild()
+
+    def _on_slots_changed(self, section: str, indices: list[int]):
+        if section != self.section:
+            return
+        cards = sorted({i // self.slots_per_card for i in indices if i // self.slots_per_card < self.cards})
+        if cards:
+            self.refresh_cards(cards)
+
+    def _profile_paint(self):
+        """Misst bei aktiver Zeitmessung das Zeichnen der Karten (inkl. Schatten) synchron."""
+        if not PROFILER.enabled:
+            return
+        content = self.layout.parentWidget()
+        if content is None or not content.isVisible():
+            return
+        with PROFILER.span("render.paint", bereich=self.section):
+            content.repaint()
+
+
+class BoardWindow(QWidget):
+    """
+    Abgelöstes Tafelfenster für einen Bereich. Es ist ein Kindfenster des
+    Hauptfensters und übernimmt damit dessen Stylesheet. F11 schaltet auf
+    Vollbild (Wandbildschirm), Esc verlässt das Vollbild.
+    """
+    closed = Signal(str)
+
+    def __init__(self, section: str, title: str, parent: QWidget):
+        super().__init__(parent, Qt.WindowType.Window)
+        self.section = section
+        self.setObjectName("CentralWidget")
+        self.setWindowTitle(title)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, True)
+        self.resize(1280, 800)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setObjectName("ScrollArea")
+        content = QWidget()
+        self.grid_layout = QGridLayout(content)
+        self.grid_layout.setSpacing(20)
+        self.grid_layout.setContentsMargins(10, 10, 10, 10)
+        scroll_area.setWidget(content)
+        layout.addWidget(scroll_area)
+
+        QShortcut(QKeySequence(Qt.Key.Key_F11), self, self.toggle_fullscreen)
+        QShortcut(QKeySequence(Qt.Key.Key_Escape), self, self.showNormal)
+
+    def toggle_fullscreen(self):
+        if self.isFullScreen():
+            self.showNormal()
+        else:
+            self.showFullScreen()
+
+    def closeEvent(self, event):
+        self.closed.emit(self.section)
+        super().closeEvent(event)
@@ -0,0 +1,210 @@
+# cards.py
+"""
+Sparsame Darstellung der Stallkarten.
+
+Eine Standardkarte besteht aus rund 25 Widgets (drei QLabels je Feld), einem
+eigenen Stylesheet und einem QGraphicsDropShadowEffect, der die Karte bei
+jedem Neuzeichnen offscreen rendert und weichzeichnet. Ohne GPU ist das der
+teuerste Teil beim Scrollen.
+
+`PaintedCard` ist ein einzelnes Widget, das Hintergrund, einen angedeuteten
+Schatten, Kopfzeile und Felder selbst zeichnet. Icons werden als Pixmaps
+zwischengespeichert, Stylesheets und Grafikeffekte entfallen.
+"""
+from functools import lru_cache
+
+from PySide6.QtCore import QPoint, QRect, QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen, QPixmap
+from PySide6.QtWidgets import QSizePolicy, QWidget
+import qtawesome as qta
+
+MARGIN_LEFT, MARGIN_TOP, MARGIN_RIGHT, MARGIN_BOTTOM = 15, 10, 15, 15
+ICON_WIDTH = 20
+LABEL_WIDTH = 80
+ROW_GAP = 10
+RADIUS = 10
+# Platz für den gezeichneten Schatten innerhalb des Widgets
+SHADOW = 4
+
+_BACKGROUND = QColor("#ffffff")
+_BORDER = QColor("#e6e9ea")
+# Suchtreffer, wie QFrame#SlotCard[highlight="true"] im Stylesheet
+_HIGHLIGHT = QColor("#f39c12")
+_TEXT = QColor("#333333")
+
+
+@lru_cache(maxsize=256)
+def icon_pixmap(name: str, color: str, size: int) -> QPixmap:
+    return qta.icon(name, color=color).pixmap(size, size)
+
+
+class PaintedCard(QWidget):
+    """
+    Selbst gezeichnete Stallkarte. Der Inhalt wird als Folge von Blöcken
+    beschrieben (Feldzeilen, Text, Trennlinie, Abstand) und beim Zeichnen
+    von oben nach unten gesetzt.
+    """
+
+    def __init__(self, title: str, header_icon: tuple[str, str] | None = None,
+                 header_text: str = "", center_body: bool = False,
+                 minimum: QSize = QSize(0, 0), parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.header_icon = header_icon
+        self.header_text = header_text
+        self.center_body = center_body
+        self._minimum = minimum
+        self._blocks: list[tuple] = []
+        # Platz innerhalb der Karte je Block (Gruppenboxen) und die beim Zeichnen belegten Bereiche
+        self._block_slots: list[int | None] = []
+        self._slot_spans: list[tuple[int, int, int]] = []
+        self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
+
+    # --- Inhalt ---
+    def add_rows(self, rows: list[tuple[str, str, str]], gap: int = ROW_GAP, slot: int | None = None):
+        """Feldzeilen (Icon, Beschriftung, Wert) wie bei den Standardkarten."""
+        self._add(("rows", rows, gap), slot)
+
+    def add_text(self, text: str, color: str = "#333333", italic: bool = False,
+                 bold: bool = False, center: bool = False, slot: int | None = None):
+        self._add(("text", text, color, italic, bold, center), slot)
+
+    def add_line(self):
+        self._add(("line",))
+
+    def add_spacing(self, height: int):
+        self._add(("space", height))
+
+    def _add(self, block: tuple, slot: int | None = None):
+        self._blocks.append(block)
+        self._block_slots.append(slot)
+
+    def slot_at(self, pos: QPoint) -> int:
+        """Platz innerhalb der Karte unter `pos` (nächstgelegener Block, sonst 0)."""
+        if not self._slot_spans:
+            return 0
+        return min(self._slot_spans,
+                   key=lambda span: 0 if span[0] <= pos.y() < span[1] else min(abs(pos.y() - span[0]),
+                                                                              abs(pos.y() - span[1])))[2]
+
+    # --- Größe ---
+    def _content_width(self, width: int) -> int:
+        return width - 2 * SHADOW - MARGIN_LEFT - MARGIN_RIGHT
+
+    def _header_height(self) -> int:
+        return max(24, self._title_metrics().height())
+
+    def _title_metrics(self) -> QFontMetrics:
+        return QFontMetrics(self._title_font())
+
+    def _title_font(self) -> QFont:
+        font = QFont(self.font())
+        font.setPixelSize(14)
+        font.setBold(True)
+        return font
+
+    def _block_height(self, block: tuple, width: int) -> int:
+        kind = block[0]
+        metrics = self.fontMetrics()
+        if kind == "rows":
+            row_h = max(16, metrics.height())
+            return len(block[1]) * row_h + max(0, len(block[1]) - 1) * block[2]
+        if kind == "text":
+            flags = Qt.TextFlag.TextWordWrap
+            return QFontMetrics(self._text_font(block)).boundingRect(
+                QRect(0, 0, max(1, width), 10_000), flags, block[1]).height() + 6
+        if kind == "line":
+            return 1
+        return block[1]
+
+    def _text_font(self, block: tuple) -> QFont:
+        font = QFont(self.font())
+        font.setItalic(block[3])
+        font.setBold(block[4])
+        return font
+
+    def _body_height(self, width: int) -> int:
+        heights = [self._block_height(b, width) for b in self._blocks]
+        return sum(heights) + ROW_GAP * len(heights)
+
+    def sizeHint(self) -> QSize:
+        width = max(self._minimum.width(), 250)
+        height = (2 * SHADOW + MARGIN_TOP + self._header_height()
+                  + self._body_height(self._content_width(width)) + MARGIN_BOTTOM)
+        return QSize(width, max(height, self._minimum.height()))
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
+
+    # --- Zeichnen ---
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        card = QRectF(self.rect()).adjusted(SHADOW, SHADOW - 2, -SHADOW, -SHADOW - 2)
+
+        # angedeuteter, weicher Schatten: wenige halbtransparente Ringe statt Weichzeichner
+        painter.setPen(Qt.PenStyle.NoPen)
+        for spread, alpha in ((4, 10), (3, 14), (2, 18), (1, 24)):
+            painter.setBrush(QColor(0, 0, 0, alpha))
+            painter.drawRoundedRect(card.adjusted(-spread, -spread + 3, spread, spread + 3),
+                                    RADIUS + spread, RADIUS + spread)
+        painter.setBrush(_BACKGROUND)
+        painter.setPen(QPen(_HIGHLIGHT, 2) if self.property("highlight") else QPen(_BORDER, 1))
+        painter.drawRoundedRect(card, RADIUS, RADIUS)
+
+        left = int(card.left()) + MARGIN_LEFT
+        width = int(card.width()) - MARGIN_LEFT - MARGIN_RIGHT
+        y = int(card.top()) + MARGIN_TOP
+
+        header_h = self._header_height()
+        painter.setFont(self._title_font())
+        painter.setPen(_TEXT)
+        painter.drawText(QRect(left, y, width, header_h),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, self.title)
+        if self.header_icon is not None:
+            painter.drawPixmap(left + width - 24, y, icon_pixmap(*self.header_icon, 24))
+        elif self.header_text:
+            painter.setFont(self.font())
+            painter.setPen(QColor("#7f8c8d"))
+            painter.drawText(QRect(left, y, width, header_h),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, self.header_text)
+        y += header_h + ROW_GAP
+
+        if self.center_body:
+            free = int(card.bottom()) - MARGIN_BOTTOM - y
+            y += max(0, (free - self._body_height(width)) // 2)
+
+        metrics = self.fontMetrics()
+        bold = QFont(self.font())
+        bold.setBold(True)
+        self._slot_spans = []
+        for block, slot in zip(self._blocks, self._block_slots):
+            height = self._block_height(block, width)
+            if slot is not None:
+                self._slot_spans.append((y, y + height, slot))
+            kind = block[0]
+            if kind == "rows":
+                row_h = max(16, metrics.height())
+                row_y = y
+                for icon, label, value in block[1]:
+                    painter.drawPixmap(left, row_y + (row_h - 16) // 2, icon_pixmap(icon, "#7f8c8d", 16))
+                    painter.setFont(self.font())
+                    painter.setPen(_TEXT)
+                    text_left = left + ICON_WIDTH + ROW_GAP
+                    painter.drawText(QRect(text_left, row_y, LABEL_WIDTH, row_h),
+                                     Qt.AlignmentFlag.AlignVCenter, label)
+                    painter.setFont(bold)
+                    value_left = text_left + LABEL_WIDTH + ROW_GAP
+                    painter.drawText(QRect(value_left, row_y, left + width - value_left, row_h),
+                                     Qt.AlignmentFlag.AlignVCenter, value)
+                    row_y += row_h + block[2]
+            elif kind == "text":
+                painter.setFont(self._text_font(block))
+                painter.setPen(QColor(block[2]))
+                align = Qt.AlignmentFlag.AlignHCenter if block[5] else Qt.AlignmentFlag.AlignLeft
+                painter.drawText(QRect(left, y + 3, width, height - 6), align | Qt.TextFlag.TextWordWrap, block[1])
+            elif kind == "line":
+                painter.setPen(QPen(QColor("#ecf0f1"), 1))
+                painter.drawLine(left, y, left + width, y)
+            y += height + ROW_GAP
@@ -0,0 +1,68 @@
+# charts.py
+"""Schlanke, selbst gezeichnete Diagramme für die Auswertungsseiten."""
+from PySide6.QtCore import QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+
+class BarChart(QWidget):
+    """Einfaches Balkendiagramm (vertikal) mit Beschriftung und Werten."""
+
+    def __init__(self, title: str = "", color: str = "#3498db", parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.color = QColor(color)
+        self._data: list[tuple[str, float]] = []
+        self.setMinimumSize(260, 200)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    def sizeHint(self) -> QSize:
+        return QSize(360, 240)
+
+    def set_data(self, data: list[tuple[str, float]]):
+        if data == self._data:
+            return
+        self._data = list(data)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        rect = QRectF(self.rect()).adjusted(10, 8, -10, -8)
+
+        title_font = QFont(self.font())
+        title_font.setBold(True)
+        title_font.setPointSize(title_font.pointSize() + 1)
+        painter.setFont(title_font)
+        painter.setPen(QColor("#34495e"))
+        title_h = painter.fontMetrics().height() + 6
+        painter.drawText(QRectF(rect.left(), rect.top(), rect.width(), title_h),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, self.title)
+
+        painter.setFont(self.font())
+        metrics = painter.fontMetrics()
+        label_h = metrics.height() + 4
+        plot = QRectF(rect.left(), rect.top() + title_h + label_h,
+                      rect.width(), rect.height() - title_h - 2 * label_h)
+        if not self._data or plot.height() <= 0:
+            painter.setPen(QColor("#95a5a6"))
+            painter.drawText(plot, Qt.AlignmentFlag.AlignCenter, "Keine Daten")
+            return
+
+        max_value = max(value for _, value in self._data) or 1
+        slot_w = plot.width() / len(self._data)
+        bar_w = max(4.0, slot_w * 0.65)
+        for n, (label, value) in enumerate(self._data):
+            x = plot.left() + n * slot_w + (slot_w - bar_w) / 2
+            bar_h = plot.height() * (value / max_value)
+            bar = QRectF(x, plot.bottom() - bar_h, bar_w, bar_h)
+            painter.fillRect(bar, self.color)
+
+            painter.setPen(QColor("#2c3e50"))
+            value_text = f"{value:g}"
+            painter.drawText(QRectF(x - slot_w, bar.top() - label_h, bar_w + 2 * slot_w, label_h),
+                             Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignBottom, value_text)
+            painter.setPen(QColor("#7f8c8d"))
+            text = metrics.elidedText(label, Qt.TextElideMode.ElideRight, int(slot_w))
+            painter.drawText(QRectF(plot.left() + n * slot_w, plot.bottom() + 2, slot_w, label_h),
+                             Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, text)
@@ -0,0 +1,183 @@
+# csvformat.py
+"""
+Format eines Bestandsexports aus den ersten Kilobytes erkennen.
+
+Der Export kommt normalerweise als UTF-8 mit BOM, Semikolon und doppelten
+Anführungszeichen. Nach einem Speichern in Excel ist es oft cp1252 und je
+nach Ländereinstellung Komma oder Tabulator, manchmal mit einer Zeile
+"sep=;" vorweg; umbenannte Spalten ("Ohrmarke", "Rasse") kommen auch vor.
+
+`sniff_csv_format` liest nur `SAMPLE_BYTES` vom Dateianfang und ermittelt
+daraus Kodierung, Trennzeichen und die Zuordnung der Kopfzeile zu den
+erwarteten Spaltennamen. Passt die Kopfzeile nicht, gibt es sofort einen
+`CsvFormatError` – ohne die ganze Datei zu lesen. `read_csv_export` liest
+dann mit dem C-Parser von pandas und genau den erkannten Einstellungen;
+das automatische Erkennen von pandas (`sep=None`) würde auf den langsamen
+Python-Parser ausweichen.
+"""
+import codecs
+import csv
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+SAMPLE_BYTES = 16 * 1024
+DELIMITERS = (";", ",", "\t", "|")
+# Excel (westeuropäisch) speichert "CSV" in cp1252; latin-1 kann jedes Byte lesen
+FALLBACK_ENCODINGS = ("cp1252", "latin-1")
+
+# weitere Schreibweisen der Spaltennamen (verglichen nach `_header_key`)
+HEADER_ALIASES = {
+    "Ohrmarke-Name": ("Ohrmarke", "Ohrmarken-Name", "Ohrmarkennummer", "Ohrmarke-Nr", "OM", "LOM"),
+    "Geburtsdatum": ("Geb.-Datum", "Geb.Datum", "Geburtstag", "Geboren"),
+    "Rasse(n)": ("Rasse", "Rassen"),
+    "Geschlecht": ("Geschl.",),
+    "OM-Mutter": ("Mutter", "Ohrmarke-Mutter", "OM Mutter", "Mutter-OM"),
+    "Zugang / Nachzucht": ("Zugang", "Zugangsdatum", "Zugangsdat."),
+}
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_SEP_LINE = re.compile(r"^sep=(.)\s*$", re.IGNORECASE)
+
+
+class CsvFormatError(ValueError):
+    """Die Datei ist kein lesbarer Bestandsexport (Meldung für den Anwender)."""
+
+    def __init__(self, message: str, missing: list[str] | None = None):
+        super().__init__(message)
+        self.missing = missing or []
+
+
+@dataclass
+class CsvFormat:
+    encoding: str
+    delimiter: str
+    # Spaltenname in der Datei → erwarteter Name (nur die gelesenen Spalten)
+    columns: dict[str, str] = field(default_factory=dict)
+    # Zeilen vor der Kopfzeile (z. B. "sep=;" aus Excel)
+    skiprows: int = 0
+
+    def describe(self) -> str:
+        names = {"\t": "Tab", ";": "Semikolon", ",": "Komma", "|": "senkrechter Strich"}
+        return f"{self.encoding}, {names.get(self.delimiter, self.delimiter)}"
+
+
+def _header_key(name: str) -> str:
+    """Vergleichsform eines Spaltennamens: ohne Groß/klein, Leer- und Satzzeichen."""
+    return re.sub(r"[\W_]+", "", name.strip().strip('"').casefold())
+
+
+def _alias_table(wanted: Iterable[str]) -> dict[str, str]:
+    table = {}
+    for name in wanted:
+        for alias in (name, *HEADER_ALIASES.get(name, ())):
+            table.setdefault(_header_key(alias), name)
+    return table
+
+
+def _detect_encoding(sample: bytes) -> str:
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    # die Probe kann mitten in einem Mehrbyte-Zeichen enden
+    cut = sample.rfind(b"\n")
+    head = sample[:cut] if cut > 0 else sample
+    try:
+        head.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            head.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def _split_header(line: str, delimiter: str) -> list[str]:
+    return next(csv.reader([line], delimiter=delimiter, quotechar='"', skipinitialspace=True), [])
+
+
+def sniff_csv_format(path: str, required: Iterable[str], optional: Iterable[str] = ()) -> CsvFormat:
+    """Erkennt das Format aus dem Dateianfang; `CsvFormatError`, wenn Pflichtspalten fehlen."""
+    required = list(required)
+    optional = list(optional)
+    with open(path, "rb") as f:
+        sample = f.read(SAMPLE_BYTES)
+    if not sample.strip():
+        raise CsvFormatError("Die Datei ist leer.")
+    if sample.startswith(b"PK\x03\x04"):
+        raise CsvFormatError("Das ist eine Excel-Arbeitsmappe (.xlsx), keine CSV-Datei.\n"
+                             "Bitte in Excel als „CSV (Trennzeichen-getrennt)“ speichern.")
+
+    encoding = _detect_encoding(sample)
+    text = sample.decode(encoding, errors="replace").lstrip("\ufeff")
+    lines = text.splitlines()
+    skiprows = 0
+    forced = None
+    if lines and (match := _SEP_LINE.match(lines[0])):
+        forced = match.group(1)
+        skiprows = 1
+    header = lines[skiprows] if len(lines) > skiprows else ""
+
+    aliases = _alias_table(required + optional)
+    best: tuple[int, str, dict[str, str]] | None = None
+    for delimiter in (forced,) if forced else DELIMITERS:
+        columns = {}
+        for name in _split_header(header, delimiter):
+            canonical = aliases.get(_header_key(name))
+            if canonical is not None and canonical not in columns.values():
+                columns[name] = canonical
+        hits = sum(1 for name in required if name in columns.values())
+        if best is None or hits > best[0]:
+            best = (hits, delimiter, columns)
+        if hits == len(required):
+            break
+
+    hits, delimiter, columns = best
+    fmt = CsvFormat(encoding, delimiter, columns, skiprows)
+    missing = [name for name in required if name not in columns.values()]
+    if missing:
+        raise CsvFormatError(
+            "In der CSV fehlen Spalten:\n- " + "\n- ".join(missing)
+            + f"\n\nErkannt: {fmt.describe()}; Kopfzeile: {header[:120]}",
+            missing,
+        )
+    return fmt
+
+
+def read_csv_export(path: str, fmt: CsvFormat) -> pd.DataFrame:
+    """Liest die erkannten Spalten als Strings ('' statt NaN) unter ihren erwarteten Namen."""
+    wanted = set(fmt.columns)
+
+    def read(encoding: str) -> pd.DataFrame:
+        return pd.read_csv(path, sep=fmt.delimiter, dtype=str, quotechar='"', engine="c",
+                           skipinitialspace=True, encoding=encoding, keep_default_na=False,
+                           skiprows=fmt.skiprows, usecols=lambda col: col in wanted)
+
+    try:
+        df = read(fmt.encoding)
+    except UnicodeDecodeError:
+        if fmt.encoding != "utf-8":
+            raise
+        # Umlaute erst hinter der Probe: dann war es doch kein UTF-8
+        for encoding in FALLBACK_ENCODINGS:
+            try:
+                df = read(encoding)
+            except UnicodeDecodeError:
+                continue
+            fmt.encoding = encoding
+            break
+    return df.rename(columns=fmt.columns)
+
+
+def load_csv_export(path: str, required: Iterable[str], optional: Iterable[str] = ()) -> pd.DataFrame:
+    return read_csv_export(path, sniff_csv_format(path, required, optional))
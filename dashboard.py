@@ -0,0 +1,210 @@
+# dashboard.py
+"""
+Schreibgeschützte Web-Ansicht der Stallbelegung für Handys im Stall.
+
+Ein kleiner HTTP-Server (QTcpServer, läuft im Qt-Ereignisloop wie der Rest
+der Anwendung) liefert:
+
+    /                     Übersicht mit Belegung je Bereich
+    /<bereich>            Tafel als HTML (derselbe Inhalt wie beim Drucken)
+    /api/<bereich>.json   Plätze als JSON
+
+Jede Seite wird erst bei Abruf erzeugt und bis zur nächsten Änderung des
+Modells zwischengespeichert. Das ETag einer Seite ist der Änderungszähler der
+beteiligten Bereiche; fragt ein Handy mit `If-None-Match` nach und hat sich
+nichts geändert, antwortet der Server mit 304, ohne etwas zu erzeugen.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from html import escape
+from typing import Callable
+
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QAbstractSocket, QHostAddress, QNetworkInterface, QTcpServer, QTcpSocket
+from shiboken6 import Shiboken
+
+from model import StallModel
+
+DEFAULT_PORT = 8080
+MAX_REQUEST_BYTES = 8192
+# Handys laden die Seite regelmäßig neu; dank ETag kostet das kaum etwas
+REFRESH_SECONDS = 30
+
+_MOBILE_HEAD = (
+    "<meta charset='utf-8'>"
+    "<meta name='viewport' content='width=device-width, initial-scale=1'>"
+    f"<meta http-equiv='refresh' content='{REFRESH_SECONDS}'>"
+    "<style>body { margin: 8px; } table { font-size: 14px; } nav a { margin-right: 12px; }</style>"
+)
+
+_REASONS = {200: "OK", 304: "Not Modified", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+@dataclass
+class DashboardPage:
+    content_type: str
+    render: Callable[[], str]
+    sections: tuple[str, ...]
+
+
+class DashboardServer(QObject):
+    def __init__(self, model: StallModel, titles: dict[str, str], port: int = DEFAULT_PORT,
+                 host: QHostAddress | None = None, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.titles = titles
+        self._host = host or QHostAddress(QHostAddress.SpecialAddress.Any)
+        self._requested_port = port
+        self._server = QTcpServer(self)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._pages: dict[str, DashboardPage] = {
+            "/": DashboardPage("text/html; charset=utf-8", self._render_index, tuple(titles)),
+        }
+        for section in titles:
+            self._pages[f"/api/{section}.json"] = DashboardPage(
+                "application/json; charset=utf-8", lambda s=section: self._render_json(s), (section,))
+        # Änderungszähler je Bereich und fertige Antworten: Pfad → (ETag, Inhalt)
+        self._versions: dict[str, int] = {section: 0 for section in titles}
+        self._cache: dict[str, tuple[str, bytes]] = {}
+        self._buffers: dict[QTcpSocket, bytes] = {}
+        self._started = datetime.now().strftime("%H%M%S")
+        model.sectionReset.connect(self._invalidate)
+        model.slotsChanged.connect(lambda section, _indices: self._invalidate(section))
+
+    def add_html_page(self, path: str, render: Callable[[], str], section: str):
+        """Registriert eine HTML-Seite, z. B. die Druckübersicht eines Bereichs."""
+        self._pages[path] = DashboardPage("text/html; charset=utf-8", lambda: self._mobile(render()), (section,))
+
+    def listen(self) -> bool:
+        return self._server.listen(self._host, self._requested_port)
+
+    @property
+    def port(self) -> int:
+        return self._server.serverPort()
+
+    def close(self):
+        self._server.close()
+        for socket in list(self._buffers):
+            socket.close()
+        self._buffers.clear()
+
+    def urls(self) -> list[str]:
+        """Adressen, unter denen Handys im Netz die Ansicht erreichen."""
+        return [f"http://{address.toString()}:{self.port}/"
+                for address in QNetworkInterface.allAddresses()
+                if address.protocol() == QAbstractSocket.NetworkLayerProtocol.IPv4Protocol
+                and not address.isLoopback()]
+
+    # --- Zwischenspeicher ---
+    def _invalidate(self, section: str):
+        if section not in self._versions:
+            return
+        self._versions[section] += 1
+        for path, page in self._pages.items():
+            if section in page.sections:
+                self._cache.pop(path, None)
+
+    def _etag(self, page: DashboardPage) -> str:
+        versions = "-".join(str(self._versions[s]) for s in page.sections)
+        return f'"{self._started}-{versions}"'
+
+    def _response_for(self, path: str) -> tuple[str, bytes]:
+        cached = self._cache.get(path)
+        if cached is None:
+            page = self._pages[path]
+            cached = (self._etag(page), page.render().encode("utf-8"))
+            self._cache[path] = cached
+        return cached
+
+    # --- HTTP ---
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            # wie in sync.py: Freigeben direkt in Qt, in Python nur die Buchführung
+            socket.disconnected.connect(socket.deleteLater)
+            socket.disconnected.connect(self._on_disconnected)
+
+    def _on_disconnected(self):
+        if Shiboken.isValid(self):
+            self._buffers.pop(self.sender(), None)
+
+    def _on_ready_read(self, socket: QTcpSocket):
+        data = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        if b"\r\n\r\n" not in data:
+            if len(data) > MAX_REQUEST_BYTES:
+                socket.abort()
+            else:
+                self._buffers[socket] = data
+            return
+        self._buffers[socket] = b""
+        head = data.split(b"\r\n\r\n", 1)[0].decode("latin-1")
+        lines = head.split("\r\n")
+        parts = lines[0].split(" ")
+        method, path = (parts[0], parts[1]) if len(parts) >= 2 else ("", "")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        self._respond(socket, method, path.split("?", 1)[0], headers)
+
+    def _respond(self, socket: QTcpSocket, method: str, path: str, headers: dict[str, str]):
+        if method not in ("GET", "HEAD"):
+            self._write(socket, 405, "text/plain; charset=utf-8", b"Nur lesender Zugriff")
+            return
+        page = self._pages.get(path)
+        if page is None:
+            self._write(socket, 404, "text/plain; charset=utf-8", b"Nicht gefunden")
+            return
+        etag = self._etag(page)
+        if etag in (tag.strip() for tag in headers.get("if-none-match", "").split(",")):
+            self._write(socket, 304, page.content_type, b"", etag)
+            return
+        etag, body = self._response_for(path)
+        self._write(socket, 200, page.content_type, b"" if method == "HEAD" else body, etag, len(body))
+
+    def _write(self, socket: QTcpSocket, status: int, content_type: str, body: bytes,
+               etag: str | None = None, length: int | None = None):
+        lines = [
+            f"HTTP/1.1 {status} {_REASONS[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body) if length is None else length}",
+            "Cache-Control: no-cache",
+            "Connection: close",
+        ]
+        if etag:
+            lines.append(f"ETag: {etag}")
+        socket.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        socket.disconnectFromHost()
+
+    # --- Inhalte ---
+    def _mobile(self, html: str) -> str:
+        """Druck-HTML für kleine Bildschirme: Viewport, Auto-Reload und Navigation."""
+        nav = "<nav><a href='/'>Übersicht</a>" + "".join(
+            f"<a href='/{section}'>{escape(title)}</a>" for section, title in self.titles.items()) + "</nav>"
+        return html.replace("<head>", "<head>" + _MOBILE_HEAD, 1).replace("<body>", "<body>" + nav, 1)
+
+    def _render_index(self) -> str:
+        rows = []
+        for section, title in self.titles.items():
+            occupied = self.model.occupied(section)
+            capacity = self.model.capacity(section)
+            link = f"<a href='/{section}'>{escape(title)}</a>" if f"/{section}" in self._pages else escape(title)
+            rows.append(f"<tr><td>{link}</td><td>{occupied} / {capacity} belegt</td></tr>")
+        return (
+            f"<html><head>{_MOBILE_HEAD}<title>Stalltafel</title></head>"
+            "<body style='font-family: Arial, Helvetica, sans-serif;'><h2>Stalltafel</h2>"
+            "<table border='1' cellspacing='0' cellpadding='8' width='100%'>" + "".join(rows) + "</table>"
+            f"<p style='color:#7f8c8d;'>Stand: {datetime.now():%d.%m.%Y %H:%M}</p></body></html>"
+        )
+
+    def _render_json(self, section: str) -> str:
+        slots = self.model.slots(section)[:self.model.capacity(section)]
+        return json.dumps({
+            "bereich": section,
+            "belegt": self.model.occupied(section),
+            "kapazitaet": self.model.capacity(section),
+            "plaetze": [{"platz": i + 1, "tier": tier} for i, tier in enumerate(slots)],
+        }, ensure_ascii=False)
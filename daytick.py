@@ -0,0 +1,51 @@
+# daytick.py
+"""
+Tageswechsel für eine Tafel, die tagelang durchläuft.
+
+`MidnightTimer` meldet `dayChanged(date)` einmal, sobald das Datum
+umspringt. Der Timer zielt auf Mitternacht, wartet aber höchstens eine
+Stunde am Stück: Qt-Timer laufen auf der monotonen Uhr, die im Ruhezustand
+des Rechners stehen bleibt – so wird ein Tageswechsel während des
+Standby spätestens eine Stunde nach dem Aufwachen nachgeholt.
+"""
+from datetime import date, datetime, time, timedelta
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+MAX_WAIT_MS = 60 * 60 * 1000
+# kleiner Versatz, damit der Timer sicher nach Mitternacht feuert
+MARGIN_MS = 500
+
+
+class MidnightTimer(QObject):
+    dayChanged = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._today = date.today()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._check)
+        self._arm()
+
+    @property
+    def today(self) -> date:
+        """
+        Datum der Tafel: springt erst zusammen mit `dayChanged` um. Alle
+        datumsabhängigen Berechnungen verwenden es, damit Karten, Planung und
+        Statistik nach dem Standby nicht für kurze Zeit verschiedene Tage sehen.
+        """
+        return self._today
+
+    def _arm(self):
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time())
+        wait = int((midnight - now).total_seconds() * 1000) + MARGIN_MS
+        self._timer.start(min(wait, MAX_WAIT_MS))
+
+    def _check(self):
+        today = date.today()
+        if today != self._today:
+            self._today = today
+            self.dayChanged.emit(today)
+        self._arm()
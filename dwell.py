@@ -0,0 +1,220 @@
+# dwell.py
+"""
+Verweildauer: wie lange die Tiere auf dem Betrieb und auf ihrem Platz stehen.
+
+Zwei Quellen:
+
+- Bestand: die Spalte „Zugang / Nachzucht“ des Exports; fehlt sie oder ist
+  sie leer, gilt das Geburtsdatum (Nachzucht). `ArrivalIndex` hält die
+  Zugangstage einmal sortiert. Zeit auf dem Betrieb, Zugänge je Woche und
+  Zugänge in einem Zeitraum sind damit Binärsuchen (`np.searchsorted`) –
+  ein Tageswechsel verschiebt nur die Grenzen, sortiert wird nichts neu.
+- Belegung: das Einstalldatum je Platz (`model.ENTRY_FIELD`). `StallDwell`
+  hört wie der Suchindex auf das Modell und pflegt bei `slotsChanged` nur
+  die betroffenen Plätze, bei `sectionReset` nur den Bereich.
+
+`DwellAnalysis.compute` setzt beides zusammen; der Index wird nur für einen
+neuen Bestand gebaut.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from herdstore import EPOCH_ORDINAL, NO_DATE, HerdStore
+from model import ENTRY_FIELD, StallModel
+
+Slot = tuple[str, int]
+
+# Klassen in Tagen: [von, bis)
+FARM_BINS = (0, 30, 91, 182, 365, 730)
+FARM_LABELS = ("< 1 Mon.", "1–3 Mon.", "3–6 Mon.", "6–12 Mon.", "1–2 J.", "≥ 2 J.")
+STALL_BINS = (0, 7, 14, 28, 56, 91)
+STALL_LABELS = ("< 1 Wo.", "1–2 Wo.", "2–4 Wo.", "4–8 Wo.", "8–13 Wo.", "≥ 13 Wo.")
+ARRIVAL_WEEKS = 12
+RECENT_WEEKS = 4
+
+
+def format_days(days: int | None) -> str:
+    """Dauer wie das Alter auf den Karten: Tage, Monate oder Jahre."""
+    if days is None:
+        return "–"
+    if days < 60:
+        return "1 Tag" if days == 1 else f"{days} Tage"
+    if days < 730:
+        return f"{round(days / 30.44)} Monate"
+    return f"{days / 365.25:.1f} Jahre".replace(".", ",")
+
+
+def _epoch_day(day: date) -> int:
+    return day.toordinal() - EPOCH_ORDINAL
+
+
+def _entry_ordinal(tier: dict) -> int | None:
+    try:
+        return date.fromisoformat(tier.get(ENTRY_FIELD) or "").toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+class ArrivalIndex:
+    """Zugangstage (Tage seit 1970) eines Bestands, aufsteigend sortiert, mit Zeilennummern."""
+
+    def __init__(self, store: HerdStore):
+        days = np.where(store.arrival_days != NO_DATE, store.arrival_days, store.birth_days)
+        known = np.flatnonzero(days != NO_DATE)
+        order = np.argsort(days[known], kind="stable")
+        self.positions = known[order]
+        self.days = days[known][order].astype(np.int64)
+        self.unknown = len(days) - len(known)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _bounds(self, start: date, end: date) -> tuple[int, int]:
+        lo, hi = np.searchsorted(self.days, [_epoch_day(start), _epoch_day(end)], side="left")
+        return int(lo), int(hi)
+
+    def count_between(self, start: date, end: date) -> int:
+        """Zugänge im Zeitraum [start, end)."""
+        lo, hi = self._bounds(start, end)
+        return hi - lo
+
+    def positions_between(self, start: date, end: date) -> np.ndarray:
+        """Zeilennummern im Bestand der Zugänge im Zeitraum [start, end)."""
+        lo, hi = self._bounds(start, end)
+        return self.positions[lo:hi]
+
+    def counts(self, edges: list[date]) -> np.ndarray:
+        """Zugänge zwischen aufeinanderfolgenden Grenzen."""
+        return np.diff(np.searchsorted(self.days, [_epoch_day(e) for e in edges], side="left"))
+
+    def farm_distribution(self, today: date) -> list[int]:
+        """Tiere je Klasse aus FARM_BINS (Tage auf dem Betrieb)."""
+        # mindestens b Tage auf dem Betrieb ⇔ Zugang ≤ heute − b
+        at_least = np.searchsorted(self.days, _epoch_day(today) - np.array(FARM_BINS), side="right")
+        # Zugänge mit Datum in der Zukunft zählen zur ersten Klasse
+        at_least[0] = len(self.days)
+        return [int(c) for c in np.append(-np.diff(at_least), at_least[-1])]
+
+    def median_days(self, today: date) -> int | None:
+        if not len(self.days):
+            return None
+        return max(0, _epoch_day(today) - int(self.days[len(self.days) // 2]))
+
+
+class StallDwell(QObject):
+    """Einstalldatum je belegtem Platz, aktualisiert über die Signale des Modells."""
+    changed = Signal()
+
+    def __init__(self, model: StallModel, parent=None):
+        super().__init__(parent)
+        self.model = model
+        # Platz → Einstalltag (date.toordinal)
+        self._entries: dict[Slot, int] = {}
+        # belegt, aber ohne Einstalldatum (Zustand von vor der Verweildauer)
+        self._undated: set[Slot] = set()
+        for section in model.sections():
+            self._index_section(section)
+        model.slotsChanged.connect(self._on_slots_changed)
+        model.sectionReset.connect(self._on_section_reset)
+
+    def _update(self, slot: Slot):
+        self._entries.pop(slot, None)
+        self._undated.discard(slot)
+        tier = self.model.tier(*slot)
+        if tier is None or slot[1] >= self.model.capacity(slot[0]):
+            return
+        ordinal = _entry_ordinal(tier)
+        if ordinal is None:
+            self._undated.add(slot)
+        else:
+            self._entries[slot] = ordinal
+
+    def _index_section(self, section: str):
+        for slot in [s for s in (*self._entries, *self._undated) if s[0] == section]:
+            self._update(slot)
+        for index in range(len(self.model.slots(section))):
+            self._update((section, index))
+
+    def _on_slots_changed(self, section: str, indices: list[int]):
+        for index in indices:
+            self._update((section, index))
+        self.changed.emit()
+
+    def _on_section_reset(self, section: str):
+        self._index_section(section)
+        self.changed.emit()
+
+    def placed(self) -> int:
+        return len(self._entries) + len(self._undated)
+
+    def dwell_days(self, today: date) -> dict[Slot, int]:
+        """Tage auf dem aktuellen Platz je Platz mit bekanntem Einstalldatum."""
+        t = today.toordinal()
+        return {slot: max(0, t - ordinal) for slot, ordinal in self._entries.items()}
+
+
+@dataclass
+class DwellStats:
+    herd_total: int = 0
+    farm_known: int = 0
+    farm_median: int | None = None
+    farm_distribution: list[tuple[str, int]] = field(default_factory=list)
+    arrivals: list[tuple[str, int]] = field(default_factory=list)
+    arrivals_recent: int = 0
+    placed: int = 0
+    stall_known: int = 0
+    stall_median: int | None = None
+    stall_distribution: list[tuple[str, int]] = field(default_factory=list)
+    # Bereich → Median der Tage auf dem Platz
+    section_medians: dict[str, int] = field(default_factory=dict)
+    longest: tuple[Slot, int] | None = None
+
+
+class DwellAnalysis:
+    """Kennzahlen der Verweildauer; der sortierte Zugangsindex wird je Bestand einmal gebaut."""
+
+    def __init__(self):
+        self._store: HerdStore | None = None
+        self._index: ArrivalIndex | None = None
+
+    def invalidate(self):
+        self._store = None
+        self._index = None
+
+    def arrival_index(self, store: HerdStore) -> ArrivalIndex:
+        if self._index is None or self._store is not store:
+            self._index = ArrivalIndex(store)
+            self._store = store
+        return self._index
+
+    def compute(self, store: HerdStore | None, stall: StallDwell, today: date) -> DwellStats:
+        stats = DwellStats()
+        if store is not None:
+            index = self.arrival_index(store)
+            week_start = today - timedelta(days=today.weekday())
+            edges = [week_start - timedelta(weeks=n) for n in range(ARRIVAL_WEEKS - 1, -2, -1)]
+            stats.herd_total = len(store)
+            stats.farm_known = len(index)
+            stats.farm_median = index.median_days(today)
+            stats.farm_distribution = list(zip(FARM_LABELS, index.farm_distribution(today)))
+            stats.arrivals = [(f"KW {start.isocalendar()[1]}", int(count))
+                              for start, count in zip(edges, index.counts(edges))]
+            stats.arrivals_recent = index.count_between(today - timedelta(weeks=RECENT_WEEKS), today + timedelta(days=1))
+
+        dwell = stall.dwell_days(today)
+        stats.placed = stall.placed()
+        stats.stall_known = len(dwell)
+        if dwell:
+            days = np.fromiter(dwell.values(), dtype=np.int64, count=len(dwell))
+            counts = np.bincount(np.digitize(days, STALL_BINS[1:]), minlength=len(STALL_BINS))
+            stats.stall_distribution = list(zip(STALL_LABELS, (int(c) for c in counts)))
+            stats.stall_median = int(np.median(days))
+            for section in stall.model.sections():
+                in_section = [d for (s, _), d in dwell.items() if s == section]
+                if in_section:
+                    stats.section_medians[section] = int(np.median(in_section))
+            stats.longest = max(dwell.items(), key=lambda item: item[1])
+        return stats
@@ -0,0 +1,266 @@
+# export.py
+"""
+Tabellen-Export der Stallbelegung als CSV oder XLSX – eine Zeile je Platz.
+
+Die Zeilen entstehen in einem Generator und werden sofort geschrieben; es
+liegt nie die ganze Tabelle im Speicher, auch nicht bei tausenden Plätzen
+über viele Betriebe. XLSX wird ohne Zusatzpaket direkt als ZIP geschrieben
+(Tabellenblatt als Datenstrom, Texte inline statt Shared Strings).
+
+Berichte:
+
+    belegung      alle Plätze inkl. freier
+    tierarzt      alle belegten Plätze mit Geburt, Geschlecht und Mutter
+    schlachthof   Tiere, deren Schlachttermin bis Ende der Woche fällig ist
+
+Aus der Anwendung über Setup → Wochenberichte, im Stapelbetrieb z. B.:
+
+    python export.py woche.xlsx --bericht schlachthof --betrieb "Hof A=/daten/hof_a" --betrieb "Hof B=/daten/hof_b"
+
+Ein Betrieb ist ein Datenordner der Anwendung (state.json und state.wal)
+oder direkt eine state.json.
+"""
+import argparse
+import csv
+import os
+import sys
+import zipfile
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Iterator
+from xml.sax.saxutils import escape
+
+from appdirs import user_data_dir
+
+from journal import StateJournal
+
+# Datenordner der Anwendung auf diesem Rechner (wie main.DATA_DIR)
+DEFAULT_DATA_DIR = user_data_dir("Bestandsmanager", "RinderApp")
+
+# Bereich → (Titel, Plätze je Box); 1 = Einzelplätze ohne Boxnummer (wie in main.py)
+DEFAULT_LAYOUT = {
+    "einzelplaetze": ("Einzelplätze", 1),
+    "gruppenboxen": ("Gruppenboxen", 3),
+}
+
+COLUMNS = ("Betrieb", "Bereich", "Box", "Platz", "Ohrmarke", "Status", "Geboren", "Alter",
+           "Schlachtung", "Schlachtalter (Monate)", "Rasse", "Geschlecht", "Mutter")
+DATE_COLUMNS = {"Geboren", "Schlachtung"}
+
+_STATUS = {None: "frei", "ok": "belegt", "not_found": "nicht gefunden"}
+
+
+def _parse_date(text) -> date | None:
+    try:
+        return datetime.strptime(str(text), "%d.%m.%Y").date()
+    except ValueError:
+        return None
+
+
+@dataclass
+class Report:
+    title: str
+    columns: tuple[str, ...]
+    include: Callable[[dict | None, date], bool]
+
+
+def _due_this_week(tier: dict | None, today: date) -> bool:
+    if tier is None or tier.get('status') != 'ok':
+        return False
+    slaughter = _parse_date(tier.get('schlachtdatum'))
+    week_end = today - timedelta(days=today.weekday()) + timedelta(days=7)
+    return slaughter is not None and slaughter < week_end
+
+
+REPORTS = {
+    "belegung": Report("Belegung", COLUMNS, lambda tier, today: True),
+    "tierarzt": Report(
+        "Tierarzt",
+        ("Betrieb", "Bereich", "Box", "Platz", "Ohrmarke", "Status", "Geboren", "Alter", "Rasse", "Geschlecht", "Mutter"),
+        lambda tier, today: tier is not None),
+    "schlachthof": Report(
+        "Schlachthof",
+        ("Betrieb", "Bereich", "Box", "Platz", "Ohrmarke", "Schlachtung", "Geboren", "Alter", "Rasse", "Geschlecht"),
+        _due_this_week),
+}
+
+
+# --- Zeilen ---
+def iter_slot_rows(farm: str, state: dict, report: Report, today: date | None = None,
+                   layout: dict[str, tuple[str, int]] | None = None) -> Iterator[list]:
+    """Zeilen eines Betriebs (Zustand im Format von state.json), Spalten wie `report.columns`."""
+    today = today or date.today()
+    for section, (title, per_box) in (layout or DEFAULT_LAYOUT).items():
+        for i, tier in enumerate((state.get(section) or {}).get("processed") or []):
+            if not report.include(tier, today):
+                continue
+            tier = tier or {}
+            box, place = divmod(i, per_box) if per_box > 1 else (None, i)
+            values = {
+                "Betrieb": farm,
+                "Bereich": title,
+                "Box": box + 1 if box is not None else "",
+                "Platz": place + 1,
+                "Ohrmarke": tier.get('id', ''),
+                "Status": _STATUS.get(tier.get('status')),
+                "Geboren": _parse_date(tier.get('geburtsdatum')) or "",
+                "Alter": tier.get('alter', ''),
+                "Schlachtung": _parse_date(tier.get('schlachtdatum')) or "",
+                "Schlachtalter (Monate)": tier.get('schlachtalter', ''),
+                "Rasse": tier.get('rasse', ''),
+                "Geschlecht": tier.get('geschlecht', ''),
+                "Mutter": tier.get('mutter', ''),
+            }
+            yield [values[column] for column in report.columns]
+
+
+def load_farm_state(path: str) -> dict:
+    """Zustand eines Betriebs aus Datenordner oder state.json, ohne dessen Dateien zu verändern."""
+    if os.path.isdir(path):
+        snapshot, wal = os.path.join(path, "state.json"), os.path.join(path, "state.wal")
+    else:
+        snapshot, wal = path, os.path.join(os.path.dirname(path), "state.wal")
+    return StateJournal(snapshot, wal).load(repair=False) or {}
+
+
+def iter_farm_rows(farms: Iterable[tuple[str, str]], report: Report, today: date | None = None) -> Iterator[list]:
+    """Zeilen mehrerer Betriebe nacheinander; es ist immer nur ein Zustand geladen."""
+    for farm, path in farms:
+        yield from iter_slot_rows(farm, load_farm_state(path), report, today)
+
+
+# --- Schreiben ---
+def write_csv(path: str, columns: Iterable[str], rows: Iterable[list]) -> int:
+    """CSV wie der Bestandsexport (';', UTF-8 mit BOM, Datum TT.MM.JJJJ); liefert die Zeilenzahl."""
+    count = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([f"{v:%d.%m.%Y}" if isinstance(v, date) else v for v in row])
+            count += 1
+    return count
+
+
+_XLSX_STATIC = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '<Relationship Id="rId2" Target="styles.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"/>'
+        '</Relationships>'),
+    # Stil 1 = fette Kopfzeile, Stil 2 = Datum (TT.MM.JJJJ)
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="1"><numFmt numFmtId="164" formatCode="dd.mm.yyyy"/></numFmts>'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '</styleSheet>'),
+}
+
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+
+def _xlsx_cell(value, style: int = 0) -> str:
+    if value is None or value == "":
+        return "<c/>"
+    if isinstance(value, bool) or not isinstance(value, (int, float, date)):
+        text = escape("".join(ch for ch in str(value) if ch >= " " or ch in "\t\n"))
+        attr = f' s="{style}"' if style else ""
+        return f'<c t="inlineStr"{attr}><is><t xml:space="preserve">{text}</t></is></c>'
+    if isinstance(value, date):
+        return f'<c s="2"><v>{(value - _EXCEL_EPOCH).days}</v></c>'
+    return f"<c><v>{value}</v></c>"
+
+
+def write_xlsx(path: str, columns: Iterable[str], rows: Iterable[list], sheet_name: str = "Belegung") -> int:
+    """XLSX mit einem Tabellenblatt; die Zeilen werden direkt in den ZIP-Datenstrom geschrieben."""
+    columns = list(columns)
+    workbook = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(sheet_name[:31])}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    )
+    widths = "".join(f'<col min="{n}" max="{n}" width="{max(12, len(c) + 2)}" customWidth="1"/>'
+                     for n, c in enumerate(columns, start=1))
+    count = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC.items():
+            archive.writestr(name, content)
+        archive.writestr("xl/workbook.xml", workbook)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" state="frozen"/>'
+                f'</sheetView></sheetViews><cols>{widths}</cols><sheetData>'
+                '<row>' + "".join(_xlsx_cell(c, 1) for c in columns) + '</row>'
+            ).encode("utf-8"))
+            for row in rows:
+                sheet.write(("<row>" + "".join(_xlsx_cell(v) for v in row) + "</row>").encode("utf-8"))
+                count += 1
+            sheet.write(b"</sheetData></worksheet>")
+    return count
+
+
+def write_report(path: str, columns: Iterable[str], rows: Iterable[list], sheet_name: str = "Belegung") -> int:
+    """Schreibt je nach Dateiendung CSV oder XLSX; liefert die Zahl der Datenzeilen."""
+    if path.lower().endswith(".xlsx"):
+        return write_xlsx(path, columns, rows, sheet_name)
+    return write_csv(path, columns, rows)
+
+
+def _farm_arg(text: str) -> tuple[str, str]:
+    name, sep, path = text.partition("=")
+    if not sep:
+        return os.path.basename(os.path.normpath(text)) or text, text
+    return name.strip(), path.strip()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stallbelegung als CSV/XLSX exportieren")
+    parser.add_argument("ausgabe", help="Zieldatei (.csv oder .xlsx)")
+    parser.add_argument("--bericht", choices=sorted(REPORTS), default="belegung")
+    parser.add_argument("--betrieb", action="append", type=_farm_arg, default=[],
+                        help="NAME=PFAD zu Datenordner oder state.json; mehrfach angebbar")
+    parser.add_argument("--stichtag", type=lambda s: datetime.strptime(s, "%d.%m.%Y").date(), default=None,
+                        help="Datum TT.MM.JJJJ für den Schlachthof-Bericht (Standard: heute)")
+    args = parser.parse_args(argv)
+    farms = args.betrieb or [("Betrieb", DEFAULT_DATA_DIR)]
+    report = REPORTS[args.bericht]
+    count = write_report(args.ausgabe, report.columns, iter_farm_rows(farms, report, args.stichtag), report.title)
+    print(f"{count} Zeilen aus {len(farms)} Betrieb(en) nach {args.ausgabe} geschrieben")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
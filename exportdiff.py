@@ -0,0 +1,85 @@
+# exportdiff.py
+"""
+Unterschied zwischen zwei Bestandsexporten (Zugänge, Abgänge, Änderungen).
+
+Von jedem geladenen Export wird ein Fingerabdruck gebildet: je Tier
+(normalisierte Ohrmarke) ein 64-Bit-Hash über den Inhalt der übrigen
+gelesenen Spalten. Der Vergleich zweier Fingerabdrücke ist ein
+Index-Abgleich über die Ohrmarken, ohne die Zeilen selbst anzufassen.
+
+Der Fingerabdruck des zuletzt geladenen Exports wird im Datenordner
+abgelegt, damit auch der erste Export nach einem Neustart mit dem vom
+Vortag verglichen werden kann.
+"""
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from herdstore import TAG_COLUMN, normalize_tags
+
+
+class ExportFingerprint:
+    def __init__(self, keys: np.ndarray, hashes: np.ndarray, source: str = ""):
+        # eindeutige Ohrmarken (bei Dubletten die letzte Zeile wie im HerdStore)
+        self.index = pd.Index(keys)
+        self.hashes = np.asarray(hashes, dtype=np.uint64)
+        self.source = source
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source: str = "") -> "ExportFingerprint":
+        keys = normalize_tags(df[TAG_COLUMN])
+        content = df[sorted(c for c in df.columns if c != TAG_COLUMN)]
+        hashes = pd.util.hash_pandas_object(content, index=False).to_numpy()
+        keep = ((keys != "") & ~keys.duplicated(keep="last")).to_numpy()
+        return cls(keys.to_numpy(dtype=object)[keep], hashes[keep], source)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # --- Ablage im Datenordner ---
+    def save(self, path: str):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, keys=self.index.to_numpy(dtype=str), hashes=self.hashes, source=np.array(self.source))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ExportFingerprint | None":
+        if not os.path.isfile(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(data["keys"].astype(object), data["hashes"], str(data["source"]))
+        except (OSError, ValueError, KeyError):
+            return None  # unlesbar: der nächste Export wird dann komplett aufgelöst
+
+
+@dataclass
+class ExportDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def affected(self) -> set[str]:
+        """Ohrmarken, deren Stallkarten neu aufgelöst werden müssen."""
+        return {*self.added, *self.removed, *self.changed}
+
+    def summary(self) -> str:
+        return f"{len(self.added)} Zugänge, {len(self.removed)} Abgänge, {len(self.changed)} geändert"
+
+
+def diff_exports(old: ExportFingerprint, new: ExportFingerprint) -> ExportDiff:
+    positions = old.index.get_indexer(new.index)
+    found = positions >= 0
+    changed = found.copy()
+    changed[found] = old.hashes[positions[found]] != new.hashes[found]
+    return ExportDiff(
+        added=new.index[~found].tolist(),
+        removed=old.index[~old.index.isin(new.index)].tolist(),
+        changed=new.index[changed].tolist(),
+    )
@@ -0,0 +1,112 @@
+# herdgen.py
+"""
+Erzeugt synthetische Bestandsexporte im Format der echten Rinderbestand-CSV
+(Info; Ohrmarke-Name; Geburtsdatum; Geschlecht; Rasse(n); OM-Mutter;
+Zugang / Nachzucht) – für Benchmarks von 1.000 bis 1.000.000 Zeilen.
+
+    python herdgen.py 100000 bestand_100k.csv
+
+Die Daten sind mit festem Seed reproduzierbar. Mütter stammen nach
+Möglichkeit aus dem eigenen Bestand (mindestens zwei Jahre älter, weiblich),
+sonst ist das Tier zugekauft und hat eine fremde Mutter-Ohrmarke.
+"""
+import csv
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Info", "Ohrmarke-Name", "Geburtsdatum", "Geschlecht", "Rasse(n)", "OM-Mutter", "Zugang / Nachzucht"]
+
+RASSEN = ("FL", "HF", "FV", "BV", "PI", "LI", "CH", "FL x BB")
+RASSEN_ANTEIL = (0.45, 0.2, 0.12, 0.08, 0.05, 0.04, 0.03, 0.03)
+GESCHLECHTER = ("Weibl.", "Männl.")
+
+# Anteil der Zeilen ohne Geburtsdatum (kommt in echten Exporten vereinzelt vor)
+ANTEIL_OHNE_GEBURT = 0.005
+MIN_ALTER_MUTTER_TAGE = 730
+
+
+def _format_dates(days: np.ndarray) -> np.ndarray:
+    """Tage seit 1970 → 'TT.MM.JJJJ'; jedes Datum wird nur einmal formatiert."""
+    uniques, codes = np.unique(days, return_inverse=True)
+    labels = pd.to_datetime(uniques, unit="D").strftime("%d.%m.%Y").to_numpy(dtype=object)
+    return labels[codes]
+
+
+def generate_herd(rows: int, seed: int = 42, today: date | None = None) -> pd.DataFrame:
+    """Synthetischer Bestand mit `rows` Tieren als DataFrame (alle Spalten als str)."""
+    rng = np.random.default_rng(seed)
+    today = today or date.today()
+    today_day = (today - date(1970, 1, 1)).days
+
+    # Geburten der letzten ~6 Jahre, jüngere Tiere häufiger
+    age_days = np.minimum(rng.exponential(scale=420, size=rows), 6 * 365).astype(np.int64)
+    births = np.sort(today_day - age_days)
+    sexes = rng.random(rows) < 0.55  # True = weiblich
+    breeds = rng.choice(len(RASSEN), size=rows, p=RASSEN_ANTEIL)
+
+    base = int(rng.integers(100_000_000, 800_000_000))
+    tags = base + rng.permutation(rows * 3)[:rows]
+    tag_labels = np.char.add("AT", tags.astype(str)).astype(object)
+
+    # Mutter: zufällige Kuh aus dem Bestand, die mindestens zwei Jahre älter ist
+    females = np.flatnonzero(sexes)
+    candidates = np.searchsorted(births[females], births - MIN_ALTER_MUTTER_TAGE, side="right")
+    own_mother = (candidates > 0) & (rng.random(rows) < 0.7)
+    mother_pick = (rng.random(rows) * np.maximum(candidates, 1)).astype(np.int64)
+    external = np.char.add("AT", rng.integers(100_000_000, 999_999_999, size=rows).astype(str)).astype(object)
+    mothers = np.where(own_mother, tag_labels[females[np.minimum(mother_pick, len(females) - 1)]]
+                       if len(females) else external, external)
+
+    # Nachzucht: Zugang am Geburtstag, Zukauf: einige Wochen nach der Geburt
+    arrivals = np.where(own_mother, births, np.minimum(births + rng.integers(14, 200, size=rows), today_day))
+
+    birth_labels = _format_dates(births)
+    birth_labels[rng.random(rows) < ANTEIL_OHNE_GEBURT] = ""
+
+    order = rng.permutation(rows)  # Exporte sind nicht nach Geburt sortiert
+    return pd.DataFrame({
+        "Info": np.full(rows, "", dtype=object),
+        "Ohrmarke-Name": tag_labels[order],
+        "Geburtsdatum": birth_labels[order],
+        "Geschlecht": np.where(sexes, GESCHLECHTER[0], GESCHLECHTER[1]).astype(object)[order],
+        "Rasse(n)": np.asarray(RASSEN, dtype=object)[breeds][order],
+        "OM-Mutter": mothers[order],
+        "Zugang / Nachzucht": _format_dates(arrivals)[order],
+    }, columns=COLUMNS)
+
+
+def write_herd_csv(path: str, rows: int, seed: int = 42, today: date | None = None) -> str:
+    """Schreibt den Bestand wie der echte Export: UTF-8 mit BOM, ';', alle Felder in Anführungszeichen."""
+    df = generate_herd(rows, seed, today)
+    df.to_csv(path, sep=";", index=False, quoting=csv.QUOTE_ALL, encoding="utf-8-sig", lineterminator="\n")
+    return path
+
+
+def sample_ids(df: pd.DataFrame, count: int, seed: int = 7, free_ratio: float = 0.1,
+               unknown_ratio: float = 0.05) -> list[str]:
+    """
+    Stallplatz-Eingaben wie in test.txt: Ohrmarken ohne 'AT' mit führender
+    Null, dazwischen 'Keine Kuh' und einzelne unbekannte IDs.
+    """
+    rng = np.random.default_rng(seed)
+    tags = df["Ohrmarke-Name"].to_numpy()
+    picks = tags[rng.integers(0, len(tags), size=count)]
+    ids: list[str] = []
+    for tag, r in zip(picks, rng.random(count)):
+        if r < free_ratio:
+            ids.append("Keine Kuh")
+        elif r < free_ratio + unknown_ratio:
+            ids.append(f"0{rng.integers(100_000_000, 999_999_999)}")
+        else:
+            ids.append("0" + str(tag)[2:])
+    return ids
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Aufruf: python herdgen.py <zeilen> <ausgabe.csv> [seed]")
+        sys.exit(2)
+    write_herd_csv(sys.argv[2], int(sys.argv[1]), int(sys.argv[3]) if len(sys.argv) > 3 else 42)
@@ -0,0 +1,233 @@
+# herdstore.py
+"""
+Kompakter Bestand im Speicher.
+
+Statt des kompletten Bestands-DataFrames und einer `pd.Series` je Tier hält
+`HerdStore` nur die Spalten, die die Anwendung braucht, spaltenweise:
+
+- Ohrmarken als normalisierte Schlüssel (Originalschreibweise nur, wo sie abweicht)
+- Geburtsdatum als int32-Tage seit 1970-01-01 (`NO_DATE` = unbekannt)
+- Rasse und Geschlecht als Kategorien-Codes (int16) plus Kategorienliste
+- Mutter-Ohrmarke (OM-Mutter, optional) als int32-Code in eine Liste
+  normalisierter Schlüssel (-1 = unbekannt); viele Kälber teilen sich eine Mutter
+- Zugang / Nachzucht (optional) wie das Geburtsdatum als int32-Tage
+
+Das Nachschlagen sieht aus wie beim bisherigen Index (`get`, `items`,
+`len`, `in`); `get` liefert eine leichte Zeilenansicht, die `row.get(spalte)`
+und `row.name` (Zeilennummer) unterstützt.
+"""
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+TAG_COLUMN = "Ohrmarke-Name"
+BIRTH_COLUMN = "Geburtsdatum"
+BREED_COLUMN = "Rasse(n)"
+SEX_COLUMN = "Geschlecht"
+MOTHER_COLUMN = "OM-Mutter"
+ARRIVAL_COLUMN = "Zugang / Nachzucht"
+COLUMNS = (TAG_COLUMN, BIRTH_COLUMN, BREED_COLUMN, SEX_COLUMN)
+# werden gelesen, wenn der Export sie enthält; ältere Exporte funktionieren ohne
+OPTIONAL_COLUMNS = (MOTHER_COLUMN, ARRIVAL_COLUMN)
+
+NO_DATE = np.iinfo(np.int32).min
+DATE_FORMATS = ("%d.%m.%Y", "%d.%m.%y", "%Y-%m-%d")
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _normalize_tag(tag: str) -> str:
+    tag = tag.strip().upper().replace(" ", "")
+    if tag.startswith("AT"):
+        tag = tag[2:]
+    tag = tag.lstrip("0")
+    return f"AT{tag}" if tag else ""
+
+
+def normalize_tags(col: pd.Series) -> pd.Series:
+    """MainWindow.normalize_ear_tag für eine ganze Spalte ('' = kein Schlüssel).
+
+    Eine Schleife über die Python-Strings ist hier gut doppelt so schnell wie
+    die Kette von `.str`-Operationen, die jede ein Zwischenergebnis anlegt.
+    """
+    tags = col.fillna("").astype(str).tolist()
+    return pd.Series([_normalize_tag(tag) for tag in tags], index=col.index, dtype=object)
+
+
+def parse_birth_days(col: pd.Series) -> np.ndarray:
+    """Datumsstrings → int32-Tage; jedes verschiedene Datum wird nur einmal geparst."""
+    codes, uniques = pd.factorize(col.fillna("").astype(str).str.strip())
+    parsed = pd.Series(pd.NaT, index=range(len(uniques)), dtype="datetime64[ns]")
+    text = pd.Series(uniques, dtype=object)
+    for fmt in DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(text[missing], format=fmt, errors="coerce")
+    days = parsed.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    days[parsed.isna().to_numpy()] = NO_DATE
+    return days.astype(np.int32)[codes] if len(codes) else np.empty(0, dtype=np.int32)
+
+
+def _categorize(col: pd.Series) -> tuple[np.ndarray, list[str]]:
+    codes, uniques = pd.factorize(col.fillna("").astype(str))
+    return codes.astype(np.int16), list(uniques)
+
+
+def _mother_codes(col: pd.Series | None, rows: int) -> tuple[np.ndarray, list[str]]:
+    if col is None:
+        return np.full(rows, -1, dtype=np.int32), []
+    # leere Schlüssel werden zu NaN und damit von factorize als -1 kodiert
+    keys = normalize_tags(col)
+    codes, uniques = pd.factorize(keys.where(keys != ""))
+    return codes.astype(np.int32), list(uniques)
+
+
+def _day_text(day: int) -> str:
+    if day == NO_DATE:
+        return ""
+    return date.fromordinal(day + EPOCH_ORDINAL).strftime("%d.%m.%Y")
+
+
+class HerdRow:
+    """Zeilenansicht auf den Store, verhält sich beim Lesen wie die frühere `pd.Series`."""
+    __slots__ = ("_store", "name")
+
+    def __init__(self, store: "HerdStore", position: int):
+        self._store = store
+        self.name = position
+
+    def get(self, column: str, default=None):
+        store, i = self._store, self.name
+        if column == TAG_COLUMN:
+            return store.tag(i)
+        if column == BIRTH_COLUMN:
+            return store.birth_text(i)
+        if column == BREED_COLUMN:
+            return store.breed_categories[store.breed_codes[i]]
+        if column == SEX_COLUMN:
+            return store.sex_categories[store.sex_codes[i]]
+        if column == MOTHER_COLUMN:
+            return store.mother_key(i) or default
+        if column == ARRIVAL_COLUMN:
+            return store.arrival_text(i) or default
+        return default
+
+    @property
+    def birth_day(self) -> int:
+        return int(self._store.birth_days[self.name])
+
+
+class HerdStore:
+    def __init__(self, keys: list[str], birth_days: np.ndarray, breed_codes: np.ndarray, breed_categories: list[str],
+                 sex_codes: np.ndarray, sex_categories: list[str], tag_overrides: dict[int, str] | None = None,
+                 mother_codes: np.ndarray | None = None, mother_keys: list[str] | None = None,
+                 arrival_days: np.ndarray | None = None, birth_overrides: dict[int, str] | None = None):
+        self.keys = keys
+        self.birth_days = birth_days
+        self.breed_codes = breed_codes
+        self.breed_categories = breed_categories
+        self.sex_codes = sex_codes
+        self.sex_categories = sex_categories
+        self._tag_overrides = tag_overrides or {}
+        # Originaltext nicht lesbarer Geburtsdaten, damit die Karte ihn weiter zeigt
+        self._birth_overrides = birth_overrides or {}
+        self.mother_codes = mother_codes if mother_codes is not None else np.full(len(keys), -1, dtype=np.int32)
+        self.mother_keys = mother_keys or []
+        self.arrival_days = arrival_days if arrival_days is not None else np.full(len(keys), NO_DATE, dtype=np.int32)
+        # bei doppelten Ohrmarken gewinnt wie bisher die letzte Zeile
+        self._positions: dict[str, int] = {key: i for i, key in enumerate(keys) if key}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "HerdStore":
+        tags = df[TAG_COLUMN].fillna("").astype(str)
+        keys = normalize_tags(tags)
+        differs = (tags != keys).to_numpy()
+        overrides = {int(i): tags.iat[i] for i in np.flatnonzero(differs) if keys.iat[i]}
+        breed_codes, breeds = _categorize(df[BREED_COLUMN])
+        sex_codes, sexes = _categorize(df[SEX_COLUMN])
+        mother_codes, mothers = _mother_codes(df.get(MOTHER_COLUMN), len(df))
+        arrivals = parse_birth_days(df[ARRIVAL_COLUMN]) if ARRIVAL_COLUMN in df else None
+        births = parse_birth_days(df[BIRTH_COLUMN])
+        # nur die wenigen Zeilen ohne lesbares Datum ansehen
+        birth_col = df[BIRTH_COLUMN]
+        birth_overrides = {}
+        for i in np.flatnonzero(births == NO_DATE):
+            text = birth_col.iat[i]
+            if isinstance(text, str) and text.strip():
+                birth_overrides[int(i)] = text.strip()
+        return cls(keys.tolist(), births, breed_codes, breeds, sex_codes, sexes, overrides,
+                   mother_codes, mothers, arrivals, birth_overrides)
+
+    # --- Nachschlagen (wie dict[str, pd.Series]) ---
+    def get(self, key: str, default=None) -> HerdRow | None:
+        position = self._positions.get(key)
+        return default if position is None else HerdRow(self, position)
+
+    def position(self, key: str) -> int | None:
+        return self._positions.get(key)
+
+    def unique_positions(self) -> tuple[list[str], np.ndarray]:
+        """Schlüssel und zugehörige Zeilennummern (eine Zeile je Ohrmarke)."""
+        keys = list(self._positions)
+        return keys, np.fromiter(self._positions.values(), dtype=np.int64, count=len(keys))
+
+    def items(self):
+        for key, position in self._positions.items():
+            yield key, HerdRow(self, position)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._positions
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # --- Spaltenwerte ---
+    def tag(self, i: int) -> str:
+        return self._tag_overrides.get(i, self.keys[i])
+
+    def mother_key(self, i: int) -> str:
+        """Normalisierte Ohrmarke der Mutter ('' = unbekannt)."""
+        code = int(self.mother_codes[i])
+        return self.mother_keys[code] if code >= 0 else ""
+
+    def birth_text(self, i: int) -> str:
+        day = int(self.birth_days[i])
+        if day == NO_DATE:
+            return self._birth_overrides.get(i, "")
+        return _day_text(day)
+
+    def arrival_text(self, i: int) -> str:
+        return _day_text(int(self.arrival_days[i]))
+
+    def births(self) -> pd.Series:
+        """Geburtsdaten als datetime64 (NaT = unbekannt), z. B. für die Statistik."""
+        days = self.birth_days.astype("datetime64[D]")
+        days[self.birth_days == NO_DATE] = np.datetime64("NaT")
+        return pd.Series(days.astype("datetime64[ns]"))
+
+    def labels(self, column: str) -> np.ndarray:
+        """Bereinigte Werte einer Kategorienspalte ('N/A' für leer) als Objekt-Array."""
+        codes, categories = ((self.breed_codes, self.breed_categories) if column == BREED_COLUMN
+                             else (self.sex_codes, self.sex_categories))
+        cleaned = np.array([c.strip() or "N/A" for c in categories] or ["N/A"], dtype=object)
+        return cleaned[codes]
+
+    def plan_records(self):
+        """(Schlüssel, Geburtsdatum, (Rasse, Geschlecht)) je Tier für den Schlachtplan."""
+        breeds = [c.strip() or "N/A" for c in self.breed_categories]
+        sexes = [c.strip() or "N/A" for c in self.sex_categories]
+        for key, i in self._positions.items():
+            day = int(self.birth_days[i])
+            birth = None if day == NO_DATE else date.fromordinal(day + EPOCH_ORDINAL)
+            yield key, birth, (breeds[self.breed_codes[i]], sexes[self.sex_codes[i]])
+
+    def nbytes(self) -> int:
+        """Ungefährer Speicherbedarf (Arrays plus Schlüssel und Nachschlagetabelle)."""
+        arrays = (self.birth_days.nbytes + self.breed_codes.nbytes + self.sex_codes.nbytes
+                  + self.mother_codes.nbytes + self.arrival_days.nbytes)
+        keys = sum(sys.getsizeof(k) for k in self.keys) + sys.getsizeof(self.keys)
+        keys += sum(sys.getsizeof(k) for k in self.mother_keys) + sys.getsizeof(self.mother_keys)
+        overrides = sum(sys.getsizeof(v) for v in (*self._tag_overrides.values(), *self._birth_overrides.values()))
+        return arrays + keys + sys.getsizeof(self._positions) + overrides
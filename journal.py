@@ -0,0 +1,150 @@
+# journal.py
+"""
+Absturzsicherer Zustand: Snapshot plus Write-Ahead-Journal.
+
+Jede Änderung der Belegung wird sofort als kleiner Datensatz an
+`state.wal` angehängt (eine JSON-Zeile, danach fsync). Ein Stromausfall
+kostet damit höchstens die Änderung, die gerade geschrieben wurde; eine
+halb geschriebene letzte Zeile wird beim Laden verworfen.
+
+Von Zeit zu Zeit wird der ganze Zustand als Snapshot (`state.json`)
+geschrieben – in eine temporäre Datei und dann atomar ersetzt – und das
+Journal geleert. Beim Start wird der Snapshot gelesen und nur das kurze
+Journal dahinter abgespielt; die Startzeit wächst also nicht mit der
+Historie. Datensätze tragen eine laufende Nummer, der Snapshot die
+letzte enthaltene, so dass ein Absturz zwischen Snapshot und Leeren des
+Journals nichts doppelt anwendet.
+
+Datensätze:
+
+    {"seq": 7, "typ": "platz", "bereich": ..., "platz": 3, "raw_id": ..., "tier": {...}}
+    {"seq": 8, "typ": "bereich", "bereich": ..., "raw_ids": [...], "processed": [...]}
+    {"seq": 9, "typ": "regeln", "regeln": {...}}
+"""
+import json
+import os
+
+# Nach so vielen Journal-Datensätzen wird beim nächsten Sicherungspunkt ein Snapshot geschrieben
+COMPACT_AFTER = 200
+
+
+def _fsync_dir(path: str):
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class StateJournal:
+    def __init__(self, snapshot_path: str, wal_path: str, compact_after: int = COMPACT_AFTER):
+        self.snapshot_path = snapshot_path
+        self.wal_path = wal_path
+        self.compact_after = compact_after
+        self._seq = 0
+        self._records = 0
+        self._wal = None
+
+    # --- Laden ---
+    def load(self, repair: bool = True) -> dict | None:
+        """
+        Snapshot plus Journal als Zustand im Format von state.json (None, wenn
+        nichts da ist). Mit `repair=False` wird ein abgebrochener Rest nur
+        übergangen, nicht abgeschnitten – für Leser neben einer laufenden Tafel.
+        """
+        state = None
+        if os.path.isfile(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self._seq = int(state.get("journal_seq", 0))
+        records = self._read_wal(repair)
+        if state is None and not records:
+            return None
+        state = state or {}
+        for record in records:
+            if record.get("seq", 0) <= self._seq:
+                continue  # schon im Snapshot enthalten
+            apply_record(state, record)
+            self._seq = record["seq"]
+        self._records = len(records)
+        return state
+
+    def _read_wal(self, repair: bool = True) -> list[dict]:
+        if not os.path.isfile(self.wal_path):
+            return []
+        records = []
+        good = 0
+        with open(self.wal_path, "rb") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line.decode("utf-8")))
+                except ValueError:
+                    break  # abgebrochener Schreibvorgang: alles danach ist unvollständig
+                good += len(line)
+        if repair and good < os.path.getsize(self.wal_path):
+            # unvollständigen Rest abschneiden, damit neue Datensätze auf einer eigenen Zeile beginnen
+            with open(self.wal_path, "r+b") as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+        return records
+
+    # --- Schreiben ---
+    def append(self, records: list[dict]):
+        """Hängt Datensätze an und schreibt sie auf die Platte, bevor die Methode zurückkehrt."""
+        if not records:
+            return
+        if self._wal is None:
+            self._wal = open(self.wal_path, "a", encoding="utf-8")
+        lines = []
+        for record in records:
+            self._seq += 1
+            lines.append(json.dumps({"seq": self._seq, **record}, ensure_ascii=False))
+        self._wal.write("\n".join(lines) + "\n")
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+        self._records += len(records)
+
+    def needs_compaction(self) -> bool:
+        return self._records >= self.compact_after
+
+    def write_snapshot(self, state: dict):
+        """Schreibt den ganzen Zustand atomar und leert danach das Journal."""
+        state = {**state, "journal_seq": self._seq}
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(self.snapshot_path)
+        self.close()
+        with open(self.wal_path, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self._records = 0
+
+    def close(self):
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+
+def apply_record(state: dict, record: dict):
+    typ = record.get("typ")
+    if typ == "regeln":
+        state["schlachtalter_regeln"] = record.get("regeln") or {}
+        return
+    section = state.setdefault(record.get("bereich", ""), {})
+    if typ == "bereich":
+        section["raw_ids"] = list(record.get("raw_ids") or [])
+        section["processed"] = list(record.get("processed") or [])
+    elif typ == "platz":
+        index = int(record["platz"])
+        for key, value, filler in (("raw_ids", record.get("raw_id", ""), ""), ("processed", record.get("tier"), None)):
+            items = section.setdefault(key, [])
+            if index >= len(items):
+                items.extend([filler] * (index + 1 - len(items)))
+            items[index] = value
@@ -0,0 +1,153 @@
+# labels.py
+"""
+Etikettendruck: eine Karte pro Stallplatz, im Raster auf A4-Bögen.
+
+Die Karten werden einmalig als QPicture (aufgezeichnete Zeichenbefehle,
+auflösungsunabhängig) gerendert und nach ihrem Inhalt zwischengespeichert.
+Beim Drucken werden die fertigen Karten direkt mit QPainter auf den Drucker
+abgespielt, ohne Umweg über HTML. Nach einer Änderung entstehen nur die
+Karten neu, deren Inhalt sich geändert hat.
+"""
+from collections import OrderedDict
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QFont, QPainter, QPen, QPicture
+from PySide6.QtPrintSupport import QPrinter
+
+from report import tier_key
+
+# Raster auf einem A4-Bogen (Hochformat)
+LABEL_COLUMNS = 2
+LABEL_ROWS = 4
+LABEL_GAP_MM = 4.0
+# Zeichenkoordinaten der vorgerenderten Karten (Einheiten pro Millimeter)
+CARD_UNITS_PER_MM = 10
+
+_CARD_FIELDS = (
+    ('Geboren', 'geburtsdatum'),
+    ('Alter', 'alter'),
+    ('Schlachtung', 'schlachtdatum'),
+    ('Rasse', 'rasse'),
+    ('Geschlecht', 'geschlecht'),
+)
+
+
+def _card_key(title: str, tier: dict | None) -> tuple:
+    key = tier_key(tier)
+    if key[0] == 'ok':
+        key += (str(tier.get('geschlecht', '')),)
+    return (title,) + key
+
+
+class LabelSheetPrinter:
+    """Zeichnet Stallkarten auf Etikettenbögen und hält gerenderte Karten vor."""
+
+    def __init__(self, columns: int = LABEL_COLUMNS, rows: int = LABEL_ROWS, max_cards: int = 4096):
+        self.columns = columns
+        self.rows = rows
+        self.max_cards = max_cards
+        self._pictures: OrderedDict[tuple, QPicture] = OrderedDict()
+
+    @property
+    def cards_per_page(self) -> int:
+        return self.columns * self.rows
+
+    def card_picture(self, title: str, tier: dict | None, size_mm: tuple[float, float]) -> QPicture:
+        key = (_card_key(title, tier), size_mm)
+        picture = self._pictures.get(key)
+        if picture is not None:
+            self._pictures.move_to_end(key)
+            return picture
+        picture = self._render_card(title, tier, size_mm)
+        self._pictures[key] = picture
+        while len(self._pictures) > self.max_cards:
+            self._pictures.popitem(last=False)
+        return picture
+
+    def paint(self, printer: QPrinter, cards: list[tuple[str, dict | None]]):
+        """Verteilt die Karten (Titel, Tierdaten) im Raster auf die Seiten."""
+        page = printer.pageRect(QPrinter.Unit.DevicePixel)
+        px_per_mm = printer.resolution() / 25.4
+        gap = LABEL_GAP_MM * px_per_mm
+        cell_w = (page.width() - gap * (self.columns - 1)) / self.columns
+        cell_h = (page.height() - gap * (self.rows - 1)) / self.rows
+        size_mm = (round(cell_w / px_per_mm, 1), round(cell_h / px_per_mm, 1))
+
+        painter = QPainter(printer)
+        try:
+            for n, (title, tier) in enumerate(cards):
+                picture = self.card_picture(title, tier, size_mm)
+                # drawPicture skaliert selbst um (Geräte-DPI / Bild-DPI); das hier ausgleichen
+                scale = px_per_mm / CARD_UNITS_PER_MM * picture.logicalDpiX() / printer.logicalDpiX()
+                slot = n % self.cards_per_page
+                if n > 0 and slot == 0:
+                    printer.newPage()
+                row, col = divmod(slot, self.columns)
+                painter.save()
+                painter.translate(col * (cell_w + gap), row * (cell_h + gap))
+                painter.scale(scale, scale)
+                painter.drawPicture(0, 0, picture)
+                painter.restore()
+        finally:
+            painter.end()
+
+    def _render_card(self, title: str, tier: dict | None, size_mm: tuple[float, float]) -> QPicture:
+        px_per_mm = CARD_UNITS_PER_MM
+        width = max(1.0, size_mm[0] * px_per_mm)
+        height = max(1.0, size_mm[1] * px_per_mm)
+        picture = QPicture()
+
+        margin = 4 * px_per_mm
+        line_h = height / 9
+        painter = QPainter(picture)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
+        try:
+            painter.setPen(QPen(QColor("#7f8c8d"), 0.4 * px_per_mm, Qt.PenStyle.DashLine))
+            painter.drawRoundedRect(QRectF(1, 1, width - 2, height - 2), 3 * px_per_mm, 3 * px_per_mm)
+
+            inner = QRectF(margin, margin, width - 2 * margin, height - 2 * margin)
+            painter.setPen(QColor("#2c3e50"))
+            painter.setFont(self._font(line_h * 0.55, bold=True))
+            painter.drawText(QRectF(inner.left(), inner.top(), inner.width(), line_h),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+
+            body = QRectF(inner.left(), inner.top() + line_h * 1.2, inner.width(), inner.height() - line_h * 1.2)
+            if tier is None:
+                painter.setPen(QColor("#95a5a6"))
+                painter.setFont(self._font(line_h * 0.5, italic=True))
+                painter.drawText(body, Qt.AlignmentFlag.AlignCenter, "Platz ist frei")
+            elif tier.get('status') == 'not_found':
+                painter.setPen(QColor("#c0392b"))
+                painter.setFont(self._font(line_h * 0.45, bold=True))
+                painter.drawText(body, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap,
+                                 f"ID nicht gefunden:\n{tier.get('id', '')}")
+            else:
+                painter.setFont(self._font(line_h * 0.75, bold=True))
+                painter.drawText(QRectF(body.left(), body.top(), body.width(), line_h * 1.4),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                                 str(tier.get('id', 'N/A')))
+                y = body.top() + line_h * 1.6
+                label_w = body.width() * 0.38
+                for label, field in _CARD_FIELDS:
+                    painter.setPen(QColor("#7f8c8d"))
+                    painter.setFont(self._font(line_h * 0.42))
+                    painter.drawText(QRectF(body.left(), y, label_w, line_h),
+                                     Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, label)
+                    painter.setPen(QColor("#2c3e50"))
+                    painter.setFont(self._font(line_h * 0.45, bold=True))
+                    painter.drawText(QRectF(body.left() + label_w, y, body.width() - label_w, line_h),
+                                     Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                                     str(tier.get(field, 'N/A')))
+                    y += line_h
+        finally:
+            painter.end()
+        return picture
+
+    @staticmethod
+    def _font(pixel_size: float, bold: bool = False, italic: bool = False) -> QFont:
+        font = QFont("Arial")
+        font.setPixelSize(max(1, int(pixel_size)))
+        font.setBold(bold)
+        font.setItalic(italic)
+        return font
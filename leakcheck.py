@@ -0,0 +1,201 @@
+# leakcheck.py
+"""
+Prüft, ob wiederholtes Neuzeichnen der Tafeln Speicher oder Qt-Objekte liegen lässt.
+
+    python leakcheck.py                  # 300 Durchläufe je Darstellung
+    python leakcheck.py --cycles 1000 --rss-tolerance 2
+
+Ein Durchlauf entspricht einem Tag an der Stalltafel im Zeitraffer: beide
+Kartenraster komplett neu aufbauen (wie beim Aktualisieren oder Umschalten
+der Darstellung), das Standard-Schlachtalter hin- und herschalten (ersetzt
+die betroffenen Karten einzeln, füllt die Planung neu, schreibt das
+Journal), Tageswechsel, Statistikseite, Suche, Kontextmenü einer Karte und
+der Dialog der Bestandsaufnahme. Menü und Dialog kehren sofort zurück, als
+hätte jemand abgebrochen. Gemessen werden nach jedem Block:
+
+- lebende Widgets (`QApplication.allWidgets`)
+- QObjects im Objektbaum von Anwendung und Hauptfenster
+- Python-Hüllen von Qt-Objekten (shiboken)
+- Arbeitsspeicher des Prozesses (RSS)
+
+Nach einer Aufwärmphase dürfen die Objektzahlen nicht wachsen, der RSS
+in der zweiten Hälfte der Durchläufe nur um `--rss-tolerance` MB; sonst
+endet das Skript mit Rückgabewert 1.
+Läuft offscreen mit eigenem Datenordner und eigenen Einstellungen
+(`bench.isolated_app`); Stallnetz, Web-Ansicht und Register starten nicht.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, QPoint  # noqa: E402
+from PySide6.QtWidgets import QApplication, QDialog, QMenu  # noqa: E402
+from shiboken6 import Shiboken  # noqa: E402
+
+import herdgen  # noqa: E402
+import main  # noqa: E402
+from bench import isolated_app  # noqa: E402
+
+DEFAULT_CYCLES = 300
+WARMUP_CYCLES = 20
+BLOCKS = 5
+RSS_TOLERANCE_MB = 4.0
+# kurzlebige Objekte (Ein-/Ausblend-Animationen im Suchfeld) schwanken um
+# einzelne Stück; ein Leck wächst dagegen mit jedem Durchlauf
+OBJECT_SLACK = 3
+RENDER_MODES = {"standard": False, "sparsam": True}
+
+
+def rss_mb() -> float:
+    """Aktueller Arbeitsspeicher des Prozesses in MB (nicht der Höchststand)."""
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.WorkingSetSize / 2**20
+    import resource
+    # macOS: nur der Höchststand verfügbar (in Bytes) – Wachstum zeigt er trotzdem
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**20
+
+
+class CancelledMenu(QMenu):
+    """Kontextmenü, das sofort ohne Auswahl zurückkehrt."""
+
+    def exec(self, *_args):
+        return None
+
+
+def flush_deletes():
+    """deleteLater() ausführen lassen, wie es die Ereignisschleife zwischen zwei Aktualisierungen tut."""
+    QApplication.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    QApplication.processEvents()
+
+
+def counts(window: main.MainWindow) -> dict:
+    app = QApplication.instance()
+    return {
+        "widgets": len(QApplication.allWidgets()),
+        "qobjects": len(app.findChildren(QObject)) + len(window.findChildren(QObject)),
+        "wrappers": len(Shiboken.getAllValidWrappers()),
+    }
+
+
+def cycle(window: main.MainWindow, n: int):
+    window.rebuild_boards()
+    # Standard-Schlachtalter umschalten: ersetzt die betroffenen Karten einzeln
+    window.ui.schlachtalter_combo.setCurrentIndex(n % 2 + 1)
+    window.on_day_changed(date.today() + timedelta(days=n % 40))
+    window.ui.stacked_widget.setCurrentWidget(window.ui.page_statistik)
+    window.refresh_statistics()
+    window.ui.stacked_widget.setCurrentIndex(0)
+    window.ui.search_edit.setText("fl")
+    window.on_slot_menu(main.SECTION_EINZELPLAETZE, n % main.NUM_EINZELPLAETZE, QPoint(0, 0))
+    window.aufnahme_einzelplaetze_ids()
+    window.ui.search_edit.clear()
+    flush_deletes()
+
+
+def occupy(window: main.MainWindow):
+    """Tafeln wie im Betrieb belegen: überwiegend bekannte Tiere, einige unbekannte IDs."""
+    df = herdgen.generate_herd(2_000)
+    window._herd = window.build_index(df)
+    ids = herdgen.sample_ids(df, 200)
+    processed = window.process_tier_ids(ids, window._herd)
+    window._rebuild_plan_index()
+    for section in (main.SECTION_EINZELPLAETZE, main.SECTION_GRUPPENBOXEN):
+        capacity = window.model.capacity(section)
+        start = 0 if section == main.SECTION_EINZELPLAETZE else main.NUM_EINZELPLAETZE
+        # ein Platz je Bereich bleibt frei
+        window.model.set_raw_ids(section, ids[start:start + capacity - 1])
+        window.model.set_slots(section, processed[start:start + capacity - 1] + [None])
+        window._index_rule_dependencies(section)
+
+
+def run_mode(window: main.MainWindow, low_cost: bool, cycles: int, rss_tolerance: float) -> bool:
+    window.ui.chk_low_cost.setChecked(low_cost)
+    done = 0
+    for _ in range(WARMUP_CYCLES):
+        cycle(window, done)
+        done += 1
+    baseline, baseline_rss = counts(window), rss_mb()
+    print(f"    {'Durchlauf':>9}  {'Widgets':>8}  {'QObjects':>8}  {'Hüllen':>8}  {'RSS':>9}")
+    print(f"    {done:>9}  {baseline['widgets']:>8}  {baseline['qobjects']:>8}  "
+          f"{baseline['wrappers']:>8}  {baseline_rss:>6.1f} MB")
+    block = max(1, cycles // BLOCKS)
+    now, rss = baseline, [baseline_rss]
+    while done < WARMUP_CYCLES + cycles:
+        for _ in range(min(block, WARMUP_CYCLES + cycles - done)):
+            cycle(window, done)
+            done += 1
+        now = counts(window)
+        rss.append(rss_mb())
+        print(f"    {done:>9}  {now['widgets']:>8}  {now['qobjects']:>8}  "
+              f"{now['wrappers']:>8}  {rss[-1]:>6.1f} MB")
+
+    ok = True
+    for key, value in now.items():
+        if value > baseline[key] + OBJECT_SLACK:
+            print(f"    ← {key}: {value - baseline[key]} mehr als nach dem Aufwärmen")
+            ok = False
+    # der RSS steigt anfangs, bis Caches (Icons, Zeilen-HTML, Schriften) und der
+    # Allokator eingeschwungen sind; bewertet wird die zweite Hälfte der Durchläufe
+    growth = rss[-1] - rss[len(rss) // 2]
+    if growth > rss_tolerance:
+        print(f"    ← RSS: +{growth:.1f} MB in der zweiten Hälfte (erlaubt {rss_tolerance:.1f} MB)")
+        ok = False
+    return ok
+
+
+def run(cycles: int, rss_tolerance: float, modes: list[str]) -> int:
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory(prefix="stalltafel_leak_") as workdir, isolated_app(workdir):
+        window = main.MainWindow()
+        window.show()
+        occupy(window)
+        failed = []
+        # modale Menüs und Dialoge nicht blockieren lassen: sofort "abgebrochen"
+        with mock.patch.object(main, "QMenu", CancelledMenu), \
+                mock.patch.object(main.BestandInputDialog, "exec", lambda *_args: QDialog.DialogCode.Rejected):
+            for mode in modes:
+                low_cost = RENDER_MODES[mode]
+                print(f"{mode}: {cycles} Durchläufe …", flush=True)
+                if not run_mode(window, low_cost, cycles, rss_tolerance):
+                    failed.append(mode)
+        window.hide()
+        window.deleteLater()
+        app.processEvents()
+    if failed:
+        print(f"Wachstum gefunden: {', '.join(failed)}")
+        return 1
+    print("Kein Wachstum.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speicher- und Widget-Wachstum beim Neuzeichnen der Tafeln")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES, help="Durchläufe je Darstellung")
+    parser.add_argument("--rss-tolerance", type=float, default=RSS_TOLERANCE_MB,
+                        help="erlaubtes RSS-Wachstum in MB nach dem Aufwärmen")
+    parser.add_argument("--mode", nargs="*", choices=list(RENDER_MODES), default=list(RENDER_MODES),
+                        help="Darstellungen (Standard: beide)")
+    args = parser.parse_args()
+    sys.exit(run(args.cycles, args.rss_tolerance, args.mode))
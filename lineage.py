@@ -0,0 +1,83 @@
+# lineage.py
+"""
+Abstammung aus der Spalte OM-Mutter: Mutter → Kälber.
+
+`LineageIndex` wird einmal je CSV-Laden aus dem `HerdStore` gebaut. Die
+Richtung Kalb → Mutter steht schon im Store (Mutter-Code je Zeile), die
+Gegenrichtung wird hier als Nachbarschaftsliste abgelegt. Jeder Schritt im
+Stammbaum ist damit ein Dict-Zugriff – keine Suche im Bestand, auch nicht
+bei Registerauszügen mit 100.000 Tieren.
+
+Alle Schlüssel sind mit `normalize_ear_tag` normalisierte Ohrmarken.
+Mütter, die nicht (mehr) im Bestand sind, tauchen nur als Schlüssel auf.
+"""
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+from herdstore import HerdStore
+
+
+class LineageIndex:
+    def __init__(self, store: HerdStore):
+        self._store = store
+        self._children: dict[str, list[str]] = {}
+        # nur die gültige Zeile je Ohrmarke (bei Dubletten gewinnt die letzte wie im Store)
+        keys, positions = store.unique_positions()
+        codes = store.mother_codes[positions]
+        known = np.flatnonzero(codes >= 0)
+        if not len(known):
+            return
+        # nach Mutter gruppieren: stabil sortieren und an den Codewechseln teilen
+        order = known[np.argsort(codes[known], kind="stable")]
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        groups = np.split(np.asarray(keys, dtype=object)[order], starts[1:])
+        mothers = [store.mother_keys[code] for code in sorted_codes[starts].tolist()]
+        self._children = {mother: group.tolist() for mother, group in zip(mothers, groups)}
+
+    def __len__(self) -> int:
+        """Anzahl der Mütter mit mindestens einem Kalb im Bestand."""
+        return len(self._children)
+
+    def mother_of(self, key: str) -> str | None:
+        position = self._store.position(key)
+        if position is None:
+            return None
+        return self._store.mother_key(position) or None
+
+    def children_of(self, key: str) -> list[str]:
+        return self._children.get(key, [])
+
+    def siblings_of(self, key: str) -> list[str]:
+        """Tiere mit derselben Mutter (ohne das Tier selbst)."""
+        mother = self.mother_of(key)
+        if mother is None:
+            return []
+        return [child for child in self._children.get(mother, ()) if child != key]
+
+    def descendants(self, key: str, max_depth: int | None = None) -> list[str]:
+        """Alle Nachkommen (Kälber, Enkel, …) in Breitensuche, jeder Schritt O(1)."""
+        found: list[str] = []
+        seen = {key}
+        queue = deque([(key, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for child in self._children.get(current, ()):
+                if child not in seen:  # schützt vor Schleifen durch fehlerhafte Exporte
+                    seen.add(child)
+                    found.append(child)
+                    queue.append((child, depth + 1))
+        return found
+
+    @staticmethod
+    def in_stalls(keys: Iterable[str], placed: dict[str, str]) -> list[tuple[str, str]]:
+        """Die Tiere aus `keys`, die gerade im Stall stehen, mit ihrem Platz (Ohrmarke → Platz)."""
+        return [(key, placed[key]) for key in keys if key in placed]
+
+    def offspring_in_stalls(self, key: str, placed: dict[str, str]) -> list[tuple[str, str]]:
+        """Alle Nachkommen von `key`, die gerade einen Stallplatz belegen."""
+        return self.in_stalls(self.descendants(key), placed)
@@ -1,8 +1,16 @@
 # main.py
 import sys
 import os
-import json
-from datetime import datetime
+
+if __name__ == '__main__':
+    # Sofortstart: das Bild der Tafel vom letzten Beenden erscheint, bevor
+    # pandas, qtawesome und die Oberfläche geladen sind (startimage.py)
+    from PySide6.QtWidgets import QApplication
+    from startimage import show_start_image
+    app = QApplication(sys.argv)
+    start_image = show_start_image()
+
+from datetime import date, datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import pandas as pd
 from appdirs import user_data_dir
@@ -11,14 +19,39 @@ from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
     QHBoxLayout, QLabel, QFrame, QDialog, QTextEdit,
     QMessageBox, QFileDialog, QGraphicsDropShadowEffect,
-    QPlainTextEdit, QDialogButtonBox, QComboBox
+    QPlainTextEdit, QDialogButtonBox, QComboBox, QTreeWidgetItem,
+    QTableWidgetItem, QMenu
 )
 from PySide6.QtPrintSupport import QPrinter, QPrintPreviewDialog
-from PySide6.QtGui import QColor, QPainter, QTextFormat, QTextDocument, QPageLayout, QPalette
+from PySide6.QtGui import (
+    QColor, QPainter, QTextFormat, QPageLayout, QPageSize, QPalette,
+    QKeySequence, QShortcut
+)
 from PySide6.QtCore import Qt, QRect, QSize, QSettings
-from PySide6.QtCore import QSizeF  # wichtig für Druckseiten-Größe
-import qtawesome as qta
 from ui import Ui_MainWindow
+from board import BoardGrid, BoardWindow
+from cards import PaintedCard, icon_pixmap
+from csvformat import CsvFormatError, read_csv_export, sniff_csv_format
+from dashboard import DEFAULT_PORT as DASHBOARD_PORT, DashboardServer
+from daytick import MidnightTimer
+from dwell import DwellAnalysis, StallDwell, format_days
+from export import REPORTS, iter_slot_rows, write_report
+from exportdiff import ExportDiff, ExportFingerprint, diff_exports
+from herdstore import OPTIONAL_COLUMNS, HerdStore
+from journal import StateJournal
+from labels import LabelSheetPrinter
+from lineage import LineageIndex
+from model import ENTRY_FIELD, StallModel, with_entry_date
+from moves import MoveJournal, SlotOperations
+from planning import SlaughterPlanIndex
+from profiling import PROFILER, ProfilerOverlay
+from registry import RegistryClient
+from search import SlotSearchIndex
+from startimage import SETTING_KEY as INSTANT_START_KEY, START_IMAGE_NAME, remove_start_image, save_start_image
+from rules import RuleDependencies, SchlachtalterRules
+from stats import HerdStatistics
+from sync import DEFAULT_PORT, SyncClient, SyncServer
+from report import PageDocumentCache, ReportRenderer, ReportSection, render_row, tier_key
 
 
 # --- Globale Konfiguration & Pfade ---
@@ -36,6 +69,11 @@ APP_NAME = "Bestandsmanager"
 
 DATA_DIR = user_data_dir(APP_NAME, ORG_NAME)
 STATE_FILE = os.path.join(DATA_DIR, "state.json")
+WAL_FILE = os.path.join(DATA_DIR, "state.wal")
+SYNC_STATE_FILE = os.path.join(DATA_DIR, "sync.json")
+MOVES_FILE = os.path.join(DATA_DIR, "umstallungen.jsonl")
+FINGERPRINT_FILE = os.path.join(DATA_DIR, "bestand_fingerabdruck.npz")
+START_IMAGE_FILE = os.path.join(DATA_DIR, START_IMAGE_NAME)
 
 def ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -45,6 +83,25 @@ def ensure_data_dir():
 NUM_EINZELPLAETZE = 14
 NUM_GRUPPENBOXEN = 6
 GRUPPENBOX_SLOTS = 3
+EINZELPLATZ_COLUMNS = 7
+GRUPPENBOX_COLUMNS = 3
+
+SECTION_EINZELPLAETZE = "einzelplaetze"
+SECTION_GRUPPENBOXEN = "gruppenboxen"
+SECTION_TITLES = {SECTION_EINZELPLAETZE: "Einzelplätze", SECTION_GRUPPENBOXEN: "Gruppenboxen"}
+
+# Felder einer Stallkarte (Icon, Beschriftung, Schlüssel); Gruppenboxen ohne Geschlecht
+CARD_FIELDS = (
+    ('fa5s.tag', '# Tier-ID', 'id'),
+    ('fa5s.calendar-day', '# Geboren', 'geburtsdatum'),
+    ('fa5s.birthday-cake', '# Alter', 'alter'),
+    ('fa5s.gavel', '# Schlachtung', 'schlachtdatum'),
+    ('fa5s.dna', '# Rasse', 'rasse'),
+    ('fa5s.venus-mars', '# Geschlecht', 'geschlecht'),
+    ('fa5s.female', '# Mutter', 'mutter'),
+    ('fa5s.users', '# Geschwister', 'geschwister'),
+)
+BOX_CARD_FIELDS = CARD_FIELDS[:5]
 
 REQUIRED_COLUMNS = {
     'Ohrmarke-Name',
@@ -54,6 +111,22 @@ REQUIRED_COLUMNS = {
 }
 
 
+def slot_state(tier: dict | None) -> str:
+    """Zustand eines Platzes für die Stylesheet-Eigenschaft `state`."""
+    if tier is None:
+        return "free"
+    return "not_found" if tier.get('status') == 'not_found' else "ok"
+
+
+def set_style_state(widget: QWidget, state: str):
+    """Setzt die dynamische Eigenschaft `state` und wendet das Stylesheet neu an."""
+    if widget.property("state") == state:
+        return
+    widget.setProperty("state", state)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
 # --- WIEDERVERWENDBARE KLASSEN (unchanged) ---
 class LineNumberArea(QWidget):
     def __init__(self, editor):
@@ -151,7 +224,7 @@ class BestandInputDialog(QDialog):
         self.text_edit.textChanged.connect(self.check_line_count)
 
         self.status_label = QLabel(f"0 / {self.required_lines} Zeilen")
-        self.status_label.setStyleSheet("color: #7f8c8d;")
+        self.status_label.setObjectName("LineCountLabel")
 
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, parent=self)
         self.button_box.button(QDialogButtonBox.Ok).setEnabled(False)
@@ -176,11 +249,11 @@ class BestandInputDialog(QDialog):
         extra_hint = ""
         if count > self.required_lines:
             extra_hint = " (es werden die ersten Zeilen verwendet)"
-            self.status_label.setStyleSheet("color: #e67e22;")
+            set_style_state(self.status_label, "warn")
         elif count == self.required_lines:
-            self.status_label.setStyleSheet("color: #2ecc71;")
+            set_style_state(self.status_label, "ok")
         else:
-            self.status_label.setStyleSheet("color: #7f8c8d;")
+            set_style_state(self.status_label, "")
         self.status_label.setText(f"{count} / {self.required_lines} Zeilen{extra_hint}")
         self.button_box.button(QDialogButtonBox.Ok).setEnabled(count >= self.required_lines)
 
@@ -203,27 +276,83 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.ui = Ui_MainWindow()
-        self.ui.setupUi(self)
+        with PROFILER.span("startup.setup_ui"):
+            self.ui.setupUi(self)
 
         # feste Fenstergröße (du hattest das so)
         self.resize(1950, 950)
 
-        self.einzelplaetze_raw_ids: list[str] = []
-        self.gruppenboxen_raw_ids: list[str] = []
-        self.einzelplaetze_processed_data: list[dict | None] = []
-        self.gruppenboxen_processed_data: list[dict | None] = []
-        self._csv_index: dict[str, pd.Series] = {}
+        # gemeinsames Modell für alle Tafeln (Hauptfenster und abgelöste Fenster)
+        self.model = StallModel({
+            SECTION_EINZELPLAETZE: NUM_EINZELPLAETZE,
+            SECTION_GRUPPENBOXEN: NUM_GRUPPENBOXEN * GRUPPENBOX_SLOTS,
+        }, self)
+        self._boards: list[BoardGrid] = []
+        self._board_windows: dict[str, BoardWindow] = {}
+        # kompakter Bestand (nur benötigte Spalten), None solange keine CSV geladen ist
+        self._herd: HerdStore | None = None
+        # Mutter → Kälber aus OM-Mutter, wird mit jedem Bestand neu gebaut
+        self._lineage: LineageIndex | None = None
+        # Fingerabdruck des zuletzt geladenen Exports für den Vergleich mit dem nächsten
+        self._export_fingerprint: ExportFingerprint | None = None
+        self._report_renderer = ReportRenderer()
+        self._page_cache = PageDocumentCache()
+        self._label_printer = LabelSheetPrinter()
+        self._plan_index: SlaughterPlanIndex | None = None
+        self.schlachtalter_rules = SchlachtalterRules(self._current_schlachtalter())
+        self._rule_deps = RuleDependencies()
+        self._herd_stats = HerdStatistics()
+        self._dwell_analysis = DwellAnalysis()
+        self._sync_server: SyncServer | None = None
+        self._sync_client: SyncClient | None = None
+        self._dashboard: DashboardServer | None = None
+        self._registry: RegistryClient | None = None
+        # Alter und Fälligkeiten springen um Mitternacht um, auch wenn niemand etwas anklickt
+        self._midnight = MidnightTimer(self)
+        self._midnight.dayChanged.connect(self.on_day_changed)
 
         self.settings = QSettings(ORG_NAME, APP_NAME)
+        # sparsame Darstellung: selbst gezeichnete Karten ohne Schatteneffekt und Stylesheets
+        self.low_cost_rendering = self.settings.value("low_cost_rendering", False, type=bool)
 
         ensure_data_dir()
-        self.load_state()
-
+        self._journal = StateJournal(STATE_FILE, WAL_FILE)
+        with PROFILER.span("startup.load_state"):
+            self.load_state()
+        # ab hier landet jede Änderung der Belegung sofort im Journal
+        self.model.sectionReset.connect(self._journal_section)
+        self.model.slotsChanged.connect(self._journal_slots)
+        self._slot_ops = SlotOperations(self.model, MoveJournal(MOVES_FILE), self,
+                                        today=lambda: self._midnight.today)
+        self._slot_ops.applied.connect(self._on_slots_moved)
+        self._search = SlotSearchIndex(self.model, self)
+        self._dwell = StallDwell(self.model, self)
+        self._search_hits: list[tuple[str, int]] = []
+        self._search_pos = 0
+
+        self._profiler_overlay = ProfilerOverlay(PROFILER, self.centralWidget())
+        self.ui.chk_profiling.setChecked(PROFILER.enabled)
+        self.ui.chk_low_cost.setChecked(self.low_cost_rendering)
+        self.ui.chk_instant_start.setChecked(self.settings.value(INSTANT_START_KEY, True, type=bool))
         self.connect_signals()
-        self.populate_einzelplaetze()
-        self.populate_gruppenboxen()
-        self.ui.stacked_widget.setCurrentIndex(0)
-        self.ui.btn_setup.setChecked(True)
+        self.refresh_rules_table()
+        with PROFILER.span("startup.populate"):
+            self._bind_board(SECTION_EINZELPLAETZE, self.ui.einzelplaetze_grid_layout, self).rebuild()
+            self._bind_board(SECTION_GRUPPENBOXEN, self.ui.gruppenboxen_grid_layout, self).rebuild()
+            self.refresh_planning()
+        # mit der zuletzt gezeigten Seite starten, wie auf dem Startbild
+        page = self.settings.value("last_page", 0, type=int)
+        if not 0 <= page < self.ui.stacked_widget.count():
+            page = 0
+        self.ui.stacked_widget.setCurrentIndex(page)
+        self.ui.button_group.button(page).setChecked(True)
+        self._restore_board_windows()
+        self.ui.sync_url_edit.setText(self.settings.value("sync/url", ""))
+        self.ui.chk_sync_server.setChecked(self.settings.value("sync/server", False, type=bool))
+        self.ui.chk_sync.setChecked(self.settings.value("sync/enabled", False, type=bool))
+        self.ui.chk_dashboard.setChecked(self.settings.value("dashboard/enabled", False, type=bool))
+        self.ui.registry_url_edit.setText(self.settings.value("registry/url", ""))
+        self.ui.chk_registry.setChecked(self.settings.value("registry/enabled", False, type=bool))
 
     def connect_signals(self):
         self.ui.button_group.buttonClicked.connect(self.switch_page)
@@ -235,199 +364,920 @@ class MainWindow(QMainWindow):
         self.ui.schlachtalter_combo.currentIndexChanged.connect(self.on_schlachtalter_changed)
         self.ui.btn_drucken_einzel.clicked.connect(self.handle_print_einzelplaetze)
         self.ui.btn_drucken_gruppe.clicked.connect(self.handle_print_gruppenboxen)
+        self.ui.btn_etiketten_einzel.clicked.connect(self.handle_labels_einzelplaetze)
+        self.ui.btn_etiketten_gruppe.clicked.connect(self.handle_labels_gruppenboxen)
+        self.ui.planung_period_combo.currentIndexChanged.connect(self.refresh_planning)
+        self.ui.planung_count_spin.valueChanged.connect(self.refresh_planning)
+        self.ui.btn_regel_setzen.clicked.connect(self.on_regel_setzen)
+        self.ui.btn_regel_entfernen.clicked.connect(self.on_regel_entfernen)
+        self.ui.chk_profiling.toggled.connect(self.on_profiling_toggled)
+        self.ui.chk_profiling_overlay.toggled.connect(self._profiler_overlay.set_overlay_visible)
+        self.ui.btn_trace_export.clicked.connect(self.export_profile_trace)
+        self.ui.chk_low_cost.toggled.connect(self.on_low_cost_toggled)
+        self.ui.chk_instant_start.toggled.connect(self.on_instant_start_toggled)
+        self.ui.btn_fenster_einzel.clicked.connect(lambda: self.open_board_window(SECTION_EINZELPLAETZE))
+        self.ui.btn_fenster_gruppe.clicked.connect(lambda: self.open_board_window(SECTION_GRUPPENBOXEN))
+        self.ui.chk_sync.toggled.connect(self.on_sync_toggled)
+        self.ui.chk_dashboard.toggled.connect(self.on_dashboard_toggled)
+        self.ui.chk_registry.toggled.connect(self.on_registry_toggled)
+        self.model.sectionReset.connect(self._lookup_unknown_tags)
+        self.model.slotsChanged.connect(self._lookup_unknown_tags)
+        self.ui.btn_export.clicked.connect(self.export_report)
+        self.ui.search_edit.textChanged.connect(self.run_search)
+        self.ui.search_edit.returnPressed.connect(self.next_search_hit)
+        self.ui.search_window_combo.currentIndexChanged.connect(self.run_search)
+        # Belegung geändert: Treffer neu markieren, aber nicht wegscrollen
+        self._search.changed.connect(lambda: self.run_search(scroll=False))
+        self._dwell.changed.connect(self.refresh_dwell)
+        QShortcut(QKeySequence.StandardKey.Find, self, self.ui.search_edit.setFocus)
+        QShortcut(QKeySequence(Qt.Key.Key_F12), self, self.ui.chk_profiling_overlay.toggle)
+        # Rückgängig/Wiederholen auch aus abgelösten Tafelfenstern
+        for key, handler in ((QKeySequence.StandardKey.Undo, self.undo_move), (QKeySequence.StandardKey.Redo, self.redo_move)):
+            shortcut = QShortcut(QKeySequence(key), self, handler)
+            shortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)
 
     def switch_page(self, button):
         self.ui.stacked_widget.setCurrentIndex(self.ui.button_group.id(button))
+        if self.ui.stacked_widget.currentWidget() is self.ui.page_statistik:
+            self.refresh_statistics()
+        elif self.ui.stacked_widget.currentWidget() is self.ui.page_verweildauer:
+            self.refresh_dwell()
+
+    # --- Suche (search.py) ---
+    def _search_window(self) -> tuple[date | None, date | None] | None:
+        today = self._midnight.today
+        choice = self.ui.search_window_combo.currentData()
+        if choice == "overdue":
+            return None, today
+        if choice == "week":
+            monday = today - timedelta(days=today.weekday())
+            return monday, monday + timedelta(days=7)
+        if choice == "4weeks":
+            return today, today + timedelta(days=28)
+        if choice == "month":
+            start = today.replace(day=1)
+            return start, start + relativedelta(months=1)
+        return None
+
+    def run_search(self, *_args, scroll: bool = True):
+        text = self.ui.search_edit.text()
+        window = self._search_window()
+        with PROFILER.span("search.query"):
+            hits = self._search.search(text, window) if text.strip() or window else []
+            for grid in self._boards:
+                grid.set_highlighted_slots(index for section, index in hits if section == grid.section)
+        self._search_hits = hits
+        if not text.strip() and window is None:
+            self.ui.search_result_label.setText("")
+        elif not hits:
+            self.ui.search_result_label.setText("Keine Treffer")
+        else:
+            self.ui.search_result_label.setText(f"{len(hits)} Treffer")
+        if scroll and hits:
+            # bevorzugt einen Treffer auf der gerade sichtbaren Tafel
+            current = {0: SECTION_EINZELPLAETZE, 1: SECTION_GRUPPENBOXEN}.get(self.ui.stacked_widget.currentIndex())
+            self._search_pos = next((n for n, (section, _i) in enumerate(hits) if section == current), 0)
+            self._show_search_hit()
+
+    def next_search_hit(self):
+        if not self._search_hits:
+            return
+        self._search_pos = (self._search_pos + 1) % len(self._search_hits)
+        self._show_search_hit()
+
+    def _show_search_hit(self):
+        section, index = self._search_hits[self._search_pos]
+        page, button = ((0, self.ui.btn_einzelplaetze) if section == SECTION_EINZELPLAETZE
+                        else (1, self.ui.btn_gruppenboxen))
+        if self.ui.stacked_widget.currentIndex() != page:
+            self.ui.stacked_widget.setCurrentIndex(page)
+            button.setChecked(True)
+        for grid in self._boards:
+            if grid.section == section:
+                grid.scroll_to_slot(index)
+        if len(self._search_hits) > 1:
+            self.ui.search_result_label.setText(
+                f"Treffer {self._search_pos + 1} von {len(self._search_hits)} – Enter: nächster")
+
+    # --- Zeitmessung ---
+    def on_profiling_toggled(self, checked: bool):
+        PROFILER.enabled = checked
+        self.settings.setValue("profiling", checked)
+
+    def on_low_cost_toggled(self, checked: bool):
+        self.low_cost_rendering = checked
+        self.settings.setValue("low_cost_rendering", checked)
+        self.rebuild_boards()
+
+    def on_instant_start_toggled(self, checked: bool):
+        self.settings.setValue(INSTANT_START_KEY, checked)
+        if not checked:
+            remove_start_image(START_IMAGE_FILE)
+
+    def export_profile_trace(self):
+        if not PROFILER.events():
+            QMessageBox.information(
+                self, "Hinweis",
+                "Noch keine Messungen vorhanden. Bitte Zeitmessung aktivieren und z. B. Aktualisieren ausführen."
+            )
+            return
+        path = os.path.join(DATA_DIR, f"trace_{datetime.now():%Y%m%d_%H%M%S}.json")
+        try:
+            ensure_data_dir()
+            PROFILER.export_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export fehlgeschlagen", f"Trace konnte nicht gespeichert werden:\n{e}")
+            return
+        QMessageBox.information(
+            self, "Trace gespeichert",
+            f"Trace gespeichert unter:\n{path}\n\nÖffnen mit chrome://tracing oder ui.perfetto.dev."
+        )
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._profiler_overlay.reposition()
+
+    # --- Stallnetz ---
+    def on_sync_toggled(self, checked: bool):
+        self.settings.setValue("sync/enabled", checked)
+        self.ui.chk_sync_server.setEnabled(not checked)
+        self.ui.sync_url_edit.setEnabled(not checked)
+        if checked:
+            self.start_sync()
+        else:
+            self.stop_sync()
+
+    def start_sync(self):
+        url = self.ui.sync_url_edit.text().strip()
+        host_server = self.ui.chk_sync_server.isChecked()
+        self.settings.setValue("sync/url", url)
+        self.settings.setValue("sync/server", host_server)
+        if host_server:
+            self._sync_server = SyncServer(DEFAULT_PORT, parent=self)
+            if not self._sync_server.listen():
+                QMessageBox.warning(self, "Stallnetz", f"Port {DEFAULT_PORT} ist bereits belegt.")
+                self._sync_server = None
+                self.ui.chk_sync.setChecked(False)
+                return
+        if not url:
+            if self._sync_server is None:
+                QMessageBox.information(self, "Stallnetz", "Bitte die Server-Adresse eintragen oder dieses Terminal als Server nutzen.")
+                self.ui.chk_sync.setChecked(False)
+                return
+            url = f"ws://127.0.0.1:{self._sync_server.port}"
+        ensure_data_dir()
+        self._sync_client = SyncClient(self.model, url, SYNC_STATE_FILE, self)
+        self._sync_client.remoteApplied.connect(self._on_sync_remote)
+        self._sync_client.statusChanged.connect(self.ui.sync_status_label.setText)
+        self.ui.sync_status_label.setText(f"Verbinde mit {url} …")
+        self._sync_client.start()
+
+    def stop_sync(self):
+        if self._sync_client is not None:
+            self._sync_client.stop()
+            self._sync_client.deleteLater()
+            self._sync_client = None
+        if self._sync_server is not None:
+            self._sync_server.close()
+            self._sync_server.deleteLater()
+            self._sync_server = None
+        self.ui.sync_status_label.setText("Abgleich aus")
+
+    def _on_sync_remote(self, section: str, indices: list[int]):
+        """Von einem anderen Terminal geänderte Plätze übernehmen (die Tafeln zeichnen sich selbst neu)."""
+        for index in indices:
+            self._index_rule_slot(section, index)
+        self.refresh_planning()
+        self.refresh_statistics()
+        self._checkpoint()
+
+    def on_registry_toggled(self, checked: bool):
+        self.settings.setValue("registry/enabled", checked)
+        self.ui.registry_url_edit.setEnabled(not checked)
+        if checked:
+            self.start_registry()
+        else:
+            self.stop_registry()
+
+    def start_registry(self):
+        url = self.ui.registry_url_edit.text().strip()
+        self.settings.setValue("registry/url", url)
+        if not url:
+            QMessageBox.information(self, "Register", "Bitte die Adresse des Registers eintragen.")
+            self.ui.chk_registry.setChecked(False)
+            return
+        if "://" not in url:
+            url = f"http://{url}"
+        self._registry = RegistryClient(url, self)
+        self._registry.resolved.connect(self._on_registry_resolved)
+        self._registry.failed.connect(self.ui.registry_status_label.setText)
+        self.ui.registry_status_label.setText("")
+        for section in self.model.sections():
+            self._lookup_unknown_tags(section)
+
+    def stop_registry(self):
+        if self._registry is not None:
+            self._registry.cancel()
+            self._registry.deleteLater()
+            self._registry = None
+        self.ui.registry_status_label.setText("")
+
+    def _lookup_unknown_tags(self, section: str, indices: list[int] | None = None):
+        """Nicht gefundene Ohrmarken ans Register geben; die Antwort kommt später über resolved."""
+        if self._registry is None:
+            return
+        slots = self.model.slots(section)
+        positions = range(len(slots)) if indices is None else indices
+        keys = [self.normalize_ear_tag(slots[i]['id']) for i in positions
+                if i < len(slots) and slots[i] and slots[i].get('status') == 'not_found']
+        if keys:
+            self._registry.lookup(keys)
+
+    def _on_registry_resolved(self, records: dict):
+        """Plätze mit bisher unbekannten Ohrmarken aus den Registerdaten füllen."""
+        today = self._midnight.today
+        changed = []
+        for section in self.model.sections():
+            indices = []
+            for i, tier in enumerate(self.model.slots(section)):
+                if not tier or tier.get('status') != 'not_found':
+                    continue
+                key = self.normalize_ear_tag(tier['id'])
+                record = records.get(key)
+                if record is None:
+                    continue
+                # das Einstalldatum des bisher unbekannten Tiers bleibt erhalten
+                tier.update(self._tier_from_row(key, record, today), quelle="Register")
+                indices.append(i)
+            if indices:
+                for i in indices:
+                    self._index_rule_slot(section, i)
+                self.model.notify_changed(section, indices)
+                changed.extend(indices)
+        if changed:
+            self.ui.registry_status_label.setText(f"{len(records)} Ohrmarke(n) aus dem Register übernommen")
+            self.refresh_planning()
+            self.refresh_statistics()
+            self._checkpoint()
+
+    def on_dashboard_toggled(self, checked: bool):
+        self.settings.setValue("dashboard/enabled", checked)
+        if checked:
+            self.start_dashboard()
+        else:
+            self.stop_dashboard()
+
+    def start_dashboard(self):
+        port = self.settings.value("dashboard/port", DASHBOARD_PORT, type=int)
+        self._dashboard = DashboardServer(self.model, SECTION_TITLES, port, parent=self)
+        self._dashboard.add_html_page(f"/{SECTION_EINZELPLAETZE}", self.generate_print_html_einzelplaetze,
+                                      SECTION_EINZELPLAETZE)
+        self._dashboard.add_html_page(f"/{SECTION_GRUPPENBOXEN}", self.generate_print_html_gruppenboxen,
+                                      SECTION_GRUPPENBOXEN)
+        if not self._dashboard.listen():
+            QMessageBox.warning(self, "Web-Ansicht", f"Port {port} ist bereits belegt.")
+            self._dashboard = None
+            self.ui.chk_dashboard.setChecked(False)
+            return
+        urls = self._dashboard.urls() or [f"http://localhost:{self._dashboard.port}/"]
+        self.ui.dashboard_status_label.setText("Erreichbar unter " + ", ".join(urls))
+
+    def stop_dashboard(self):
+        if self._dashboard is not None:
+            self._dashboard.close()
+            self._dashboard.deleteLater()
+            self._dashboard = None
+        self.ui.dashboard_status_label.setText("")
+
+    # --- Umstallen ---
+    def on_slot_dropped(self, source_section: str, source_index: int, target_section: str, target_index: int):
+        self._slot_ops.move((source_section, source_index), (target_section, target_index))
+
+    def on_slot_menu(self, section: str, index: int, global_pos):
+        menu = QMenu(self)
+        clear_action = menu.addAction(f"{SECTION_TITLES[section]}: Platz {index + 1} räumen")
+        clear_action.setEnabled(self.model.tier(section, index) is not None)
+        tier = self.model.tier(section, index)
+        lineage_action = menu.addAction("Verwandtschaft im Stall …")
+        lineage_action.setEnabled(self._lineage is not None and tier is not None and tier.get('status') == 'ok')
+        menu.addSeparator()
+        undo_action = menu.addAction("Rückgängig")
+        undo_action.setEnabled(self._slot_ops.can_undo())
+        redo_action = menu.addAction("Wiederholen")
+        redo_action.setEnabled(self._slot_ops.can_redo())
+        chosen = menu.exec(global_pos)
+        # das Menü hängt am Hauptfenster; ohne deleteLater bliebe jedes Menü samt Aktionen liegen
+        menu.deleteLater()
+        if chosen is clear_action:
+            self._slot_ops.clear((section, index))
+        elif chosen is lineage_action:
+            self.show_lineage(section, index)
+        elif chosen is undo_action:
+            self.undo_move()
+        elif chosen is redo_action:
+            self.redo_move()
+
+    # --- Abstammung (lineage.py) ---
+    def show_lineage(self, section: str, index: int):
+        tier = self.model.tier(section, index)
+        if self._lineage is None or tier is None:
+            return
+        key = self.normalize_ear_tag(tier.get('id', ''))
+        stalls = self._slot_labels()
+
+        def listing(found: list[tuple[str, str]]) -> str:
+            if not found:
+                return "– keine im Stall –"
+            return "\n".join(f"• {tag}: {place}" for tag, place in found)
+
+        mother = self._lineage.mother_of(key)
+        if mother is None:
+            mother_text = "unbekannt"
+        else:
+            mother_text = f"{mother} ({stalls.get(mother, 'nicht im Stall')})"
+        siblings = self._lineage.siblings_of(key)
+        calves = self._lineage.children_of(key)
+        QMessageBox.information(
+            self, f"Verwandtschaft {tier.get('id', '')}",
+            f"Mutter: {mother_text}\n\n"
+            f"Geschwister im Stall ({len(siblings)} im Bestand):\n"
+            f"{listing(self._lineage.in_stalls(siblings, stalls))}\n\n"
+            f"Nachkommen im Stall (Kälber, Enkel, …; {len(calves)} Kälber im Bestand):\n"
+            f"{listing(self._lineage.offspring_in_stalls(key, stalls))}"
+        )
+
+    def undo_move(self):
+        if self._slot_ops.can_undo() and not self._slot_ops.undo():
+            QMessageBox.information(self, "Rückgängig nicht möglich",
+                                    "Die betroffenen Plätze wurden inzwischen anders belegt.")
+
+    def redo_move(self):
+        if self._slot_ops.can_redo() and not self._slot_ops.redo():
+            QMessageBox.information(self, "Wiederholen nicht möglich",
+                                    "Die betroffenen Plätze wurden inzwischen anders belegt.")
+
+    def _on_slots_moved(self, slots: list[tuple[str, int]]):
+        # Rückgängig/Wiederholen setzt gespeicherte Tiere ein; Regeln und Datum können sich seitdem geändert haben
+        today = self._midnight.today
+        changed: dict[str, list[int]] = {}
+        for section, index in slots:
+            self._index_rule_slot(section, index)
+            tier = self.model.tier(section, index)
+            if tier and tier.get('status') == 'ok' and self._refresh_derived(tier, today):
+                changed.setdefault(section, []).append(index)
+        for section, indices in changed.items():
+            self.model.notify_changed(section, indices)
+        self.refresh_planning()
+        self.refresh_statistics()
+        self._checkpoint()
+
+    # --- Tafeln und abgelöste Fenster ---
+    def _bind_board(self, section: str, layout, parent) -> BoardGrid:
+        """Bindet ein Kartenraster an das Modell; es aktualisiert sich danach selbst."""
+        if section == SECTION_EINZELPLAETZE:
+            grid = BoardGrid(self.model, section, layout, NUM_EINZELPLAETZE, EINZELPLATZ_COLUMNS, 1,
+                             lambda n: self.create_einzelplatz_card(n + 1, self.model.tier(section, n)), parent)
+        else:
+            grid = BoardGrid(self.model, section, layout, NUM_GRUPPENBOXEN, GRUPPENBOX_COLUMNS, GRUPPENBOX_SLOTS,
+                             lambda n: self.create_gruppenbox_card(self._box_data(n)), parent)
+        grid.slotDropped.connect(self.on_slot_dropped)
+        grid.slotMenuRequested.connect(self.on_slot_menu)
+        self._boards.append(grid)
+        return grid
+
+    def rebuild_boards(self, section: str | None = None):
+        for grid in self._boards:
+            if section is None or grid.section == section:
+                grid.rebuild()
+
+    def open_board_window(self, section: str):
+        window = self._board_windows.get(section)
+        if window is not None:
+            window.raise_()
+            window.activateWindow()
+            return
+        window = BoardWindow(section, f"Stalltafel – {SECTION_TITLES[section]}", self)
+        self._bind_board(section, window.grid_layout, window).rebuild()
+        geometry = self.settings.value(f"board_window/{section}")
+        if geometry is None or not window.restoreGeometry(geometry):
+            # neues Fenster bevorzugt auf einem anderen Bildschirm als das Hauptfenster
+            others = [screen for screen in QApplication.screens() if screen is not self.screen()]
+            if others:
+                target = others[len(self._board_windows) % len(others)]
+                window.setGeometry(target.availableGeometry())
+        window.closed.connect(self._on_board_window_closed)
+        self._board_windows[section] = window
+        window.show()
+
+    def _on_board_window_closed(self, section: str):
+        window = self._board_windows.pop(section, None)
+        if window is None:
+            return
+        self.settings.setValue(f"board_window/{section}", window.saveGeometry())
+        self._boards = [grid for grid in self._boards if grid.parent() is not window]
+
+    def _restore_board_windows(self):
+        for section in self.settings.value("board_windows_open", [], type=list) or []:
+            if section in SECTION_TITLES:
+                self.open_board_window(section)
+
+    # --- Tabellen-Export (export.py) ---
+    def export_report(self):
+        key = self.ui.export_report_combo.currentData()
+        report = REPORTS[key]
+        start_dir = self.settings.value("last_export_dir", "")
+        suggestion = os.path.join(start_dir, f"{key}_{self._midnight.today:%Y-%m-%d}.xlsx")
+        path, chosen = QFileDialog.getSaveFileName(self, "Bericht exportieren", suggestion,
+                                                   "Excel-Arbeitsmappe (*.xlsx);;CSV-Datei (*.csv)")
+        if not path:
+            return
+        if not path.lower().endswith((".xlsx", ".csv")):
+            path += ".csv" if chosen.startswith("CSV") else ".xlsx"
+        self.settings.setValue("last_export_dir", os.path.dirname(path))
+        layout = {section: (title, GRUPPENBOX_SLOTS if section == SECTION_GRUPPENBOXEN else 1)
+                  for section, title in SECTION_TITLES.items()}
+        rows = iter_slot_rows(self.ui.subtitle_label.text(), self._state_dict(), report, layout=layout)
+        try:
+            with PROFILER.span("export.write", bericht=key):
+                count = write_report(path, report.columns, rows, report.title)
+        except OSError as e:
+            QMessageBox.critical(self, "Export", f"Bericht konnte nicht geschrieben werden:\n{e}")
+            return
+        QMessageBox.information(self, "Export", f"{count} Zeilen nach {os.path.basename(path)} exportiert.")
 
     # --- Drucken ---
     def handle_print_einzelplaetze(self):
-        if not self.einzelplaetze_processed_data:
+        if not self.model.slots(SECTION_EINZELPLAETZE):
             QMessageBox.information(self, "Hinweis", "Keine Daten zum Drucken vorhanden.")
             return
-        html_content = self.generate_print_html_einzelplaetze()
-        self.print_html(html_content, orientation=QPageLayout.Orientation.Landscape)
+        with PROFILER.span("print.html", bereich="einzelplaetze"):
+            pages = self._report_renderer.render_pages(*self._report_einzelplaetze())
+        self.print_pages(pages, orientation=QPageLayout.Orientation.Landscape)
 
     def handle_print_gruppenboxen(self):
-        if not self.gruppenboxen_processed_data:
+        if not self.model.slots(SECTION_GRUPPENBOXEN):
             QMessageBox.information(self, "Hinweis", "Keine Daten zum Drucken vorhanden.")
             return
-        html_content = self.generate_print_html_gruppenboxen()
-        self.print_html(html_content, orientation=QPageLayout.Orientation.Landscape)
+        with PROFILER.span("print.html", bereich="gruppenboxen"):
+            pages = self._report_renderer.render_pages(*self._report_gruppenboxen())
+        self.print_pages(pages, orientation=QPageLayout.Orientation.Landscape)
 
-    def generate_print_html_einzelplaetze(self) -> str:
-        header = "<h1>Einzelplätze Übersicht</h1>"
-        table_start = (
-            "<table border='1' cellspacing='0' cellpadding='5' width='100%'>"
-            "<tr><th>Platz</th><th>Tier-ID</th><th>Geboren</th><th>Alter</th><th>Schlachtung</th><th>Rasse</th></tr>"
-        )
+    def handle_labels_einzelplaetze(self):
+        if not self.model.slots(SECTION_EINZELPLAETZE):
+            QMessageBox.information(self, "Hinweis", "Keine Daten zum Drucken vorhanden.")
+            return
+        cards = []
+        for i in range(NUM_EINZELPLAETZE):
+            tier = self.model.tier(SECTION_EINZELPLAETZE, i)
+            cards.append((f"Platz {i + 1}", tier))
+        self.print_labels(cards)
+
+    def handle_labels_gruppenboxen(self):
+        if not self.model.slots(SECTION_GRUPPENBOXEN):
+            QMessageBox.information(self, "Hinweis", "Keine Daten zum Drucken vorhanden.")
+            return
+        cards = []
+        for j in range(NUM_GRUPPENBOXEN * GRUPPENBOX_SLOTS):
+            box_nr, slot = divmod(j, GRUPPENBOX_SLOTS)
+            tier = self.model.tier(SECTION_GRUPPENBOXEN, j)
+            cards.append((f"Box {box_nr + 1} · Platz {slot + 1}", tier))
+        self.print_labels(cards)
+
+    def _report_einzelplaetze(self) -> tuple[str, list[ReportSection], tuple[str, ...]]:
         rows = []
         for i in range(NUM_EINZELPLAETZE):
-            platz_nr = i + 1
-            tier = self.einzelplaetze_processed_data[i] if i < len(self.einzelplaetze_processed_data) else None
-            if tier is None:
-                rows.append(f"<tr><td>{platz_nr}</td><td colspan='5'><i>Platz ist frei</i></td></tr>")
-            elif tier.get('status') == 'not_found':
-                rows.append(
-                    f"<tr><td>{platz_nr}</td><td colspan='5' style='color:#c0392b;'>"
-                    f"<b>ID nicht gefunden:</b> {tier.get('id','')}</td></tr>"
-                )
-            else:
-                rows.append(
-                    f"<tr>"
-                    f"<td>{platz_nr}</td>"
-                    f"<td>{tier.get('id', '')}</td>"
-                    f"<td>{tier.get('geburtsdatum', '')}</td>"
-                    f"<td>{tier.get('alter', '')}</td>"
-                    f"<td>{tier.get('schlachtdatum', '')}</td>"
-                    f"<td>{tier.get('rasse', '')}</td>"
-                    f"</tr>"
-                )
-        table_end = "</table>"
-        return (
-            "<html><head>"
-            "<style>"
-            "body { font-family: Arial, Helvetica, sans-serif; }"
-            "table { border-collapse: collapse; }"
-            "th, td { text-align: left; }"
-            "</style>"
-            "</head><body>"
-            f"{header}{table_start}{''.join(rows)}{table_end}"
-            "</body></html>"
-        )
+            tier = self.model.tier(SECTION_EINZELPLAETZE, i)
+            rows.append(render_row((str(i + 1),), tier_key(tier)))
+        return "Einzelplätze Übersicht", [ReportSection(heading=None, rows=rows)], ("Platz",)
 
-    def generate_print_html_gruppenboxen(self) -> str:
-        header = "<h1>Gruppenboxen Übersicht</h1>"
-        html_parts = [
-            "<html><head><style>"
-            "body { font-family: Arial, Helvetica, sans-serif; }"
-            "table { border-collapse: collapse; }"
-            "th, td { text-align: left; }"
-            "h2 { margin-top: 20px; }"
-            "</style></head><body>",
-            header
-        ]
+    def _report_gruppenboxen(self) -> tuple[str, list[ReportSection], tuple[str, ...]]:
+        sections = []
         for i in range(NUM_GRUPPENBOXEN):
-            box_nr = i + 1
-            html_parts.append(f"<h2>Box {box_nr}</h2>")
-            html_parts.append(
-                "<table border='1' cellspacing='0' cellpadding='5' width='100%'>"
-                "<tr><th>Tier-ID</th><th>Geboren</th><th>Alter</th><th>Schlachtung</th><th>Rasse</th></tr>"
-            )
             start_index = i * GRUPPENBOX_SLOTS
             end_index = start_index + GRUPPENBOX_SLOTS
+            rows = []
             for j in range(start_index, end_index):
-                if j >= len(self.gruppenboxen_processed_data):
-                    html_parts.append("<tr><td colspan='5'><i>Platz ist frei</i></td></tr>")
-                    continue
-                tier = self.gruppenboxen_processed_data[j]
-                if tier is None:
-                    html_parts.append("<tr><td colspan='5'><i>Platz ist frei</i></td></tr>")
-                elif tier.get('status') == 'not_found':
-                    html_parts.append(
-                        "<tr><td colspan='5' style='color:#c0392b;'>"
-                        f"<b>ID nicht gefunden:</b> {tier.get('id','')}"
-                        "</td></tr>"
-                    )
-                else:
-                    html_parts.append(
-                        f"<tr>"
-                        f"<td>{tier.get('id', '')}</td>"
-                        f"<td>{tier.get('geburtsdatum', '')}</td>"
-                        f"<td>{tier.get('alter', '')}</td>"
-                        f"<td>{tier.get('schlachtdatum', '')}</td>"
-                        f"<td>{tier.get('rasse', '')}</td>"
-                        f"</tr>"
-                    )
-            html_parts.append("</table>")
-        html_parts.append("</body></html>")
-        return "".join(html_parts)
-
-    def print_html(self, html_content: str, orientation=QPageLayout.Orientation.Portrait):
-        printer = QPrinter(QPrinter.HighResolution)
+                tier = self.model.tier(SECTION_GRUPPENBOXEN, j)
+                rows.append(render_row((), tier_key(tier)))
+            sections.append(ReportSection(heading=f"Box {i + 1}", rows=rows))
+        return "Gruppenboxen Übersicht", sections, ()
 
-        # Qt6-sicheres Setzen der Ausrichtung über QPageLayout
+    def generate_print_html_einzelplaetze(self) -> str:
+        return self._report_renderer.render(*self._report_einzelplaetze())
+
+    def generate_print_html_gruppenboxen(self) -> str:
+        return self._report_renderer.render(*self._report_gruppenboxen())
+
+    def print_pages(self, pages: list[str], orientation=QPageLayout.Orientation.Portrait):
+        """Druckt vorab paginierte HTML-Seiten; gelayoutete Seiten werden wiederverwendet."""
+        printer = QPrinter(QPrinter.HighResolution)
         layout = printer.pageLayout()
         layout.setOrientation(orientation)
         printer.setPageLayout(layout)
 
         preview_dialog = QPrintPreviewDialog(printer, self)
-        # modal und sauber verhalten auf macOS
         preview_dialog.setWindowModality(Qt.ApplicationModal)
         preview_dialog.setAttribute(Qt.WA_DeleteOnClose, True)
 
-        def paint_html_on_printer(p: QPrinter):
-            doc = QTextDocument()
-            doc.setHtml(html_content)
-            # Wichtig: Seitengröße setzen, sonst wird auf macOS oft nur Teil gerendert
-            try:
-                doc.setPageSize(QSizeF(p.pageRect().size()))
-            except Exception:
-                pass
-            doc.print_(p)
+        def paint_pages(p: QPrinter):
+            with PROFILER.span("print.paint", seiten=len(pages)):
+                self._page_cache.paint(p, pages)
+
+        preview_dialog.paintRequested.connect(paint_pages)
+        preview_dialog.exec()
+
+    def print_labels(self, cards: list[tuple[str, dict | None]]):
+        """Druckt eine Karte pro Platz auf A4-Etikettenbögen (ohne HTML)."""
+        printer = QPrinter(QPrinter.HighResolution)
+        printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+        layout = printer.pageLayout()
+        layout.setOrientation(QPageLayout.Orientation.Portrait)
+        printer.setPageLayout(layout)
+
+        preview_dialog = QPrintPreviewDialog(printer, self)
+        preview_dialog.setWindowModality(Qt.ApplicationModal)
+        preview_dialog.setAttribute(Qt.WA_DeleteOnClose, True)
+
+        def paint_labels(p: QPrinter):
+            with PROFILER.span("print.labels", karten=len(cards)):
+                self._label_printer.paint(p, cards)
 
-        preview_dialog.paintRequested.connect(paint_html_on_printer)
-        # exec() ist in PySide6 vorhanden; open() kann auf macOS manchmal "freundlicher" sein
+        preview_dialog.paintRequested.connect(paint_labels)
         preview_dialog.exec()
 
     # --- Datenaufnahme/Update (unverändert) ---
     def aufnahme_einzelplaetze_ids(self):
         dialog = BestandInputDialog(NUM_EINZELPLAETZE, "Einzelplätze", self)
         ids = dialog.get_data()
+        dialog.deleteLater()
         if ids:
-            self.einzelplaetze_raw_ids = ids
+            self.model.set_raw_ids(SECTION_EINZELPLAETZE, ids)
 
     def aufnahme_gruppenboxen_ids(self):
         dialog = BestandInputDialog(NUM_GRUPPENBOXEN * GRUPPENBOX_SLOTS, "Gruppenboxen", self)
         ids = dialog.get_data()
+        dialog.deleteLater()
         if ids:
-            self.gruppenboxen_raw_ids = ids
+            self.model.set_raw_ids(SECTION_GRUPPENBOXEN, ids)
 
     def update_einzelplaetze_ui(self):
-        if not self.einzelplaetze_raw_ids:
+        raw_ids = self.model.raw_ids(SECTION_EINZELPLAETZE)
+        if not raw_ids:
             QMessageBox.information(self, "Hinweis", "Bitte zuerst IDs für Einzelplätze eingeben.")
             return
         csv_path = self.get_csv_path()
         if not csv_path:
             return
-        df = self.load_csv_data(csv_path)
-        if df is None:
-            return
-        self._csv_index = self.build_index(df)
-        self.einzelplaetze_processed_data = self.process_tier_ids(self.einzelplaetze_raw_ids, self._csv_index)
-        self.populate_einzelplaetze()
-        self.save_state()
+        with PROFILER.span("update.einzelplaetze"):
+            if not self._update_section(SECTION_EINZELPLAETZE, csv_path):
+                return
         self.ui.stacked_widget.setCurrentIndex(0)
         self.ui.btn_einzelplaetze.setChecked(True)
 
     def update_gruppenboxen_ui(self):
-        if not self.gruppenboxen_raw_ids:
+        raw_ids = self.model.raw_ids(SECTION_GRUPPENBOXEN)
+        if not raw_ids:
             QMessageBox.information(self, "Hinweis", "Bitte zuerst IDs für Gruppenboxen eingeben.")
             return
         csv_path = self.get_csv_path()
         if not csv_path:
             return
-        df = self.load_csv_data(csv_path)
-        if df is None:
-            return
-        self._csv_index = self.build_index(df)
-        self.gruppenboxen_processed_data = self.process_tier_ids(self.gruppenboxen_raw_ids, self._csv_index)
-        self.populate_gruppenboxen()
-        self.save_state()
+        with PROFILER.span("update.gruppenboxen"):
+            if not self._update_section(SECTION_GRUPPENBOXEN, csv_path):
+                return
         self.ui.stacked_widget.setCurrentIndex(1)
         self.ui.btn_gruppenboxen.setChecked(True)
 
+    def _update_section(self, section: str, csv_path: str) -> bool:
+        """Lädt den Export und löst den Bereich auf – nur die Plätze, die sich geändert haben."""
+        with PROFILER.span("csv.load"):
+            df = self.load_csv_data(csv_path)
+        if df is None:
+            return False
+        with PROFILER.span("export.diff"):
+            fingerprint = ExportFingerprint.from_frame(df, os.path.basename(csv_path))
+            previous = self._export_fingerprint or ExportFingerprint.load(FINGERPRINT_FILE)
+            diff = diff_exports(previous, fingerprint) if previous is not None else None
+        if self._herd is None or diff is None or not diff.is_empty():
+            with PROFILER.span("csv.build_index", zeilen=len(df)):
+                self._herd = self.build_index(df)
+            del df
+            with PROFILER.span("lineage.build"):
+                self._lineage = LineageIndex(self._herd)
+            with PROFILER.span("plan.build_index"):
+                self._rebuild_plan_index()
+        self._export_fingerprint = fingerprint
+        fingerprint.save(FINGERPRINT_FILE)
+
+        placed = self._slot_labels()
+        with PROFILER.span("resolve.tier_ids", ids=len(self.model.raw_ids(section))):
+            self._apply_export_diff(section, diff)
+        self.refresh_planning()
+        with PROFILER.span("state.save"):
+            self._checkpoint()
+        if diff is not None and not diff.is_empty():
+            self._report_export_diff(diff, placed)
+        return True
+
+    # --- Tageswechsel (daytick.py) ---
+    def on_day_changed(self, today: date):
+        """Alter aller Karten in einem Durchgang nachführen; nur geänderte Karten neu zeichnen."""
+        with PROFILER.span("day.refresh"):
+            for section in self.model.sections():
+                changed = []
+                for i, tier in enumerate(self.model.slots(section)):
+                    if tier is None or tier.get('status') != 'ok':
+                        continue
+                    age = self._calculate_age(tier.get('geburtsdatum', ''), today)
+                    if tier.get('alter') != age:
+                        tier['alter'] = age
+                        changed.append(i)
+                self.model.notify_changed(section, changed)
+            # Fälligkeiten (überfällig, nächste Wochen) hängen am Datum
+            self.refresh_planning()
+            self.refresh_statistics()
+            self.refresh_dwell()
+
+    # --- Unterschied zum vorigen Export (exportdiff.py) ---
+    def _slot_matches(self, raw_id: str, tier: dict | None) -> bool:
+        """Gehört die aufgelöste Karte noch zur eingegebenen ID (z. B. nach neuer Bestandsaufnahme nicht)?"""
+        if not raw_id or raw_id.strip().lower() in {"keine kuh", "leer", "frei"}:
+            return tier is None
+        return tier is not None and self.normalize_ear_tag(tier.get('id', '')) == self.normalize_ear_tag(raw_id)
+
+    def _apply_export_diff(self, section: str, diff: ExportDiff | None):
+        """
+        Ohne Vergleich (erster Export) wird der Bereich komplett aufgelöst. Sonst
+        werden nur Plätze neu aufgelöst, deren Tier zu-, abgegangen oder geändert
+        ist – in allen Bereichen – sowie im aktualisierten Bereich Plätze mit neu
+        eingegebener ID. Bei den übrigen werden nur Alter und Geschwister nachgeführt.
+        """
+        raw_ids = self.model.raw_ids(section)
+        today = self._midnight.today
+        if diff is None or len(self.model.slots(section)) != len(raw_ids):
+            old = self.model.slots(section)
+            self.model.set_slots(section, [
+                self._keep_entry_date(old[i] if i < len(old) else None, tier, today)
+                for i, tier in enumerate(self.process_tier_ids(raw_ids, self._herd))
+            ])
+            self._index_rule_dependencies(section)
+            return
+        affected = diff.affected()
+        for current in self.model.sections():
+            ids = self.model.raw_ids(current)
+            slots = self.model.slots(current)
+            stale = []
+            refreshed = []
+            for i, raw_id in enumerate(ids[:len(slots)]):
+                tier = slots[i]
+                matches = self._slot_matches(raw_id, tier)
+                if (matches and self.normalize_ear_tag(raw_id) in affected) or (current == section and not matches):
+                    stale.append(i)
+                elif tier is not None and tier.get('status') == 'ok':
+                    # Alter und Geschwisterzahl können sich ohne Änderung des Tiers selbst verschieben
+                    age = self._calculate_age(tier.get('geburtsdatum', ''), today)
+                    siblings = len(self._lineage.siblings_of(self.normalize_ear_tag(raw_id)))
+                    if tier.get('alter') != age or tier.get('geschwister') != siblings:
+                        tier['alter'] = age
+                        tier['geschwister'] = siblings
+                        refreshed.append(i)
+            for i, tier in zip(stale, self.process_tier_ids([ids[i] for i in stale], self._herd)):
+                self.model.set_slot(current, i, self._keep_entry_date(slots[i], tier, today))
+                self._index_rule_slot(current, i)
+            self.model.notify_changed(current, refreshed)
+
+    def _keep_entry_date(self, old: dict | None, new: dict | None, today: date) -> dict | None:
+        """Bleibt dasselbe Tier auf dem Platz, behält es sein Einstalldatum, sonst beginnt es heute."""
+        if new is None:
+            return None
+        if (old is not None and old.get(ENTRY_FIELD)
+                and self.normalize_ear_tag(old.get('id', '')) == self.normalize_ear_tag(new.get('id', ''))):
+            new[ENTRY_FIELD] = old[ENTRY_FIELD]
+            return new
+        return with_entry_date(new, today)
+
+    def _report_export_diff(self, diff: ExportDiff, placed: dict[str, str]):
+        gone = [(key, placed[key]) for key in diff.removed if key in placed]
+        text = f"Gegenüber dem vorigen Export: {diff.summary()}."
+        if not gone:
+            QMessageBox.information(self, "Neuer Bestand", text)
+            return
+        QMessageBox.warning(
+            self, "Neuer Bestand",
+            text + "\n\nNicht mehr im Bestand, stehen aber im Stall:\n"
+            + "\n".join(f"• {key}: {place}" for key, place in gone)
+        )
+
     def on_schlachtalter_changed(self):
-        changed = False
-        if self.einzelplaetze_processed_data:
-            self.reprocess_data(self.einzelplaetze_processed_data)
-            self.populate_einzelplaetze()
-            changed = True
-        if self.gruppenboxen_processed_data:
-            self.reprocess_data(self.gruppenboxen_processed_data)
-            self.populate_gruppenboxen()
-            changed = True
-        if changed:
-            self.save_state()
+        self.schlachtalter_rules.default_months = self._current_schlachtalter()
+        self.apply_rule_change(('default',))
+
+    # --- Schlachtalter-Regeln ---
+    def _months_for_tier(self, item: dict) -> int:
+        return self.schlachtalter_rules.months_for(
+            self.normalize_ear_tag(item.get('id', '')), item.get('rasse', 'N/A'), item.get('geschlecht', 'N/A')
+        )
+
+    def _index_rule_dependencies(self, section: str):
+        """Trägt alle Plätze eines Bereichs in die Abhängigkeitstabelle ein."""
+        for i in range(len(self.model.slots(section))):
+            self._index_rule_slot(section, i)
+
+    def _index_rule_slot(self, section: str, i: int):
+        item = self.model.tier(section, i)
+        if item and item.get('status') == 'ok':
+            candidates = self.schlachtalter_rules.candidates(
+                self.normalize_ear_tag(item.get('id', '')), item.get('rasse', 'N/A'), item.get('geschlecht', 'N/A')
+            )
+            self._rule_deps.set_slot((section, i), candidates)
+        else:
+            self._rule_deps.remove_slot((section, i))
+
+    def apply_rule_change(self, rule: tuple):
+        """Berechnet und zeichnet nur die Plätze neu, auf die die geänderte Regel wirkt."""
+        changed: dict[str, list[int]] = {SECTION_EINZELPLAETZE: [], SECTION_GRUPPENBOXEN: []}
+        for section, i in self._rule_deps.affected_slots(rule, self.schlachtalter_rules):
+            item = self.model.tier(section, i)
+            if not item or item.get('status') != 'ok':
+                continue
+            months = self._months_for_tier(item)
+            if item.get('schlachtalter') == months:
+                continue
+            item['schlachtalter'] = months
+            item['schlachtdatum'] = self._calculate_slaughter_date(item.get('geburtsdatum', ''), months)
+            changed[section].append(i)
+
+        for section, indices in changed.items():
+            self.model.notify_changed(section, indices)
+        self.refresh_planning()
+        self.refresh_statistics()
+        self._write_journal([{"typ": "regeln", "regeln": self.schlachtalter_rules.to_dict()}])
+        self._checkpoint()
+
+    def refresh_rules_table(self):
+        labels = {'rasse': "Rasse", 'geschlecht': "Geschlecht", 'tier': "Tier-ID"}
+        table = self.ui.regel_table
+        rules = self.schlachtalter_rules.rules()
+        table.setRowCount(len(rules))
+        for row, (rule, months) in enumerate(rules):
+            typ_item = QTableWidgetItem(labels.get(rule[0], rule[0]))
+            typ_item.setData(Qt.ItemDataRole.UserRole, rule)
+            table.setItem(row, 0, typ_item)
+            table.setItem(row, 1, QTableWidgetItem(str(rule[1])))
+            table.setItem(row, 2, QTableWidgetItem(f"{months} Monate"))
+
+    def on_regel_setzen(self):
+        kind = self.ui.regel_typ_combo.currentData()
+        value = self.ui.regel_wert_edit.text().strip()
+        if kind == 'tier':
+            value = self.normalize_ear_tag(value)
+        if not value:
+            QMessageBox.information(self, "Hinweis", "Bitte einen Wert für die Regel eingeben.")
+            return
+        rule = (kind, value)
+        self.schlachtalter_rules.set_rule(rule, self.ui.regel_monate_spin.value())
+        self.ui.regel_wert_edit.clear()
+        self.refresh_rules_table()
+        self.apply_rule_change(rule)
+
+    def on_regel_entfernen(self):
+        rows = sorted({index.row() for index in self.ui.regel_table.selectedIndexes()})
+        rules = [self.ui.regel_table.item(row, 0).data(Qt.ItemDataRole.UserRole) for row in rows]
+        for rule in rules:
+            self.schlachtalter_rules.remove_rule(tuple(rule))
+        self.refresh_rules_table()
+        for rule in rules:
+            self.apply_rule_change(tuple(rule))
+
+    # --- Schlachtplanung ---
+    def _rebuild_plan_index(self):
+        self._plan_index = SlaughterPlanIndex(self._herd.plan_records(), self.schlachtalter_rules)
+
+    @staticmethod
+    def _slot_label(section: str, index: int) -> str:
+        if section == SECTION_EINZELPLAETZE:
+            return f"Platz {index + 1}"
+        box_nr, slot = divmod(index, GRUPPENBOX_SLOTS)
+        return f"Box {box_nr + 1} / {slot + 1}"
+
+    def _slot_labels(self) -> dict[str, str]:
+        """Zuordnung Ohrmarke → Platzbezeichnung für alle belegten Plätze."""
+        labels: dict[str, str] = {}
+        for section in (SECTION_EINZELPLAETZE, SECTION_GRUPPENBOXEN):
+            for i, tier in enumerate(self.model.slots(section)):
+                if tier and tier.get('status') == 'ok':
+                    labels[self.normalize_ear_tag(tier.get('id', ''))] = self._slot_label(section, i)
+        return labels
+
+    def refresh_planning(self):
+        tree = self.ui.planung_tree
+        tree.clear()
+        if self._plan_index is None:
+            self.ui.planung_summary_label.setText("Noch kein Bestand geladen (Setup → Aktualisieren).")
+            return
+
+        period = self.ui.planung_period_combo.currentData()
+        count = self.ui.planung_count_spin.value()
+        today = self._midnight.today
+        with PROFILER.span("plan.buckets", zeitraum=period, anzahl=count):
+            buckets = self._plan_index.buckets(period, today, count)
+        slot_labels = self._slot_labels()
+
+        total = 0
+        for n, bucket in enumerate(buckets):
+            n_tiere = len(bucket.entries)
+            parent = QTreeWidgetItem([f"{bucket.label} — {n_tiere} {'Tier' if n_tiere == 1 else 'Tiere'}"])
+            font = parent.font(0)
+            font.setBold(True)
+            parent.setFont(0, font)
+            children = []
+            for key, slaughter in bucket.entries:
+                row = self._herd.get(key)
+                if row is None:
+                    continue
+                children.append(QTreeWidgetItem([
+                    str(row.get('Ohrmarke-Name') or key),
+                    slaughter.strftime("%d.%m.%Y"),
+                    (row.get('Geburtsdatum') or "").strip(),
+                    (row.get('Rasse(n)') or "N/A").strip(),
+                    (row.get('Geschlecht') or "N/A").strip(),
+                    slot_labels.get(key, ""),
+                ]))
+            parent.addChildren(children)
+            tree.addTopLevelItem(parent)
+            parent.setExpanded(n == 0)
+            total += len(bucket.entries)
+
+        overdue = self._plan_index.count_before(buckets[0].start) if buckets else 0
+        self.ui.planung_summary_label.setText(
+            f"{total} von {len(self._plan_index)} Tieren fällig, {overdue} bereits überfällig"
+        )
+
+    # --- Statistik ---
+    def refresh_statistics(self):
+        # nur rechnen, wenn die Seite sichtbar ist; beim Umschalten wird nachgeholt
+        if self.ui.stacked_widget.currentWidget() is not self.ui.page_statistik:
+            return
+        ui = self.ui
+        for label, section in ((ui.stat_einzel_label, SECTION_EINZELPLAETZE),
+                               (ui.stat_gruppe_label, SECTION_GRUPPENBOXEN)):
+            belegt = self.model.occupied(section)
+            capacity = self.model.capacity(section)
+            label.setText(f"{belegt} / {capacity} ({100 * belegt / capacity:.0f} %)")
+
+        if self._herd is None:
+            ui.stat_bestand_label.setText("–")
+            ui.stat_faellig_label.setText("–")
+            for chart in (ui.chart_alter, ui.chart_rassen, ui.chart_geschlecht, ui.chart_schlachtung):
+                chart.set_data([])
+            ui.stat_hinweis_label.setText("Noch kein Bestand geladen (Setup → Aktualisieren).")
+            return
+
+        with PROFILER.span("stats.compute"):
+            stats = self._herd_stats.compute(self._herd, self.schlachtalter_rules, self._midnight.today)
+        ui.stat_bestand_label.setText(str(stats.total))
+        ui.stat_faellig_label.setText(str(stats.overdue))
+        ui.chart_alter.set_data(stats.age_distribution)
+        ui.chart_rassen.set_data(stats.breeds[:8])
+        ui.chart_geschlecht.set_data(stats.sexes)
+        ui.chart_schlachtung.set_data(stats.upcoming)
+        ui.stat_hinweis_label.setText("")
+
+    def refresh_dwell(self):
+        """Verweildauer-Seite; wie die Statistik nur, wenn sie sichtbar ist."""
+        if self.ui.stacked_widget.currentWidget() is not self.ui.page_verweildauer:
+            return
+        ui = self.ui
+        with PROFILER.span("dwell.compute"):
+            stats = self._dwell_analysis.compute(self._herd, self._dwell, self._midnight.today)
+        ui.dwell_platz_label.setText(format_days(stats.stall_median))
+        if stats.longest is None:
+            ui.dwell_laengste_label.setText("–")
+        else:
+            (section, index), days = stats.longest
+            ui.dwell_laengste_label.setText(f"{format_days(days)} ({self._slot_label(section, index)})")
+        ui.chart_standzeit.set_data(stats.stall_distribution)
+        ui.chart_standzeit_bereich.set_data([(SECTION_TITLES[section], days)
+                                             for section, days in stats.section_medians.items()])
+
+        hints = []
+        if stats.placed > stats.stall_known:
+            hints.append(f"{stats.placed - stats.stall_known} belegte Plätze ohne Einstalldatum "
+                         "(vor dem Erfassen der Verweildauer belegt).")
+        if self._herd is None:
+            ui.dwell_betrieb_label.setText("–")
+            ui.dwell_zugaenge_label.setText("–")
+            ui.chart_betriebszeit.set_data([])
+            ui.chart_zugaenge.set_data([])
+            hints.append("Noch kein Bestand geladen (Setup → Aktualisieren).")
+        else:
+            ui.dwell_betrieb_label.setText(format_days(stats.farm_median))
+            ui.dwell_zugaenge_label.setText(str(stats.arrivals_recent))
+            ui.chart_betriebszeit.set_data(stats.farm_distribution)
+            ui.chart_zugaenge.set_data(stats.arrivals)
+            if stats.herd_total > stats.farm_known:
+                hints.append(f"{stats.herd_total - stats.farm_known} Tiere ohne Zugangs- und Geburtsdatum.")
+        ui.dwell_hinweis_label.setText(" ".join(hints))
 
     # --- CSV/ID Verarbeitung (unverändert) ---
     def get_csv_path(self) -> str | None:
@@ -439,17 +1289,17 @@ class MainWindow(QMainWindow):
 
     def load_csv_data(self, file_path: str) -> pd.DataFrame | None:
         try:
-            df = pd.read_csv(file_path, delimiter=';', dtype=str, quotechar='"',
-                             skipinitialspace=True, encoding='utf-8-sig')
-            df.columns = [col.strip() for col in df.columns]
-            missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
-            if missing:
-                QMessageBox.critical(
-                    self, "CSV-Fehler",
-                    "In der CSV fehlen Spalten:\n- " + "\n- ".join(missing)
-                )
-                return None
-            return df
+            # Kodierung, Trennzeichen und Spaltennamen aus dem Dateianfang erkennen
+            # (auch von Excel neu gespeicherte Exporte); eine unpassende Datei
+            # scheitert hier, bevor sie ganz gelesen wird
+            fmt = sniff_csv_format(file_path, REQUIRED_COLUMNS, OPTIONAL_COLUMNS)
+            # leere Felder als "" statt NaN lesen, die Verarbeitung erwartet Strings;
+            # nur die benötigten Spalten (Info, Zugang usw. werden gar nicht erst gelesen)
+            with PROFILER.span("csv.parse", format=fmt.describe()):
+                return read_csv_export(file_path, fmt)
+        except CsvFormatError as e:
+            QMessageBox.critical(self, "CSV-Fehler", str(e))
+            return None
         except Exception as e:
             QMessageBox.critical(self, "CSV-Fehler", f"Konnte CSV-Datei nicht laden:\n{e}")
             return None
@@ -465,17 +1315,12 @@ class MainWindow(QMainWindow):
         key = f"AT{s}"
         return key if key != "AT" else ""
 
-    def build_index(self, df: pd.DataFrame) -> dict[str, pd.Series]:
-        col = 'Ohrmarke-Name'
-        index: dict[str, pd.Series] = {}
-        for _, row in df.iterrows():
-            key = self.normalize_ear_tag(str(row.get(col, "")))
-            if key:
-                index[key] = row
-        return index
+    def build_index(self, df: pd.DataFrame) -> HerdStore:
+        return HerdStore.from_frame(df)
 
-    def process_tier_ids(self, ids: list[str], index: dict[str, pd.Series]) -> list[dict | None]:
+    def process_tier_ids(self, ids: list[str], index: HerdStore) -> list[dict | None]:
         processed_data: list[dict | None] = []
+        today = self._midnight.today
         for original_id in ids:
             if not original_id or original_id.strip().lower() in {"keine kuh", "leer", "frei"}:
                 processed_data.append(None)
@@ -485,30 +1330,55 @@ class MainWindow(QMainWindow):
             if row is None:
                 processed_data.append({'id': original_id, 'status': 'not_found'})
                 continue
-
-            geb_dat_str = (row.get('Geburtsdatum') or "").strip()
-            rasse = (row.get('Rasse(n)') or "N/A").strip()
-            geschlecht = (row.get('Geschlecht') or "N/A").strip()
-            full_id = (row.get('Ohrmarke-Name') or key)
-
-            data_dict = {
-                'id': full_id,
-                'geburtsdatum': geb_dat_str,
-                'alter': self._calculate_age(geb_dat_str),
-                'schlachtdatum': self._calculate_slaughter_date(geb_dat_str),
-                'rasse': rasse,
-                'geschlecht': geschlecht,
-                'status': 'ok',
-            }
-            processed_data.append(data_dict)
+            processed_data.append(self._tier_from_row(key, row, today))
         return processed_data
 
+    def _tier_from_row(self, key: str, row, today: date) -> dict:
+        """Platzdaten aus einer Bestandszeile (HerdRow) oder einem Registereintrag (dict)."""
+        geb_dat_str = (row.get('Geburtsdatum') or "").strip()
+        rasse = (row.get('Rasse(n)') or "N/A").strip()
+        geschlecht = (row.get('Geschlecht') or "N/A").strip()
+        full_id = (row.get('Ohrmarke-Name') or key)
+        mutter = row.get('OM-Mutter') or "N/A"
+        geschwister = len(self._lineage.siblings_of(key)) if self._lineage is not None else "N/A"
+
+        months = self.schlachtalter_rules.months_for(key, rasse, geschlecht)
+        return {
+            'id': full_id,
+            'geburtsdatum': geb_dat_str,
+            'alter': self._calculate_age(geb_dat_str, today),
+            'schlachtdatum': self._calculate_slaughter_date(geb_dat_str, months),
+            'schlachtalter': months,
+            'rasse': rasse,
+            'geschlecht': geschlecht,
+            'mutter': mutter,
+            'geschwister': geschwister,
+            'status': 'ok',
+        }
+
+    def _refresh_derived(self, item: dict, today: date) -> bool:
+        """Schlachtalter, Schlachtdatum und Alter neu berechnen; True, wenn sich etwas geändert hat."""
+        geb = item.get('geburtsdatum', '')
+        months = self._months_for_tier(item)
+        derived = {
+            'schlachtalter': months,
+            'schlachtdatum': self._calculate_slaughter_date(geb, months),
+            'alter': self._calculate_age(geb, today),
+        }
+        if all(item.get(key) == value for key, value in derived.items()):
+            return False
+        item.update(derived)
+        return True
+
     def reprocess_data(self, data_list: list[dict | None]):
+        today = self._midnight.today
         for item in data_list:
             if item and item.get('status') == 'ok' and 'geburtsdatum' in item:
                 geb = item['geburtsdatum']
-                item['schlachtdatum'] = self._calculate_slaughter_date(geb)
-                item['alter'] = self._calculate_age(geb)
+                months = self._months_for_tier(item)
+                item['schlachtalter'] = months
+                item['schlachtdatum'] = self._calculate_slaughter_date(geb, months)
+                item['alter'] = self._calculate_age(geb, today)
 
     @staticmethod
     def _parse_date(date_str: str) -> datetime | None:
@@ -521,11 +1391,12 @@ class MainWindow(QMainWindow):
                 continue
         return None
 
-    def _calculate_age(self, birthdate_str: str) -> str:
+    def _calculate_age(self, birthdate_str: str, today: date | None = None) -> str:
+        """Alter als Text; `today` wird pro Durchlauf einmal ermittelt und durchgereicht."""
         birthdate = self._parse_date(birthdate_str)
         if not birthdate:
             return "N/A"
-        today = datetime.now()
+        today = today or self._midnight.today
         total_months = (today.year - birthdate.year) * 12 + (today.month - birthdate.month)
         if today.day < birthdate.day:
             total_months -= 1
@@ -540,101 +1411,135 @@ class MainWindow(QMainWindow):
         else:
             return month_str
 
-    def _calculate_slaughter_date(self, birthdate_str: str) -> str:
+    def _calculate_slaughter_date(self, birthdate_str: str, months: int | None = None) -> str:
         birthdate = self._parse_date(birthdate_str)
         if not birthdate:
             return "N/A"
-        months_to_add = self.ui.schlachtalter_combo.currentData()
+        if months is None:
+            months = self.schlachtalter_rules.default_months
+        slaughter_date = birthdate + relativedelta(months=months)
+        return slaughter_date.strftime("%d.%m.%Y")
+
+    def _current_schlachtalter(self) -> int:
+        months = self.ui.schlachtalter_combo.currentData()
         try:
-            months_to_add = int(months_to_add) if months_to_add is not None else 0
+            return int(months) if months is not None else 0
         except (ValueError, TypeError):
-            months_to_add = 0
-        slaughter_date = birthdate + relativedelta(months=months_to_add)
-        return slaughter_date.strftime("%d.%m.%Y")
+            return 0
 
     # --- State speichern/laden ---
+    # --- Zustand: Snapshot und Journal (journal.py) ---
+    def _state_dict(self) -> dict:
+        return {
+            "einzelplaetze": {
+                "raw_ids": self.model.raw_ids(SECTION_EINZELPLAETZE),
+                "processed": self.model.slots(SECTION_EINZELPLAETZE),
+            },
+            "gruppenboxen": {
+                "raw_ids": self.model.raw_ids(SECTION_GRUPPENBOXEN),
+                "processed": self.model.slots(SECTION_GRUPPENBOXEN),
+            },
+            "schlachtalter_regeln": self.schlachtalter_rules.to_dict(),
+        }
+
     def save_state(self):
+        """Schreibt einen vollständigen Snapshot und leert das Journal."""
         try:
-            state = {
-                "einzelplaetze": {
-                    "raw_ids": self.einzelplaetze_raw_ids,
-                    "processed": self.einzelplaetze_processed_data,
-                },
-                "gruppenboxen": {
-                    "raw_ids": self.gruppenboxen_raw_ids,
-                    "processed": self.gruppenboxen_processed_data,
-                },
-            }
-            with open(STATE_FILE, "w", encoding="utf-8") as f:
-                json.dump(state, f, ensure_ascii=False, indent=2)
+            self._journal.write_snapshot(self._state_dict())
         except Exception as e:
             QMessageBox.warning(self, "Speichern fehlgeschlagen", f"Zustand konnte nicht gespeichert werden:\n{e}")
 
+    def _checkpoint(self):
+        """Sicherungspunkt nach einer Änderung: Snapshot nur, wenn das Journal lang geworden ist."""
+        if self._journal.needs_compaction():
+            self.save_state()
+
+    def _write_journal(self, records: list[dict]):
+        try:
+            self._journal.append(records)
+        except OSError as e:
+            QMessageBox.warning(self, "Speichern fehlgeschlagen", f"Änderung konnte nicht gespeichert werden:\n{e}")
+
+    def _journal_section(self, section: str):
+        self._write_journal([{"typ": "bereich", "bereich": section,
+                              "raw_ids": self.model.raw_ids(section), "processed": self.model.slots(section)}])
+
+    def _journal_slots(self, section: str, indices: list[int]):
+        raw_ids = self.model.raw_ids(section)
+        self._write_journal([{"typ": "platz", "bereich": section, "platz": i,
+                              "raw_id": raw_ids[i] if i < len(raw_ids) else "",
+                              "tier": self.model.tier(section, i)} for i in indices])
+
     def load_state(self):
-        if not os.path.isfile(STATE_FILE):
-            return
         try:
-            with open(STATE_FILE, "r", encoding="utf-8") as f:
-                state = json.load(f)
+            state = self._journal.load()
+            if state is None:
+                return
             ep = state.get("einzelplaetze", {})
             gp = state.get("gruppenboxen", {})
 
-            self.einzelplaetze_raw_ids = ep.get("raw_ids", []) or []
-            self.einzelplaetze_processed_data = ep.get("processed", []) or []
+            einzel = ep.get("processed", []) or []
+            gruppe = gp.get("processed", []) or []
+            self.model.set_raw_ids(SECTION_EINZELPLAETZE, ep.get("raw_ids", []) or [])
+            self.model.set_raw_ids(SECTION_GRUPPENBOXEN, gp.get("raw_ids", []) or [])
 
-            self.gruppenboxen_raw_ids = gp.get("raw_ids", []) or []
-            self.gruppenboxen_processed_data = gp.get("processed", []) or []
+            self.schlachtalter_rules = SchlachtalterRules.from_dict(
+                state.get("schlachtalter_regeln") or {}, self._current_schlachtalter()
+            )
+            combo = self.ui.schlachtalter_combo
+            index = combo.findData(self.schlachtalter_rules.default_months)
+            if index >= 0:
+                combo.blockSignals(True)
+                combo.setCurrentIndex(index)
+                combo.blockSignals(False)
 
             # abgeleitete Felder aktualisieren (Alter/Schlachtung)
-            if self.einzelplaetze_processed_data:
-                self.reprocess_data(self.einzelplaetze_processed_data)
-            if self.gruppenboxen_processed_data:
-                self.reprocess_data(self.gruppenboxen_processed_data)
+            self.reprocess_data(einzel)
+            self.reprocess_data(gruppe)
+            self.model.set_slots(SECTION_EINZELPLAETZE, einzel)
+            self.model.set_slots(SECTION_GRUPPENBOXEN, gruppe)
+            # neue Regeln und neue Belegung: die Abhängigkeitstabelle von Grund auf neu aufbauen
+            self._rule_deps.clear()
+            self._index_rule_dependencies(SECTION_EINZELPLAETZE)
+            self._index_rule_dependencies(SECTION_GRUPPENBOXEN)
         except Exception as e:
             QMessageBox.warning(self, "Zustand laden", f"Gespeicherter Zustand konnte nicht geladen werden:\n{e}")
 
     def closeEvent(self, event):
         try:
             self.save_state()
+            self.settings.setValue("last_page", self.ui.stacked_widget.currentIndex())
+            self._save_start_image()
+            # offene Tafelfenster merken und mit dem Hauptfenster schließen
+            self.settings.setValue("board_windows_open", list(self._board_windows))
+            for window in list(self._board_windows.values()):
+                window.close()
+            self.stop_sync()
+            self.stop_dashboard()
+            self.stop_registry()
         finally:
             super().closeEvent(event)
 
+    def _save_start_image(self):
+        """Bild der Tafel für den nächsten Start (nach save_state, damit der Stand passt)."""
+        if not (self.isVisible() and self.ui.chk_instant_start.isChecked()):
+            return
+        try:
+            with PROFILER.span("startup.save_image"):
+                # Overlay und Suchmarkierung gehören nicht auf das Startbild
+                self._profiler_overlay.hide()
+                self.ui.search_edit.clear()
+                self.ui.search_window_combo.setCurrentIndex(0)
+                save_start_image(self, START_IMAGE_FILE, [STATE_FILE, WAL_FILE])
+        except OSError:
+            pass  # ohne Bild startet die Tafel wie bisher
+
     # --- UI-Aufbau ---
-    def _clear_grid_layout(self, layout):
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-            child_layout = item.layout()
-            if child_layout is not None:
-                self._clear_grid_layout(child_layout)
-
-    def populate_einzelplaetze(self):
-        self._clear_grid_layout(self.ui.einzelplaetze_grid_layout)
-        cols = 7
-        for i in range(NUM_EINZELPLAETZE):
-            tier_info = self.einzelplaetze_processed_data[i] if i < len(self.einzelplaetze_processed_data) else None
-            row, col = divmod(i, cols)
-            card = self.create_einzelplatz_card(i + 1, tier_info)
-            self.ui.einzelplaetze_grid_layout.addWidget(card, row, col)
-
-    def populate_gruppenboxen(self):
-        self._clear_grid_layout(self.ui.gruppenboxen_grid_layout)
-        cols = 3
-        for i in range(NUM_GRUPPENBOXEN):
-            start_index = i * GRUPPENBOX_SLOTS
-            end_index = start_index + GRUPPENBOX_SLOTS
-            tiere_in_box: list[dict | None] = []
-            for j in range(start_index, end_index):
-                if j < len(self.gruppenboxen_processed_data):
-                    tiere_in_box.append(self.gruppenboxen_processed_data[j])
-                else:
-                    tiere_in_box.append(None)
-            box_data = {'box_nr': i + 1, 'max_plaetze': GRUPPENBOX_SLOTS, 'tiere': tiere_in_box}
-            row, col = divmod(i, cols)
-            card = self.create_gruppenbox_card(box_data)
-            self.ui.gruppenboxen_grid_layout.addWidget(card, row, col)
+    def _box_data(self, box_index: int) -> dict:
+        start_index = box_index * GRUPPENBOX_SLOTS
+        end_index = start_index + GRUPPENBOX_SLOTS
+        tiere_in_box = [self.model.tier(SECTION_GRUPPENBOXEN, j) for j in range(start_index, end_index)]
+        return {'box_nr': box_index + 1, 'max_plaetze': GRUPPENBOX_SLOTS, 'tiere': tiere_in_box}
 
     def _create_info_row(self, icon_name: str, label: str, value: str) -> QWidget:
         row_widget = QWidget()
@@ -642,11 +1547,12 @@ class MainWindow(QMainWindow):
         row_layout.setContentsMargins(0, 0, 0, 0)
         row_layout.setSpacing(10)
         icon_label = QLabel()
-        icon_label.setPixmap(qta.icon(icon_name, color='#7f8c8d').pixmap(16, 16))
+        icon_label.setPixmap(icon_pixmap(icon_name, '#7f8c8d', 16))
         icon_label.setFixedWidth(20)
         text_label = QLabel(f"{label}")
         text_label.setFixedWidth(80)
-        value_label = QLabel(f"<b>{value}</b>")
+        value_label = QLabel(str(value))
+        value_label.setObjectName("InfoValue")
         row_layout.addWidget(icon_label)
         row_layout.addWidget(text_label)
         row_layout.addWidget(value_label)
@@ -654,20 +1560,52 @@ class MainWindow(QMainWindow):
         return row_widget
 
     def _apply_shadow(self, widget: QWidget):
-        # use widget as parent for the effect to avoid odd artifacts on macOS
-        shadow = QGraphicsDropShadowEffect(widget)
-        shadow.setBlurRadius(20)
-        # slightly increased alpha to get a softer, non-black artifacting shadow
-        shadow.setColor(QColor(0, 0, 0, 80))
-        shadow.setOffset(0, 3)
-        widget.setGraphicsEffect(shadow)
-
-    def create_einzelplatz_card(self, platz_nr: int, tier_info: dict | None) -> QFrame:
+        with PROFILER.span("render.shadow"):
+            # use widget as parent for the effect to avoid odd artifacts on macOS
+            shadow = QGraphicsDropShadowEffect(widget)
+            shadow.setBlurRadius(20)
+            # slightly increased alpha to get a softer, non-black artifacting shadow
+            shadow.setColor(QColor(0, 0, 0, 80))
+            shadow.setOffset(0, 3)
+            widget.setGraphicsEffect(shadow)
+
+    def _create_painted_einzelplatz_card(self, platz_nr: int, tier_info: dict | None) -> PaintedCard:
+        title = f"Platz {platz_nr}"
+        minimum = QSize(250, 240)
+        if tier_info is None:
+            card = PaintedCard(title, ('fa5s.minus-circle', '#bdc3c7'), center_body=True, minimum=minimum)
+            card.add_text("Platz ist frei", "#95a5a6", italic=True, center=True)
+        elif tier_info.get('status') == 'not_found':
+            card = PaintedCard(title, ('fa5s.exclamation-triangle', '#e74c3c'), center_body=True, minimum=minimum)
+            card.add_text(f"ID nicht gefunden: {tier_info.get('id', '')}", "#c0392b", bold=True)
+        else:
+            card = PaintedCard(title, ('fa5s.check-circle', '#27ae60'), minimum=minimum)
+            card.add_rows([(icon, label, str(tier_info.get(key, 'N/A'))) for icon, label, key in CARD_FIELDS])
+        return card
+
+    def _create_painted_gruppenbox_card(self, box_data: dict) -> PaintedCard:
+        belegt = sum(1 for t in box_data['tiere'] if t is not None)
+        card = PaintedCard(f"Box {box_data['box_nr']}", header_text=f"{belegt} / {box_data['max_plaetze']} Belegt",
+                           minimum=QSize(400, 0))
+        card.add_line()
+        for idx, tier in enumerate(box_data['tiere'], start=1):
+            if tier is None:
+                card.add_text(f"Platz {idx} ist frei", "#95a5a6", italic=True, slot=idx - 1)
+            elif tier.get('status') == 'not_found':
+                card.add_text(f"ID nicht gefunden: {tier.get('id', '')}", "#c0392b", bold=True, slot=idx - 1)
+            else:
+                card.add_rows([(icon, label, str(tier.get(key, 'N/A'))) for icon, label, key in BOX_CARD_FIELDS],
+                              gap=5, slot=idx - 1)
+        return card
+
+    def create_einzelplatz_card(self, platz_nr: int, tier_info: dict | None) -> QWidget:
+        if self.low_cost_rendering:
+            return self._create_painted_einzelplatz_card(platz_nr, tier_info)
         card = QFrame()
-        card.setObjectName("Card")
+        # Aussehen kommt aus dem App-Stylesheet (#SlotCard, Eigenschaft `state`)
+        card.setObjectName("SlotCard")
+        card.setProperty("state", slot_state(tier_info))
         card.setMinimumSize(250, 240)
-        # ensure an explicit background so macOS native will not bleed through
-        card.setStyleSheet("QFrame#Card { background-color: #ffffff; border: 1px solid #e6e9ea; border-radius: 10px; }")
         self._apply_shadow(card)
 
         layout = QVBoxLayout(card)
@@ -675,66 +1613,66 @@ class MainWindow(QMainWindow):
         layout.setSpacing(10)
 
         header_layout = QHBoxLayout()
-        title = QLabel(f"<b>Platz {platz_nr}</b>")
-        title.setStyleSheet("font-size: 14px;")
+        title = QLabel(f"Platz {platz_nr}")
+        title.setObjectName("SlotTitle")
         status_icon = QLabel()
 
         if tier_info is None:
-            icon = qta.icon('fa5s.minus-circle', color='#bdc3c7')
+            icon = icon_pixmap('fa5s.minus-circle', '#bdc3c7', 24)
         elif tier_info.get('status') == 'not_found':
-            icon = qta.icon('fa5s.exclamation-triangle', color='#e74c3c')
+            icon = icon_pixmap('fa5s.exclamation-triangle', '#e74c3c', 24)
         else:
-            icon = qta.icon('fa5s.check-circle', color='#27ae60')
+            icon = icon_pixmap('fa5s.check-circle', '#27ae60', 24)
 
-        status_icon.setPixmap(icon.pixmap(24, 24))
+        status_icon.setPixmap(icon)
         header_layout.addWidget(title)
         header_layout.addStretch()
         header_layout.addWidget(status_icon)
         layout.addLayout(header_layout)
 
         if tier_info is None:
-            frei_label = QLabel("<i>Platz ist frei</i>")
+            frei_label = QLabel("Platz ist frei")
             frei_label.setObjectName("PlatzFreiLabel")
             frei_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             layout.addStretch()
             layout.addWidget(frei_label)
             layout.addStretch()
         elif tier_info.get('status') == 'not_found':
-            not_found_label = QLabel(f"<span style='color:#c0392b;'><b>ID nicht gefunden:</b> {tier_info.get('id','')}</span>")
+            not_found_label = QLabel(f"<b>ID nicht gefunden:</b> {tier_info.get('id','')}")
+            not_found_label.setObjectName("SlotMessage")
+            not_found_label.setProperty("state", "not_found")
             not_found_label.setWordWrap(True)
             layout.addStretch()
             layout.addWidget(not_found_label)
             layout.addStretch()
         else:
-            layout.addWidget(self._create_info_row('fa5s.tag', '# Tier-ID', tier_info.get('id', 'N/A')))
-            layout.addWidget(self._create_info_row('fa5s.calendar-day', '# Geboren', tier_info.get('geburtsdatum', 'N/A')))
-            layout.addWidget(self._create_info_row('fa5s.birthday-cake', '# Alter', tier_info.get('alter', 'N/A')))
-            layout.addWidget(self._create_info_row('fa5s.gavel', '# Schlachtung', tier_info.get('schlachtdatum', 'N/A')))
-            layout.addWidget(self._create_info_row('fa5s.dna', '# Rasse', tier_info.get('rasse', 'N/A')))
-            layout.addWidget(self._create_info_row('fa5s.venus-mars', '# Geschlecht', tier_info.get('geschlecht', 'N/A')))
+            for icon_name, label, key in CARD_FIELDS:
+                layout.addWidget(self._create_info_row(icon_name, label, tier_info.get(key, 'N/A')))
             layout.addStretch()
 
         return card
 
-    def create_gruppenbox_card(self, box_data: dict) -> QFrame:
+    def create_gruppenbox_card(self, box_data: dict) -> QWidget:
+        if self.low_cost_rendering:
+            return self._create_painted_gruppenbox_card(box_data)
         card = QFrame()
-        card.setObjectName("Card")
+        card.setObjectName("SlotCard")
+        states = {slot_state(t) for t in box_data['tiere']}
+        card.setProperty("state", "not_found" if "not_found" in states else "ok" if "ok" in states else "free")
         card.setMinimumWidth(400)
-        # explicit background to avoid macOS blending artifacts
-        card.setStyleSheet("QFrame#Card { background-color: #ffffff; border: 1px solid #e6e9ea; border-radius: 10px; }")
         self._apply_shadow(card)
 
         layout = QVBoxLayout(card)
         layout.setContentsMargins(15, 10, 15, 15)
 
         header_layout = QHBoxLayout()
-        title = QLabel(f"<b>Box {box_data['box_nr']}</b>")
-        title.setStyleSheet("font-size: 14px;")
+        title = QLabel(f"Box {box_data['box_nr']}")
+        title.setObjectName("SlotTitle")
 
         belegt = sum(1 for t in box_data['tiere'] if t is not None)
         max_p = box_data['max_plaetze']
         status_label = QLabel(f"<b>{belegt} / {max_p}</b> Belegt")
-        status_label.setStyleSheet("color: #7f8c8d;")
+        status_label.setObjectName("BoxStatus")
 
         header_layout.addWidget(title)
         header_layout.addStretch()
@@ -744,19 +1682,24 @@ class MainWindow(QMainWindow):
         line = QFrame()
         line.setFrameShape(QFrame.Shape.HLine)
         line.setFrameShadow(QFrame.Shadow.Sunken)
-        line.setStyleSheet("color: #ecf0f1;")
+        line.setObjectName("BoxDivider")
         layout.addWidget(line)
 
-        # Einträge
+        # Einträge; die Eigenschaft `slot` ordnet Widgets beim Ziehen und Ablegen dem Platz zu
         for idx, tier in enumerate(box_data['tiere'], start=1):
             if tier is None:
-                frei_label = QLabel(f"<i>Platz {idx} ist frei</i>")
-                frei_label.setStyleSheet("color: #95a5a6; padding-top: 6px; padding-bottom: 6px;")
+                frei_label = QLabel(f"Platz {idx} ist frei")
+                frei_label.setObjectName("SlotMessage")
+                frei_label.setProperty("state", "free")
+                frei_label.setProperty("slot", idx - 1)
                 layout.addWidget(frei_label)
                 continue
 
             if tier.get('status') == 'not_found':
-                nf_label = QLabel(f"<span style='color:#c0392b;'><b>ID nicht gefunden:</b> {tier.get('id','')}</span>")
+                nf_label = QLabel(f"<b>ID nicht gefunden:</b> {tier.get('id','')}")
+                nf_label.setObjectName("SlotMessage")
+                nf_label.setProperty("state", "not_found")
+                nf_label.setProperty("slot", idx - 1)
                 nf_label.setWordWrap(True)
                 layout.addWidget(nf_label)
                 layout.addSpacing(8)
@@ -764,11 +1707,10 @@ class MainWindow(QMainWindow):
 
             tier_layout = QVBoxLayout()
             tier_layout.setSpacing(5)
-            tier_layout.addWidget(self._create_info_row('fa5s.tag', '# Tier-ID', tier.get('id', 'N/A')))
-            tier_layout.addWidget(self._create_info_row('fa5s.calendar-day', '# Geboren', tier.get('geburtsdatum', 'N/A')))
-            tier_layout.addWidget(self._create_info_row('fa5s.birthday-cake', '# Alter', tier.get('alter', 'N/A')))
-            tier_layout.addWidget(self._create_info_row('fa5s.gavel', '# Schlachtung', tier.get('schlachtdatum', 'N/A')))
-            tier_layout.addWidget(self._create_info_row('fa5s.dna', '# Rasse', tier.get('rasse', 'N/A')))
+            for icon_name, label, key in BOX_CARD_FIELDS:
+                row = self._create_info_row(icon_name, label, tier.get(key, 'N/A'))
+                row.setProperty("slot", idx - 1)
+                tier_layout.addWidget(row)
             layout.addLayout(tier_layout)
             layout.addSpacing(10)
 
@@ -887,8 +1829,16 @@ def apply_platform_fixes(app: QApplication):
 
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    apply_platform_fixes(app)  # wichtige macOS-Fixes anwenden
-    window = MainWindow()
-    window.show()
+    # Zeitmessung: per Umgebungsvariable STALLTAFEL_PROFILE=1 oder Schalter auf der Setup-Seite
+    PROFILER.enabled = (
+        os.environ.get("STALLTAFEL_PROFILE", "") not in ("", "0")
+        or QSettings(ORG_NAME, APP_NAME).value("profiling", False, type=bool)
+    )
+    with PROFILER.span("startup.total"):
+        apply_platform_fixes(app)  # wichtige macOS-Fixes anwenden
+        window = MainWindow()
+        if start_image is not None:
+            start_image.finish(window)
+        else:
+            window.show()
     sys.exit(app.exec())
@@ -0,0 +1,91 @@
+# model.py
+"""
+Gemeinsames, beobachtbares Datenmodell der Stalltafel.
+
+Das Modell hält je Bereich (Einzelplätze, Gruppenboxen) die eingegebenen IDs
+und die aufgelösten Plätze. Alle Ansichten – die Seiten im Hauptfenster und
+abgelöste Tafelfenster auf weiteren Bildschirmen – lesen daraus und werden
+per Signal benachrichtigt:
+
+- `sectionReset(bereich)`: der ganze Bereich ist neu (z. B. nach Aktualisieren)
+- `slotsChanged(bereich, indizes)`: nur diese Plätze haben sich geändert
+
+Die Platzlisten gehören dem Modell. Wer ein Tier-Dict direkt ändert (z. B.
+neues Schlachtdatum), meldet das anschließend mit `notify_changed`.
+
+Jedes belegte Platz-Dict trägt unter `ENTRY_FIELD` den Tag (ISO), seit dem
+das Tier auf diesem Platz steht. Wer ein Tier neu auf einen Platz setzt,
+stempelt es mit `with_entry_date`; wird dasselbe Tier nur neu aufgelöst,
+bleibt der alte Stempel.
+"""
+from datetime import date
+from typing import Iterable
+
+from PySide6.QtCore import QObject, Signal
+
+ENTRY_FIELD = "eingestallt"
+
+
+def with_entry_date(tier: dict | None, since: date) -> dict | None:
+    """Kopie des Tiers mit Einstalldatum `since` (None bleibt None)."""
+    if tier is None:
+        return None
+    return {**tier, ENTRY_FIELD: since.isoformat()}
+
+
+class StallModel(QObject):
+    slotsChanged = Signal(str, list)
+    sectionReset = Signal(str)
+
+    def __init__(self, capacities: dict[str, int], parent=None):
+        super().__init__(parent)
+        self._capacity = dict(capacities)
+        self._raw_ids: dict[str, list[str]] = {section: [] for section in capacities}
+        self._slots: dict[str, list[dict | None]] = {section: [] for section in capacities}
+
+    def sections(self) -> list[str]:
+        return list(self._capacity)
+
+    def capacity(self, section: str) -> int:
+        return self._capacity[section]
+
+    # --- Eingegebene IDs ---
+    def raw_ids(self, section: str) -> list[str]:
+        return self._raw_ids[section]
+
+    def set_raw_ids(self, section: str, ids: list[str]):
+        self._raw_ids[section] = list(ids)
+
+    def set_raw_id(self, section: str, index: int, raw_id: str):
+        ids = self._raw_ids[section]
+        if index >= len(ids):
+            ids.extend([""] * (index + 1 - len(ids)))
+        ids[index] = raw_id
+
+    # --- Aufgelöste Plätze ---
+    def slots(self, section: str) -> list[dict | None]:
+        """Platzliste des Bereichs (nur lesen; Änderungen über set_slots/set_slot)."""
+        return self._slots[section]
+
+    def tier(self, section: str, index: int) -> dict | None:
+        slots = self._slots[section]
+        return slots[index] if 0 <= index < len(slots) else None
+
+    def occupied(self, section: str) -> int:
+        return sum(1 for tier in self._slots[section][:self._capacity[section]] if tier is not None)
+
+    def set_slots(self, section: str, slots: list[dict | None]):
+        self._slots[section] = list(slots)
+        self.sectionReset.emit(section)
+
+    def set_slot(self, section: str, index: int, tier: dict | None):
+        slots = self._slots[section]
+        if index >= len(slots):
+            slots.extend([None] * (index + 1 - len(slots)))
+        slots[index] = tier
+        self.slotsChanged.emit(section, [index])
+
+    def notify_changed(self, section: str, indices: Iterable[int]):
+        indices = sorted(set(indices))
+        if indices:
+            self.slotsChanged.emit(section, indices)
@@ -0,0 +1,241 @@
+# moves.py
+"""
+Umstallen ohne neue Bestandsaufnahme: Tiere verschieben, tauschen oder einen
+Platz räumen – auch zwischen Einzelplätzen und Gruppenboxen.
+
+Eine Operation ändert nur die beteiligten Plätze im Modell (`set_slot`), die
+Tafeln ersetzen daher nur deren Karten. Eingabe-ID und aufgelöstes Tier
+wandern gemeinsam, damit ein späteres Aktualisieren die neue Belegung behält.
+
+Jede Operation wird an ein Journal angehängt (JSON Lines, nur anhängen,
+danach fsync). Rückgängig und Wiederholen sind selbst Journaleinträge, die
+auf die ursprüngliche Operation verweisen; die Undo/Redo-Stapel entstehen
+beim Start durch Abspielen des Journals. Rückgängig reicht höchstens
+`MAX_UNDO` Operationen zurück. Ist das Journal beim Start länger als
+`COMPACT_AFTER` Zeilen, wird es – wie der Snapshot in journal.py – atomar
+durch die noch erreichbaren Operationen ersetzt; die Startzeit wächst also
+nicht mit der Historie.
+"""
+import json
+import os
+from datetime import date, datetime
+from typing import Callable
+
+from PySide6.QtCore import QObject, Signal
+
+from model import StallModel, with_entry_date
+
+FREE_ID = "Keine Kuh"
+# So viele Operationen lassen sich höchstens zurücknehmen
+MAX_UNDO = 100
+# Ab so vielen Zeilen wird das Journal beim Start auf die Undo/Redo-Stapel verkürzt
+COMPACT_AFTER = 500
+
+Slot = tuple[str, int]
+
+
+def _fsync_dir(path: str):
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class MoveJournal:
+    """Nur-anhängen-Journal der Umstallungen."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._entries: list[dict] = []
+        if path and os.path.isfile(path):
+            self._load(path)
+
+    def _load(self, path: str):
+        good = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    self._entries.append(json.loads(line.decode("utf-8")))
+                except ValueError:
+                    break  # abgebrochener Schreibvorgang nach Absturz: alles danach ist unvollständig
+                good += len(line)
+        if good < os.path.getsize(path):
+            # unvollständigen Rest abschneiden, sonst landet der nächste Eintrag auf derselben Zeile
+            with open(path, "r+b") as f:
+                f.truncate(good)
+        if good:
+            with open(path, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def entries(self) -> list[dict]:
+        return self._entries
+
+    def next_nr(self) -> int:
+        return self._entries[-1]["nr"] + 1 if self._entries else 1
+
+    def append(self, entry: dict) -> dict:
+        entry = {"nr": self.next_nr(), "zeit": datetime.now().isoformat(timespec="seconds"), **entry}
+        self._entries.append(entry)
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        return entry
+
+    def rewrite(self, entries: list[dict]):
+        """Ersetzt das Journal atomar durch `entries` (temporäre Datei, dann umbenennen)."""
+        self._entries = list(entries)
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in self._entries)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _fsync_dir(self.path)
+
+
+class SlotOperations(QObject):
+    """Verschieben, Tauschen, Räumen sowie Rückgängig/Wiederholen auf dem Modell."""
+    applied = Signal(list)
+
+    def __init__(self, model: StallModel, journal: MoveJournal, parent=None,
+                 today: Callable[[], date] = date.today):
+        super().__init__(parent)
+        self.model = model
+        self.journal = journal
+        # Datum der Tafel (daytick.MidnightTimer), damit Einstalldatum und Verweildauer denselben Tag sehen
+        self._today = today
+        self._undo: list[dict] = []
+        self._redo: list[dict] = []
+        self._replay()
+
+    # --- Operationen ---
+    def move(self, source: Slot, target: Slot) -> bool:
+        """Verschiebt das Tier; ist das Ziel belegt, wird getauscht."""
+        if source == target or self.model.tier(*source) is None:
+            return False
+        if self.model.tier(*target) is not None:
+            return self.swap(source, target)
+        return self._run("verschieben", [source, target], [self._free(), self._moved(source)])
+
+    def swap(self, a: Slot, b: Slot) -> bool:
+        if a == b:
+            return False
+        return self._run("tauschen", [a, b], [self._moved(b), self._moved(a)])
+
+    def clear(self, slot: Slot) -> bool:
+        if self.model.tier(*slot) is None:
+            return False
+        return self._run("raeumen", [slot], [self._free()])
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> bool:
+        """Nimmt die letzte Operation zurück, sofern die Plätze seitdem unverändert sind."""
+        if not self._undo or not self._matches(self._undo[-1], "nachher"):
+            return False
+        entry = self._undo.pop()
+        self._apply(entry, "vorher")
+        self.journal.append({"op": "rueckgaengig", "ref": entry["nr"]})
+        self._redo.append(entry)
+        return True
+
+    def redo(self) -> bool:
+        if not self._redo or not self._matches(self._redo[-1], "vorher"):
+            return False
+        entry = self._redo.pop()
+        self._apply(entry, "nachher")
+        self.journal.append({"op": "wiederholen", "ref": entry["nr"]})
+        self._push_undo(entry)
+        return True
+
+    # --- intern ---
+    def _value(self, slot: Slot) -> dict:
+        section, index = slot
+        raw_ids = self.model.raw_ids(section)
+        raw_id = raw_ids[index] if index < len(raw_ids) else ""
+        tier = self.model.tier(section, index)
+        return {"raw_id": raw_id if tier is not None else FREE_ID, "tier": tier}
+
+    def _moved(self, slot: Slot) -> dict:
+        """Wert des Platzes für seinen neuen Platz: das Einstalldatum beginnt neu."""
+        value = self._value(slot)
+        return {**value, "tier": with_entry_date(value["tier"], self._today())}
+
+    @staticmethod
+    def _free() -> dict:
+        return {"raw_id": FREE_ID, "tier": None}
+
+    def _run(self, op: str, slots: list[Slot], after: list[dict]) -> bool:
+        before = [self._value(slot) for slot in slots]
+        entry = self.journal.append({"op": op, "plaetze": [list(s) for s in slots],
+                                     "vorher": before, "nachher": after})
+        self._apply(entry, "nachher")
+        self._push_undo(entry)
+        self._redo.clear()
+        return True
+
+    def _push_undo(self, entry: dict):
+        self._undo.append(entry)
+        del self._undo[:-MAX_UNDO]
+
+    def _apply(self, entry: dict, side: str):
+        slots = [(section, index) for section, index in entry["plaetze"]]
+        for (section, index), value in zip(slots, entry[side]):
+            self.model.set_raw_id(section, index, value["raw_id"])
+            self.model.set_slot(section, index, value["tier"])
+        self.applied.emit(slots)
+
+    def _matches(self, entry: dict, side: str) -> bool:
+        """Stimmt die aktuelle Belegung mit einer Seite des Eintrags überein (gleiche Tiere)?"""
+        for (section, index), value in zip(entry["plaetze"], entry[side]):
+            if section not in self.model.sections():
+                return False
+            if _tier_id(self.model.tier(section, index)) != _tier_id(value["tier"]):
+                return False
+        return True
+
+    def _replay(self):
+        by_nr: dict[int, dict] = {}
+        for entry in self.journal.entries():
+            op = entry.get("op")
+            if op in ("rueckgaengig", "wiederholen"):
+                target = by_nr.get(entry.get("ref"))
+                source, dest = (self._undo, self._redo) if op == "rueckgaengig" else (self._redo, self._undo)
+                if target is not None and source and source[-1] is target:
+                    dest.append(source.pop())
+            else:
+                by_nr[entry["nr"]] = entry
+                self._push_undo(entry)
+                self._redo.clear()
+        if len(self.journal.entries()) > COMPACT_AFTER:
+            self._compact()
+
+    def _compact(self):
+        """
+        Journal auf die Einträge verkürzen, die beim Abspielen dieselben Stapel
+        ergeben: die Operationen in ihrer Reihenfolge (Undo-Stapel, dann die
+        zurückgenommenen), danach je zurückgenommener ein Rückgängig-Eintrag.
+        """
+        entries = self._undo + self._redo[::-1]
+        nr = self.journal.next_nr()
+        for entry in self._redo:
+            entries.append({"nr": nr, "zeit": entry["zeit"], "op": "rueckgaengig", "ref": entry["nr"]})
+            nr += 1
+        self.journal.rewrite(entries)
+
+
+def _tier_id(tier: dict | None) -> str | None:
+    return None if tier is None else str(tier.get("id", ""))
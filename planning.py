@@ -0,0 +1,135 @@
+# planning.py
+"""
+Schlachtplanung über den gesamten geladenen Bestand.
+
+Der Index speichert nur die Geburtsdaten (als Tagesnummer, sortiert). Das
+Schlachtalter ist ein reiner Versatz: "Schlachtung im Zeitraum [a, b)" ist
+gleichbedeutend mit "Geburt im Zeitraum [a - Alter, b - Alter)". Eine Änderung
+des Schlachtalters (oder einer Regel) verschiebt also nur die Grenzen der
+Binärsuche, es werden keine Termine neu berechnet.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterable
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from rules import SchlachtalterRules
+
+MONATSNAMEN = (
+    "Januar", "Februar", "März", "April", "Mai", "Juni",
+    "Juli", "August", "September", "Oktober", "November", "Dezember",
+)
+
+
+@dataclass
+class PlanBucket:
+    """Ein Zeitraum (Woche oder Monat) mit den darin fälligen Tieren."""
+    label: str
+    start: date
+    end: date
+    entries: list[tuple[str, date]] = field(default_factory=list)
+
+
+class SlaughterPlanIndex:
+    """
+    Sortierter Datumsindex mit Bereichsabfragen per Binärsuche.
+
+    Die Tiere sind nach (Rasse, Geschlecht) gruppiert, weil jede Gruppe über die
+    Regeln ein eigenes Schlachtalter haben kann. Tiere mit Einzelregel werden
+    in ihrer Gruppe übersprungen und direkt geprüft.
+    """
+
+    def __init__(self, records: Iterable[tuple[str, date | None, tuple[str, str]]], rules: SchlachtalterRules):
+        grouped: dict[tuple[str, str], tuple[list[int], list[str]]] = {}
+        self._animals: dict[str, tuple[int, tuple[str, str]]] = {}
+        for key, birth, group in records:
+            if birth is None:
+                continue
+            ordinal = birth.toordinal()
+            births, keys = grouped.setdefault(group, ([], []))
+            births.append(ordinal)
+            keys.append(key)
+            self._animals[key] = (ordinal, group)
+
+        self._groups: dict[tuple[str, str], tuple[np.ndarray, list[str]]] = {}
+        for group, (births, keys) in grouped.items():
+            order = np.argsort(np.asarray(births, dtype=np.int64), kind="stable")
+            self._groups[group] = (np.asarray(births, dtype=np.int64)[order], [keys[i] for i in order])
+        self.rules = rules
+
+    def __len__(self) -> int:
+        return len(self._animals)
+
+    @staticmethod
+    def slaughter_date(birth_ordinal: int, months: int) -> date:
+        return date.fromordinal(birth_ordinal) + relativedelta(months=months)
+
+    @staticmethod
+    def _birth_bound(d: date, months: int) -> int:
+        """Kleinster Geburtstag b mit b + Alter >= d (Schlachtung am oder nach d)."""
+        # Rückwärtsrechnen landet am Monatsende zu früh (31.03. − 1 Monat = 28.02.,
+        # aber 28.02. + 1 Monat = 28.03.); höchstens drei Tage weiterzählen
+        bound = d - relativedelta(months=months)
+        while bound + relativedelta(months=months) < d:
+            bound += timedelta(days=1)
+        return bound.toordinal()
+
+    def _overrides(self) -> list[tuple[str, int, tuple[str, str], int]]:
+        """(Schlüssel, Geburt, Gruppe, Monate) aller Tiere mit Einzelregel im Bestand."""
+        return [
+            (key, *self._animals[key], months)
+            for key, months in self.rules.by_tier.items() if key in self._animals
+        ]
+
+    def due_between(self, start: date, end: date) -> list[tuple[str, date]]:
+        """Tiere (Schlüssel, Schlachttermin) mit Schlachttermin in [start, end)."""
+        found: list[tuple[str, date]] = []
+        overridden = self.rules.by_tier
+        for group, (births, keys) in self._groups.items():
+            months = self.rules.months_for(None, *group)
+            lo = int(np.searchsorted(births, self._birth_bound(start, months), side="left"))
+            hi = int(np.searchsorted(births, self._birth_bound(end, months), side="left"))
+            for i in range(lo, hi):
+                if keys[i] not in overridden:
+                    found.append((keys[i], self.slaughter_date(int(births[i]), months)))
+        for key, birth, _group, months in self._overrides():
+            slaughter = self.slaughter_date(birth, months)
+            if start <= slaughter < end:
+                found.append((key, slaughter))
+        found.sort(key=lambda entry: entry[1])
+        return found
+
+    def count_before(self, day: date) -> int:
+        """Anzahl der Tiere, deren Schlachttermin vor dem Stichtag liegt."""
+        total = 0
+        for group, (births, _keys) in self._groups.items():
+            months = self.rules.months_for(None, *group)
+            total += int(np.searchsorted(births, self._birth_bound(day, months), side="left"))
+        # Tiere mit Einzelregel: Zählung über die Gruppe durch die eigene ersetzen
+        for _key, birth, group, months in self._overrides():
+            group_months = self.rules.months_for(None, *group)
+            total -= birth < self._birth_bound(day, group_months)
+            total += self.slaughter_date(birth, months) < day
+        return total
+
+    def buckets(self, period: str, today: date, count: int) -> list[PlanBucket]:
+        """Die nächsten `count` Wochen bzw. Monate ab dem laufenden Zeitraum."""
+        result: list[PlanBucket] = []
+        if period == "month":
+            start = today.replace(day=1)
+            for _ in range(count):
+                end = start + relativedelta(months=1)
+                label = f"{MONATSNAMEN[start.month - 1]} {start.year}"
+                result.append(PlanBucket(label, start, end, self.due_between(start, end)))
+                start = end
+        else:
+            start = today - timedelta(days=today.weekday())
+            for _ in range(count):
+                end = start + timedelta(days=7)
+                iso_year, iso_week, _ = start.isocalendar()
+                label = f"KW {iso_week}/{iso_year} ({start:%d.%m.}–{end - timedelta(days=1):%d.%m.})"
+                result.append(PlanBucket(label, start, end, self.due_between(start, end)))
+                start = end
+        return result
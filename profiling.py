@@ -0,0 +1,165 @@
+# profiling.py
+"""
+Eingebaute Zeitmessung für Laden, Auflösen, Zeichnen und Drucken.
+
+    with PROFILER.span("csv.load", datei=pfad):
+        ...
+
+Ist die Messung ausgeschaltet, liefert `span()` ein geteiltes Null-Objekt; die
+Kosten beschränken sich auf einen Attributzugriff und einen Funktionsaufruf.
+Eingeschaltet werden die Spannen gesammelt und lassen sich als Chrome-Trace
+(chrome://tracing, Perfetto) exportieren oder im Overlay anzeigen.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from PySide6.QtCore import Qt, QThread
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QLabel, QWidget
+
+# (Name, Dauer in ms, Verschachtelungstiefe)
+SpanListener = Callable[[str, float, int], None]
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "args", "start", "depth")
+
+    def __init__(self, profiler: "Profiler", name: str, args: dict):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        local = self.profiler._local
+        self.depth = getattr(local, "depth", 0)
+        local.depth = self.depth + 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        self.profiler._local.depth = self.depth
+        self.profiler._record(self.name, self.start, duration, self.args, self.depth)
+        return False
+
+
+class Profiler:
+    """Sammelt Zeitspannen; bei `enabled = False` praktisch ohne Overhead."""
+
+    def __init__(self, max_events: int = 200_000):
+        self.enabled = False
+        self._events: deque[tuple] = deque(maxlen=max_events)
+        self._listeners: list[SpanListener] = []
+        self._local = threading.local()
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def add_listener(self, listener: SpanListener):
+        self._listeners.append(listener)
+
+    def clear(self):
+        self._events.clear()
+
+    def events(self) -> list[tuple]:
+        return list(self._events)
+
+    def _record(self, name: str, start_ns: int, duration_ns: int, args: dict, depth: int):
+        self._events.append((name, start_ns, duration_ns, threading.get_ident(), args))
+        for listener in self._listeners:
+            listener(name, duration_ns / 1e6, depth)
+
+    def summary(self) -> dict[str, tuple[int, float, float]]:
+        """Je Spannenname: (Anzahl, Summe ms, letzte Dauer ms)."""
+        result: dict[str, tuple[int, float, float]] = {}
+        for name, _start, duration, _tid, _args in self._events:
+            count, total, _last = result.get(name, (0, 0.0, 0.0))
+            result[name] = (count + 1, total + duration / 1e6, duration / 1e6)
+        return result
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Schreibt alle Spannen im Chrome-Trace-Format (JSON) nach `path`."""
+        pid = os.getpid()
+        trace_events = [
+            {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (start - self._origin_ns) / 1000.0,
+                "dur": duration / 1000.0,
+                "pid": pid,
+                "tid": tid,
+                "args": {k: str(v) for k, v in args.items()},
+            }
+            for name, start, duration, tid, args in self._events
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+PROFILER = Profiler()
+
+
+class ProfilerOverlay(QLabel):
+    """
+    Halbtransparente Einblendung der zuletzt gemessenen Spannen. Sehr kurze
+    Spannen (z. B. je Karte) werden ausgeblendet, damit die Stufen lesbar bleiben.
+    """
+
+    def __init__(self, profiler: Profiler, parent: QWidget, max_lines: int = 14, min_ms: float = 0.5):
+        super().__init__(parent)
+        self.setObjectName("ProfilerOverlay")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        font = QFont("Monospace")
+        font.setStyleHint(QFont.StyleHint.TypeWriter)
+        self.setFont(font)
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self._min_ms = min_ms
+        profiler.add_listener(self._on_span)
+        self.hide()
+
+    def _on_span(self, name: str, duration_ms: float, depth: int):
+        # Spannen aus Hintergrund-Threads nicht direkt ins Widget schreiben
+        if duration_ms < self._min_ms or QThread.currentThread() is not self.thread():
+            return
+        self._lines.appendleft(f"{'  ' * depth}{name:<30}{duration_ms:9.1f} ms")
+        if self.isVisible():
+            self._refresh()
+
+    def _refresh(self):
+        self.setText("\n".join(self._lines) or "Noch keine Messungen")
+        self.adjustSize()
+        self.reposition()
+
+    def reposition(self):
+        parent = self.parentWidget()
+        if parent is not None:
+            self.move(parent.width() - self.width() - 12, 12)
+
+    def set_overlay_visible(self, visible: bool):
+        self.setVisible(visible)
+        if visible:
+            self._refresh()
+            self.raise_()
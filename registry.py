@@ -0,0 +1,309 @@
+# registry.py
+"""
+Nachschlagen unbekannter Ohrmarken in einem Tierregister.
+
+Steht eine eingegebene Ohrmarke nicht im Bestandsexport des Betriebs (etwa
+ein zugekauftes Tier, das im Export noch fehlt), kann `RegistryClient` sie
+bei einem Register nachfragen. Alle Ohrmarken, die während eines
+Durchlaufs der Ereignisschleife angefragt werden, gehen gesammelt in
+*einer* Anfrage hinaus:
+
+    POST <url>   {"ohrmarken": ["AT…", …]}
+    200          {"tiere": {"AT…": {"Ohrmarke-Name": …, "Geburtsdatum": …,
+                                    "Rasse(n)": …, "Geschlecht": …, "OM-Mutter": …}},
+                  "unbekannt": ["AT…", …]}
+
+Die Felder heißen wie die Spalten des Bestandsexports, damit die Ergebnisse
+denselben Weg nehmen wie eine Zeile aus dem HerdStore.
+
+Der Client arbeitet wie der Rest der Anwendung im Qt-Ereignisloop
+(QNetworkAccessManager statt eines eigenen asyncio-Loops): `lookup` kehrt
+sofort zurück, Ergebnisse kommen über `resolved`. Der Manager hält die
+Verbindungen zum Register offen und verwendet sie wieder (Keep-Alive, bis
+zu sechs je Host). Dazu kommen:
+
+- ein Ergebnis-Cache (gefunden: bis zum Programmende, unbekannt: `NEGATIVE_TTL_S`)
+- höchstens `MAX_IN_FLIGHT` gleichzeitige Anfragen, frühestens alle
+  `MIN_INTERVAL_MS` eine neue, je Anfrage höchstens `BATCH_SIZE` Ohrmarken
+
+`RegistryStandIn` ist ein kleiner Register-Server (QTcpServer, Keep-Alive)
+für Tests und Vorführungen, der aus einem Bestandsexport antwortet:
+
+    python registry.py register.csv --port 8090
+    → im Setup als Register http://localhost:8090/ eintragen
+"""
+import argparse
+import json
+import sys
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from PySide6.QtCore import QByteArray, QCoreApplication, QObject, QTimer, QUrl, Signal
+from PySide6.QtNetwork import (
+    QHostAddress, QNetworkAccessManager, QNetworkReply, QNetworkRequest, QTcpServer, QTcpSocket
+)
+from shiboken6 import Shiboken
+
+from herdstore import COLUMNS, OPTIONAL_COLUMNS, HerdStore
+
+DEFAULT_PORT = 8090
+BATCH_SIZE = 200
+MAX_IN_FLIGHT = 2
+MIN_INTERVAL_MS = 500
+TIMEOUT_MS = 10_000
+# nicht gefundene Ohrmarken werden so lange nicht erneut angefragt
+NEGATIVE_TTL_S = 60 * 60
+MAX_CACHED = 10_000
+RECORD_FIELDS = COLUMNS + OPTIONAL_COLUMNS
+MAX_REQUEST_BYTES = 1 << 20
+
+
+class RegistryClient(QObject):
+    # Ohrmarke → Datensatz (Felder wie im Bestandsexport), nur gefundene Tiere
+    resolved = Signal(dict)
+    # Fehlermeldung; die betroffenen Ohrmarken werden bei der nächsten Anfrage erneut versucht
+    failed = Signal(str)
+
+    def __init__(self, url: str, parent=None):
+        super().__init__(parent)
+        self.url = url
+        self._manager = QNetworkAccessManager(self)
+        self._found: OrderedDict[str, dict] = OrderedDict()
+        self._unknown: dict[str, float] = {}
+        # angefragt, aber noch nicht verschickt bzw. unterwegs
+        self._queued: list[str] = []
+        self._in_flight: set[str] = set()
+        self._replies: set[QNetworkReply] = set()
+        self._cached_hits: dict[str, dict] = {}
+        self._last_sent = 0.0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
+
+    def lookup(self, keys: Iterable[str]):
+        """Ohrmarken (normalisiert) nachschlagen; kehrt sofort zurück."""
+        now = time.monotonic()
+        queued = set(self._queued)
+        for key in keys:
+            if not key:
+                continue
+            record = self._found.get(key)
+            if record is not None:
+                self._found.move_to_end(key)
+                self._cached_hits[key] = record
+            elif self._unknown.get(key, 0.0) > now:
+                continue
+            elif key not in queued and key not in self._in_flight:
+                self._queued.append(key)
+                queued.add(key)
+        if (self._queued or self._cached_hits) and not self._flush_timer.isActive():
+            # alles, was in diesem Durchlauf der Ereignisschleife angefragt wird, zusammenfassen
+            self._flush_timer.start(0)
+
+    def pending(self) -> int:
+        return len(self._queued) + len(self._in_flight)
+
+    def cancel(self):
+        self._flush_timer.stop()
+        self._queued.clear()
+        for reply in list(self._replies):
+            reply.abort()
+
+    def _flush(self):
+        if self._cached_hits:
+            hits, self._cached_hits = self._cached_hits, {}
+            self.resolved.emit(hits)
+        while self._queued and len(self._replies) < MAX_IN_FLIGHT:
+            wait_ms = int((self._last_sent + MIN_INTERVAL_MS / 1000 - time.monotonic()) * 1000)
+            if wait_ms > 0:
+                self._flush_timer.start(wait_ms)
+                return
+            batch, self._queued = self._queued[:BATCH_SIZE], self._queued[BATCH_SIZE:]
+            self._send(batch)
+
+    def _send(self, batch: list[str]):
+        request = QNetworkRequest(QUrl(self.url))
+        request.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, "application/json")
+        request.setTransferTimeout(TIMEOUT_MS)
+        body = json.dumps({"ohrmarken": batch}).encode("utf-8")
+        reply = self._manager.post(request, QByteArray(body))
+        self._replies.add(reply)
+        self._in_flight.update(batch)
+        self._last_sent = time.monotonic()
+        reply.finished.connect(lambda r=reply, b=batch: self._on_finished(r, b))
+
+    def _on_finished(self, reply: QNetworkReply, batch: list[str]):
+        self._replies.discard(reply)
+        self._in_flight.difference_update(batch)
+        try:
+            if reply.error() != QNetworkReply.NetworkError.NoError:
+                self.failed.emit(f"Register nicht erreichbar: {reply.errorString()}")
+                return
+            try:
+                payload = json.loads(bytes(reply.readAll()).decode("utf-8"))
+                animals = dict(payload.get("tiere", {}))
+            except (ValueError, TypeError, AttributeError):
+                self.failed.emit("Register hat keine gültige Antwort geliefert.")
+                return
+            found = {key: record for key, record in animals.items() if key in batch and _valid_record(record)}
+            invalid = sum(1 for key in animals if key in batch and key not in found)
+            self._remember(batch, found)
+            if found:
+                self.resolved.emit(found)
+            if invalid:
+                # fehlerhafte Einträge gelten als unbekannt und werden übersprungen
+                self.failed.emit(f"{invalid} Registereintrag/-einträge fehlerhaft, übersprungen.")
+        finally:
+            reply.deleteLater()
+            if self._queued and not self._flush_timer.isActive():
+                self._flush_timer.start(0)
+
+    def _remember(self, batch: list[str], found: dict[str, dict]):
+        expires = time.monotonic() + NEGATIVE_TTL_S
+        for key in batch:
+            if key in found:
+                self._found[key] = found[key]
+                self._unknown.pop(key, None)
+            else:
+                self._unknown[key] = expires
+        while len(self._found) > MAX_CACHED:
+            self._found.popitem(last=False)
+        if len(self._unknown) > MAX_CACHED:
+            now = time.monotonic()
+            self._unknown = {key: t for key, t in self._unknown.items() if t > now}
+
+
+def _valid_record(record) -> bool:
+    """Datensatz mit Feldern wie im Bestandsexport: jeder vorhandene Wert ist Text."""
+    return isinstance(record, dict) and all(
+        isinstance(record.get(name), str) for name in RECORD_FIELDS if record.get(name) is not None
+    )
+
+
+class RegistryStandIn(QObject):
+    """
+    Register-Server für Tests: beantwortet POST-Anfragen aus einem HerdStore.
+    Verbindungen bleiben offen (Keep-Alive); `requests` und `connections`
+    zählen mit, `delay_ms` simuliert die Antwortzeit eines entfernten Registers.
+    """
+
+    def __init__(self, store: HerdStore, port: int = 0, delay_ms: int = 0, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.delay_ms = delay_ms
+        self.requests = 0
+        self.connections = 0
+        self._requested_port = port
+        self._server = QTcpServer(self)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: dict[QTcpSocket, bytes] = {}
+
+    def listen(self) -> bool:
+        return self._server.listen(QHostAddress(QHostAddress.SpecialAddress.LocalHost), self._requested_port)
+
+    @property
+    def port(self) -> int:
+        return self._server.serverPort()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/"
+
+    def close(self):
+        self._server.close()
+        for socket in list(self._buffers):
+            socket.close()
+        self._buffers.clear()
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self.connections += 1
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            # wie in sync.py: Freigeben direkt in Qt, in Python nur die Buchführung
+            socket.disconnected.connect(socket.deleteLater)
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+
+    def _on_disconnected(self, socket: QTcpSocket):
+        if Shiboken.isValid(self):
+            self._buffers.pop(socket, None)
+
+    def _on_ready_read(self, socket: QTcpSocket):
+        data = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        while b"\r\n\r\n" in data:
+            head, rest = data.split(b"\r\n\r\n", 1)
+            headers = {}
+            for line in head.decode("latin-1").split("\r\n")[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                # ohne gültige Länge ist das Ende der Anfrage nicht bestimmbar: Verbindung schließen
+                self._write(socket, "400 Bad Request", b'{"fehler": "Content-Length fehlerhaft"}', True)
+                return
+            if len(rest) < length:
+                break
+            body, data = rest[:length], rest[length:]
+            self._answer(socket, head.split(b" ", 1)[0].decode("latin-1"), body,
+                         headers.get("connection", "").lower() == "close")
+        if len(data) > MAX_REQUEST_BYTES:
+            socket.abort()
+            return
+        if socket in self._buffers:
+            self._buffers[socket] = data
+
+    def _answer(self, socket: QTcpSocket, method: str, body: bytes, close: bool):
+        self.requests += 1
+        if method != "POST":
+            self._write(socket, "405 Method Not Allowed", b'{"fehler": "nur POST"}', close)
+            return
+        try:
+            keys = json.loads(body.decode("utf-8")).get("ohrmarken", [])
+        except (ValueError, AttributeError):
+            self._write(socket, "400 Bad Request", b'{"fehler": "kein JSON"}', close)
+            return
+        animals, unknown = {}, []
+        for key in keys:
+            row = self.store.get(key)
+            if row is None:
+                unknown.append(key)
+            else:
+                animals[key] = {field: row.get(field) or "" for field in RECORD_FIELDS}
+        payload = json.dumps({"tiere": animals, "unbekannt": unknown}, ensure_ascii=False).encode("utf-8")
+        if self.delay_ms:
+            QTimer.singleShot(self.delay_ms, lambda: self._write(socket, "200 OK", payload, close))
+        else:
+            self._write(socket, "200 OK", payload, close)
+
+    def _write(self, socket: QTcpSocket, status: str, body: bytes, close: bool):
+        if socket not in self._buffers:
+            return
+        head = (f"HTTP/1.1 {status}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: {'close' if close else 'keep-alive'}\r\n\r\n")
+        socket.write(head.encode("latin-1") + body)
+        if close:
+            socket.disconnectFromHost()
+
+
+if __name__ == "__main__":
+    from csvformat import load_csv_export
+
+    parser = argparse.ArgumentParser(description="Register-Server zum Testen (antwortet aus einem Bestandsexport)")
+    parser.add_argument("csv", help="Bestandsexport, aus dem das Register antwortet")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--delay", type=int, default=0, help="künstliche Antwortzeit in ms")
+    args = parser.parse_args()
+    app = QCoreApplication(sys.argv)
+    store = HerdStore.from_frame(load_csv_export(args.csv, COLUMNS, OPTIONAL_COLUMNS))
+    server = RegistryStandIn(store, args.port, args.delay)
+    if not server.listen():
+        print(f"Port {args.port} ist belegt.")
+        sys.exit(1)
+    app.aboutToQuit.connect(server.close)
+    print(f"Register mit {len(store)} Tieren auf {server.url}")
+    sys.exit(app.exec())
@@ -0,0 +1,184 @@
+# report.py
+"""
+Gemeinsamer HTML-Renderer für die Druckübersichten.
+
+Jede Tabellenzeile wird als HTML-Fragment zwischengespeichert; der Schlüssel ist
+der Inhalt des Datensatzes. Wird erneut gedruckt, entstehen nur die Fragmente
+geänderter Zeilen neu. Lange Listen werden auf Seiten mit fester Zeilenzahl
+verteilt und jede Seite als eigenes, kleines QTextDocument gelayoutet, statt
+eine riesige Tabelle in einem Dokument zu setzen.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from html import escape
+
+from PySide6.QtGui import QPainter, QTextDocument
+from PySide6.QtPrintSupport import QPrinter
+
+# Zeilen pro gedruckter Seite (Querformat, inkl. Überschriften und Tabellenköpfen)
+ROWS_PER_PAGE = 22
+
+TIER_FIELDS = ('id', 'geburtsdatum', 'alter', 'schlachtdatum', 'rasse')
+TIER_HEADERS = ('Tier-ID', 'Geboren', 'Alter', 'Schlachtung', 'Rasse')
+
+PRINT_STYLE = (
+    "body { font-family: Arial, Helvetica, sans-serif; }"
+    "th, td { text-align: left; }"
+    "h2 { margin-top: 20px; }"
+)
+
+_TABLE_OPEN = "<table border='1' cellspacing='0' cellpadding='5' width='100%'>"
+_PAGE_BREAK = "<div style='page-break-before: always;'></div>"
+
+
+def tier_key(tier: dict | None) -> tuple:
+    """Liefert einen hashbaren Schlüssel, der den druckrelevanten Inhalt beschreibt."""
+    if tier is None:
+        return ('free',)
+    if tier.get('status') == 'not_found':
+        return ('not_found', str(tier.get('id', '')))
+    return ('ok',) + tuple(str(tier.get(f, '')) for f in TIER_FIELDS)
+
+
+@lru_cache(maxsize=32768)
+def render_row(prefix: tuple[str, ...], key: tuple) -> str:
+    """Rendert eine Tabellenzeile; identische Inhalte kommen aus dem Cache."""
+    lead = "".join(f"<td>{escape(p)}</td>" for p in prefix)
+    colspan = len(TIER_FIELDS)
+    kind = key[0]
+    if kind == 'free':
+        return f"<tr>{lead}<td colspan='{colspan}'><i>Platz ist frei</i></td></tr>"
+    if kind == 'not_found':
+        return (
+            f"<tr>{lead}<td colspan='{colspan}' style='color:#c0392b;'>"
+            f"<b>ID nicht gefunden:</b> {escape(key[1])}</td></tr>"
+        )
+    cells = "".join(f"<td>{escape(v)}</td>" for v in key[1:])
+    return f"<tr>{lead}{cells}</tr>"
+
+
+@lru_cache(maxsize=64)
+def _header_row(prefix_headers: tuple[str, ...]) -> str:
+    cells = "".join(f"<th>{escape(h)}</th>" for h in prefix_headers + TIER_HEADERS)
+    return f"<tr>{cells}</tr>"
+
+
+@dataclass
+class ReportSection:
+    """Ein Abschnitt des Berichts (z. B. eine Box) mit bereits gerenderten Zeilen."""
+    heading: str | None
+    rows: list[str] = field(default_factory=list)
+
+
+class ReportRenderer:
+    """Verteilt Abschnitte auf Seiten fester Größe und setzt daraus HTML zusammen."""
+
+    def __init__(self, rows_per_page: int = ROWS_PER_PAGE):
+        self.rows_per_page = max(1, rows_per_page)
+
+    def paginate(self, title: str, sections: list[ReportSection],
+                 prefix_headers: tuple[str, ...] = ()) -> list[str]:
+        """Gibt den Inhalt jeder Seite als HTML-Fragment (ohne <html>-Rahmen) zurück."""
+        header_row = _header_row(prefix_headers)
+        pages: list[list[str]] = [[f"<h1>{escape(title)}</h1>"]]
+        used = 1
+        for section in sections:
+            # Überschrift und Kopfzeile der Tabelle zählen wie Zeilen
+            head = 1 + (1 if section.heading else 0)
+            needed = head + len(section.rows)
+            # Abschnitte, die auf eine Seite passen, werden nicht zerteilt; sonst
+            # beginnt der Abschnitt dort, wo unter der Kopfzeile noch eine Zeile Platz hat
+            if used and used + needed > self.rows_per_page and (
+                    needed <= self.rows_per_page or used + head + 1 > self.rows_per_page):
+                pages.append([])
+                used = 0
+            if section.heading:
+                pages[-1].append(f"<h2>{escape(section.heading)}</h2>")
+                used += 1
+
+            chunks = self._chunks(section.rows, self.rows_per_page - used - 1)
+            for n, chunk in enumerate(chunks):
+                if n > 0:
+                    pages.append([])
+                    used = 0
+                pages[-1].append(_TABLE_OPEN)
+                pages[-1].append(header_row)
+                pages[-1].extend(chunk)
+                pages[-1].append("</table>")
+                used += 1 + len(chunk)
+        return ["".join(page) for page in pages if page]
+
+    def render_pages(self, title: str, sections: list[ReportSection],
+                     prefix_headers: tuple[str, ...] = ()) -> list[str]:
+        """Jede Seite als eigenständiges HTML-Dokument (für den seitenweisen Druck)."""
+        return [_wrap(body) for body in self.paginate(title, sections, prefix_headers)]
+
+    def render(self, title: str, sections: list[ReportSection],
+               prefix_headers: tuple[str, ...] = ()) -> str:
+        """Alle Seiten in einem Dokument, getrennt durch Seitenumbrüche."""
+        bodies = self.paginate(title, sections, prefix_headers)
+        return _wrap(_PAGE_BREAK.join(bodies))
+
+    def _chunks(self, rows: list[str], first_space: int) -> list[list[str]]:
+        """Teilt Zeilen so auf, dass jede Seite samt Kopfzeile höchstens rows_per_page Zeilen hat."""
+        if not rows:
+            return [[]]
+        per_page = max(1, self.rows_per_page - 1)
+        first_space = max(1, first_space)
+        chunks = [rows[:first_space]]
+        for i in range(first_space, len(rows), per_page):
+            chunks.append(rows[i:i + per_page])
+        return chunks
+
+
+def _wrap(body: str) -> str:
+    return f"<html><head><style>{PRINT_STYLE}</style></head><body>{body}</body></html>"
+
+
+class PageDocumentCache:
+    """
+    Hält fertig gelayoutete QTextDocuments pro Seiteninhalt. Unveränderte Seiten
+    werden beim erneuten Drucken (oder beim Neuzeichnen der Vorschau) nur noch
+    gezeichnet, nicht mehr geparst und gelayoutet.
+    """
+
+    def __init__(self, max_pages: int = 512):
+        self.max_pages = max_pages
+        self._docs: OrderedDict[tuple[str, float], QTextDocument] = OrderedDict()
+
+    def document(self, page_html: str, text_width: float) -> QTextDocument:
+        key = (page_html, text_width)
+        doc = self._docs.get(key)
+        if doc is not None:
+            self._docs.move_to_end(key)
+            return doc
+        doc = QTextDocument()
+        doc.setHtml(page_html)
+        doc.setTextWidth(text_width)
+        self._docs[key] = doc
+        while len(self._docs) > self.max_pages:
+            self._docs.popitem(last=False)
+        return doc
+
+    def paint(self, printer: QPrinter, pages: list[str]):
+        """Zeichnet die Seiten direkt mit QPainter auf den Drucker."""
+        page_rect = printer.pageRect(QPrinter.Unit.DevicePixel)
+        # Layout in Bildschirm-Einheiten, damit Schriftgrößen wie in der Vorschau wirken
+        scale = printer.logicalDpiX() / 96.0
+        text_width = page_rect.width() / scale
+
+        painter = QPainter(printer)
+        try:
+            for n, page_html in enumerate(pages):
+                if n > 0:
+                    printer.newPage()
+                doc = self.document(page_html, text_width)
+                # Falls eine Seite doch zu hoch wird, passend verkleinern statt abschneiden
+                page_scale = min(scale, page_rect.height() / max(1.0, doc.size().height()))
+                painter.save()
+                painter.scale(page_scale, page_scale)
+                doc.drawContents(painter)
+                painter.restore()
+        finally:
+            painter.end()
@@ -0,0 +1,136 @@
+# rules.py
+"""
+Regeln für das Schlachtalter.
+
+Vorrang (höchste zuerst): einzelnes Tier → Rasse → Geschlecht → Standardwert
+aus der Setup-Seite. Die Abhängigkeitstabelle merkt sich für jede Regel, welche
+Stallplätze sie beeinflussen kann. Ändert sich eine Regel, werden nur diese
+Plätze neu berechnet und neu gezeichnet.
+"""
+from typing import Iterable
+
+RULE_DEFAULT = 'default'
+RULE_GESCHLECHT = 'geschlecht'
+RULE_RASSE = 'rasse'
+RULE_TIER = 'tier'
+
+
+RuleKey = tuple  # ('default',) oder (Regeltyp, Wert)
+SlotRef = tuple[str, int]  # (Bereich, Index), z. B. ('gruppenboxen', 4)
+
+
+class SchlachtalterRules:
+    """Schlachtalter in Monaten je Rasse, Geschlecht und Tier."""
+
+    def __init__(self, default_months: int = 0):
+        self.default_months = default_months
+        self.by_rasse: dict[str, int] = {}
+        self.by_geschlecht: dict[str, int] = {}
+        self.by_tier: dict[str, int] = {}
+
+    def _table(self, kind: str) -> dict[str, int]:
+        return {RULE_RASSE: self.by_rasse, RULE_GESCHLECHT: self.by_geschlecht, RULE_TIER: self.by_tier}[kind]
+
+    def set_rule(self, rule: RuleKey, months: int):
+        if rule[0] == RULE_DEFAULT:
+            self.default_months = months
+        else:
+            self._table(rule[0])[rule[1]] = months
+
+    def remove_rule(self, rule: RuleKey):
+        if rule[0] != RULE_DEFAULT:
+            self._table(rule[0]).pop(rule[1], None)
+
+    def rules(self) -> list[tuple[RuleKey, int]]:
+        """Alle expliziten Regeln (ohne Standardwert), stärkste zuerst."""
+        result = []
+        for kind in (RULE_TIER, RULE_RASSE, RULE_GESCHLECHT):
+            for value, months in sorted(self._table(kind).items()):
+                result.append(((kind, value), months))
+        return result
+
+    @staticmethod
+    def candidates(tier_key: str | None, rasse: str, geschlecht: str) -> list[RuleKey]:
+        """Alle Regeln, die für ein Tier gelten könnten, stärkste zuerst."""
+        keys: list[RuleKey] = []
+        if tier_key:
+            keys.append((RULE_TIER, tier_key))
+        keys.append((RULE_RASSE, rasse))
+        keys.append((RULE_GESCHLECHT, geschlecht))
+        keys.append((RULE_DEFAULT,))
+        return keys
+
+    def effective_rule(self, tier_key: str | None, rasse: str, geschlecht: str) -> RuleKey:
+        for rule in self.candidates(tier_key, rasse, geschlecht):
+            if rule[0] == RULE_DEFAULT or rule[1] in self._table(rule[0]):
+                return rule
+        return (RULE_DEFAULT,)
+
+    def is_shadowed(self, candidates: list[RuleKey], rule: RuleKey) -> bool:
+        """True, wenn vor `rule` bereits eine stärkere Regel greift."""
+        for candidate in candidates:
+            if candidate == rule:
+                return False
+            if candidate[0] != RULE_DEFAULT and candidate[1] in self._table(candidate[0]):
+                return True
+        return False
+
+    def months_for(self, tier_key: str | None, rasse: str, geschlecht: str) -> int:
+        rule = self.effective_rule(tier_key, rasse, geschlecht)
+        if rule[0] == RULE_DEFAULT:
+            return self.default_months
+        return self._table(rule[0])[rule[1]]
+
+    def to_dict(self) -> dict:
+        return {
+            "default": self.default_months,
+            "rasse": dict(self.by_rasse),
+            "geschlecht": dict(self.by_geschlecht),
+            "tier": dict(self.by_tier),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, default_months: int = 0) -> "SchlachtalterRules":
+        rules = cls(int(data.get("default", default_months) or default_months))
+        rules.by_rasse = {str(k): int(v) for k, v in (data.get("rasse") or {}).items()}
+        rules.by_geschlecht = {str(k): int(v) for k, v in (data.get("geschlecht") or {}).items()}
+        rules.by_tier = {str(k): int(v) for k, v in (data.get("tier") or {}).items()}
+        return rules
+
+
+class RuleDependencies:
+    """Abhängigkeitstabelle: Regel → Stallplätze, auf die sie wirken kann."""
+
+    def __init__(self):
+        self._slots_by_rule: dict[RuleKey, set[SlotRef]] = {}
+        self._rules_by_slot: dict[SlotRef, list[RuleKey]] = {}
+
+    def clear(self):
+        self._slots_by_rule.clear()
+        self._rules_by_slot.clear()
+
+    def set_slot(self, slot: SlotRef, candidates: Iterable[RuleKey]):
+        self.remove_slot(slot)
+        candidates = list(candidates)
+        self._rules_by_slot[slot] = candidates
+        for rule in candidates:
+            self._slots_by_rule.setdefault(rule, set()).add(slot)
+
+    def remove_slot(self, slot: SlotRef):
+        for rule in self._rules_by_slot.pop(slot, ()):
+            slots = self._slots_by_rule.get(rule)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del self._slots_by_rule[rule]
+
+    def affected_slots(self, rule: RuleKey, rules: SchlachtalterRules) -> set[SlotRef]:
+        """
+        Plätze, deren Ergebnis sich durch eine Änderung dieser Regel ändern kann:
+        die Regel kommt für den Platz in Frage und wird nicht von einer
+        stärkeren, vorhandenen Regel verdeckt.
+        """
+        return {
+            slot for slot in self._slots_by_rule.get(rule, ())
+            if not rules.is_shadowed(self._rules_by_slot[slot], rule)
+        }
@@ -0,0 +1,160 @@
+# search.py
+"""
+Suche über alle Stallplätze (Einzelplätze und Gruppenboxen).
+
+`SlotSearchIndex` ist ein invertierter Index über die Belegung im Modell:
+
+- jede Endung der Ohrmarken-Ziffern ("8861" findet AT…8861)
+- jeder Wortanfang von Rasse und Geschlecht ("fl", "w", "männl")
+- die Schlachttermine als sortierte Liste für Zeitraum-Abfragen
+
+Der Index hört auf das Modell und aktualisiert bei `slotsChanged` nur die
+betroffenen Plätze, bei `sectionReset` nur den Bereich. Eine Abfrage ist je
+Suchwort ein Dict-Zugriff plus Schnittmenge – unabhängig davon, wie viele
+Karten die Tafeln haben.
+"""
+import bisect
+import re
+from datetime import date, datetime
+
+from PySide6.QtCore import QObject, Signal
+
+from model import StallModel
+
+Slot = tuple[str, int]
+
+_TAG_TERM = "#"
+_WORD_TERM = "w:"
+_TAG = re.compile(r"(at)?(\d+)")
+
+
+def _tag_digits(text: str) -> str | None:
+    """Ziffern einer Ohrmarke bzw. Eingabe: mit 'AT' ohne führende Nullen, sonst wie eingegeben."""
+    match = _TAG.fullmatch(text.strip().lower().replace(" ", ""))
+    if match is None:
+        return None
+    if match.group(1):
+        return match.group(2).lstrip("0") or "0"
+    return match.group(2)
+
+
+def _words(text: str) -> list[str]:
+    return [w for w in re.split(r"[\s.,/]+", text.lower()) if w and w != "n/a"]
+
+
+def _slaughter_ordinal(tier: dict) -> int | None:
+    try:
+        return datetime.strptime(tier.get('schlachtdatum', ''), "%d.%m.%Y").toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def slot_terms(tier: dict) -> list[str]:
+    """Suchbegriffe eines belegten Platzes."""
+    terms: set[str] = set()
+    digits = _tag_digits(str(tier.get('id', '')))
+    if digits:
+        digits = digits.lstrip("0") or "0"
+        terms.update(_TAG_TERM + digits[i:] for i in range(len(digits)))
+        # Eingabeform wie in der Bestandsaufnahme: führende Null statt 'AT'
+        terms.add(_TAG_TERM + "0" + digits)
+    for field in ('rasse', 'geschlecht'):
+        for word in _words(str(tier.get(field, ''))):
+            terms.update(_WORD_TERM + word[:n] for n in range(1, len(word) + 1))
+    return list(terms)
+
+
+class SlotSearchIndex(QObject):
+    # der Index hat sich geändert; eine angezeigte Suche sollte neu ausgewertet werden
+    changed = Signal()
+
+    def __init__(self, model: StallModel, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self._postings: dict[str, set[Slot]] = {}
+        self._terms: dict[Slot, list[str]] = {}
+        # (Schlachttermin als Tagesnummer, Platz), sortiert
+        self._dates: list[tuple[int, Slot]] = []
+        self._slot_dates: dict[Slot, int] = {}
+        for section in model.sections():
+            self._index_section(section)
+        model.slotsChanged.connect(self._on_slots_changed)
+        model.sectionReset.connect(self._on_section_reset)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    # --- Pflege ---
+    def _remove(self, slot: Slot):
+        for term in self._terms.pop(slot, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(slot)
+                if not postings:
+                    del self._postings[term]
+        ordinal = self._slot_dates.pop(slot, None)
+        if ordinal is not None:
+            self._dates.pop(bisect.bisect_left(self._dates, (ordinal, slot)))
+
+    def _add(self, slot: Slot):
+        tier = self.model.tier(*slot)
+        if tier is None or slot[1] >= self.model.capacity(slot[0]):
+            return
+        terms = slot_terms(tier)
+        self._terms[slot] = terms
+        for term in terms:
+            self._postings.setdefault(term, set()).add(slot)
+        ordinal = _slaughter_ordinal(tier)
+        if ordinal is not None:
+            self._slot_dates[slot] = ordinal
+            bisect.insort(self._dates, (ordinal, slot))
+
+    def _index_section(self, section: str):
+        for slot in [s for s in self._terms if s[0] == section]:
+            self._remove(slot)
+        for index in range(len(self.model.slots(section))):
+            self._add((section, index))
+
+    def _on_slots_changed(self, section: str, indices: list[int]):
+        for index in indices:
+            self._remove((section, index))
+            self._add((section, index))
+        self.changed.emit()
+
+    def _on_section_reset(self, section: str):
+        self._index_section(section)
+        self.changed.emit()
+
+    # --- Abfragen ---
+    def _token_hits(self, token: str) -> set[Slot]:
+        hits: set[Slot] = set()
+        digits = _tag_digits(token)
+        if digits:
+            hits |= self._postings.get(_TAG_TERM + digits, set())
+        for word in _words(token):
+            hits |= self._postings.get(_WORD_TERM + word, set())
+        return hits
+
+    def _window_hits(self, start: date | None, end: date | None) -> set[Slot]:
+        lo = 0 if start is None else bisect.bisect_left(self._dates, (start.toordinal(),))
+        hi = len(self._dates) if end is None else bisect.bisect_left(self._dates, (end.toordinal(),))
+        return {slot for _ordinal, slot in self._dates[lo:hi]}
+
+    def search(self, text: str, window: tuple[date | None, date | None] | None = None) -> list[Slot]:
+        """
+        Plätze, auf die alle Suchwörter passen (Ohrmarken-Endung, Rasse oder
+        Geschlecht) und deren Schlachttermin in [start, end) liegt. Ohne
+        Suchwörter und Zeitraum gibt es keine Treffer.
+        """
+        hits: set[Slot] | None = None
+        for token in text.lower().split():
+            hits = self._token_hits(token) if hits is None else hits & self._token_hits(token)
+            if not hits:
+                return []
+        if window is not None:
+            in_window = self._window_hits(*window)
+            hits = in_window if hits is None else hits & in_window
+        if not hits:
+            return []
+        order = {section: n for n, section in enumerate(self.model.sections())}
+        return sorted(hits, key=lambda slot: (order[slot[0]], slot[1]))
@@ -0,0 +1,153 @@
+# startimage.py
+"""
+Sofortstart: ein Bild der Tafel vom letzten Beenden.
+
+Beim Schließen legt das Hauptfenster ein Bild seines Inhalts im
+Datenordner ab (`save_start_image`). Beim nächsten Start zeigt
+`show_start_image` dieses Bild in einem Fenster gleicher Größe und Lage –
+noch bevor pandas, qtawesome und die Oberfläche geladen sind und der
+Zustand eingelesen ist. Sobald das echte Fenster fertig ist, tritt es an
+dieselbe Stelle und das Bild verschwindet (`StartImageWindow.finish`).
+
+Das Modul importiert bewusst nur Qt und appdirs. Im Bild stehen als
+PNG-Text die Fensterlage und Größe/Änderungszeit der Zustandsdateien beim
+Speichern; hat sich eine davon seither geändert (Absturz, Abgleich), ist
+das Bild veraltet und wird nicht gezeigt.
+"""
+import json
+import os
+from datetime import datetime
+
+from appdirs import user_data_dir
+from PySide6.QtCore import QPoint, QRect, QSettings, Qt
+from PySide6.QtGui import QColor, QFont, QImageReader, QPainter, QPixmap
+from PySide6.QtWidgets import QApplication, QWidget
+
+START_IMAGE_NAME = "tafel_startbild.png"
+# wie DATA_DIR in main.py; main.py wird für das Bild gar nicht erst geladen
+ORG_NAME = "RinderApp"
+APP_NAME = "Bestandsmanager"
+DEFAULT_PATH = os.path.join(user_data_dir(APP_NAME, ORG_NAME), START_IMAGE_NAME)
+SETTING_KEY = "instant_start"
+
+_META_KEY = "stalltafel"
+
+
+def _file_stamp(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def save_start_image(window: QWidget, path: str, sources: list[str]):
+    """Bild des Fensterinhalts plus Lage und Stand der Zustandsdateien speichern."""
+    pixmap = window.grab()
+    image = pixmap.toImage()
+    geometry = window.normalGeometry() if window.isMaximized() else window.geometry()
+    image.setText(_META_KEY, json.dumps({
+        "geometry": [geometry.x(), geometry.y(), geometry.width(), geometry.height()],
+        "maximized": window.isMaximized(),
+        "dpr": pixmap.devicePixelRatio(),
+        "title": window.windowTitle(),
+        "saved": datetime.now().isoformat(timespec="minutes"),
+        "sources": {source: _file_stamp(source) for source in sources},
+    }))
+    tmp_path = path + ".tmp"
+    # geringe Kompression: Schreiben beim Beenden und Lesen beim Start bleiben schnell
+    if image.save(tmp_path, "PNG", 80):
+        os.replace(tmp_path, path)
+
+
+def remove_start_image(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def load_start_image(path: str) -> tuple[QPixmap, dict] | None:
+    """Bild und Metadaten, oder None, wenn es fehlt oder nicht mehr zum Zustand passt."""
+    if not os.path.isfile(path):
+        return None
+    reader = QImageReader(path)
+    try:
+        meta = json.loads(reader.text(_META_KEY) or "null")
+    except ValueError:
+        return None
+    if not isinstance(meta, dict):
+        return None
+    if any(_file_stamp(source) != stamp for source, stamp in meta.get("sources", {}).items()):
+        return None
+    image = reader.read()
+    if image.isNull():
+        return None
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(meta.get("dpr", 1.0))
+    return pixmap, meta
+
+
+class StartImageWindow(QWidget):
+    """Zeigt das gespeicherte Bild, bis das echte Hauptfenster bereit ist."""
+
+    def __init__(self, pixmap: QPixmap, meta: dict):
+        super().__init__()
+        self._pixmap = pixmap
+        self.setWindowTitle(meta.get("title", ""))
+        self.setCursor(Qt.CursorShape.WaitCursor)
+        self.setGeometry(QRect(*meta["geometry"]))
+        self._maximized = bool(meta.get("maximized"))
+        try:
+            saved = datetime.fromisoformat(meta.get("saved", ""))
+            self._badge = f"Stand {saved:%d.%m. %H:%M} – wird geladen …"
+        except ValueError:
+            self._badge = "Wird geladen …"
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+        font = QFont(self.font())
+        font.setPointSize(10)
+        font.setBold(True)
+        painter.setFont(font)
+        text_rect = painter.fontMetrics().boundingRect(self._badge).adjusted(-10, -5, 10, 5)
+        text_rect.moveBottomRight(self.rect().bottomRight() - QPoint(12, 12))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(44, 62, 80, 220))
+        painter.drawRoundedRect(text_rect, 6, 6)
+        painter.setPen(QColor("white"))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, self._badge)
+        painter.end()
+
+    def present(self):
+        if self._maximized:
+            self.showMaximized()
+        else:
+            self.show()
+        # sofort zeichnen, der Start blockiert danach die Ereignisschleife
+        QApplication.processEvents()
+
+    def finish(self, window: QWidget):
+        """Das echte Fenster an Stelle des Bildes zeigen und das Bild schließen."""
+        window.setGeometry(self.normalGeometry() if self.isMaximized() else self.geometry())
+        if self._maximized:
+            window.showMaximized()
+        else:
+            window.show()
+        window.raise_()
+        window.activateWindow()
+        self.close()
+        self.deleteLater()
+
+
+def show_start_image(path: str = DEFAULT_PATH) -> StartImageWindow | None:
+    """Beim Programmstart aufrufen (nach QApplication, vor den schweren Modulen)."""
+    if not QSettings(ORG_NAME, APP_NAME).value(SETTING_KEY, True, type=bool):
+        return None
+    loaded = load_start_image(path)
+    if loaded is None:
+        return None
+    window = StartImageWindow(*loaded)
+    window.present()
+    return window
@@ -0,0 +1,142 @@
+# stats.py
+"""
+Kennzahlen über den geladenen Bestand (Statistik-Seite).
+
+Alles wird spaltenweise mit pandas/NumPy auf dem kompakten Bestand
+(herdstore.py) berechnet. Der nur vom Bestand abhängige Teil (Altersklassen,
+Rassen- und Geschlechterverteilung) wird zwischengespeichert, bis ein neuer
+Bestand geladen wird oder der Tag wechselt. Die Schlachttermine hängen zusätzlich von den
+Regeln ab und werden pro Regelstand zwischengespeichert.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+from herdstore import BREED_COLUMN, SEX_COLUMN, HerdStore
+from rules import SchlachtalterRules
+
+# Altersklassen in Monaten: [von, bis)
+AGE_BINS = (0, 6, 12, 18, 24, 36)
+UPCOMING_WEEKS = 8
+
+
+@dataclass
+class HerdStats:
+    total: int = 0
+    age_distribution: list[tuple[str, int]] = field(default_factory=list)
+    breeds: list[tuple[str, int]] = field(default_factory=list)
+    sexes: list[tuple[str, int]] = field(default_factory=list)
+    upcoming: list[tuple[str, int]] = field(default_factory=list)
+    overdue: int = 0
+
+
+def _age_labels() -> list[str]:
+    labels = [f"{lo}–{hi} Mon." for lo, hi in zip(AGE_BINS, AGE_BINS[1:])]
+    labels.append(f"≥ {AGE_BINS[-1]} Mon.")
+    return labels
+
+
+class HerdStatistics:
+    """Berechnet und cached die Kennzahlen eines Bestands."""
+
+    def __init__(self):
+        self._store: HerdStore | None = None
+        self._today: date | None = None
+        self._base: dict | None = None
+        self._slaughter_key: tuple | None = None
+        self._slaughter: np.ndarray | None = None
+
+    def invalidate(self):
+        self._store = None
+        self._base = None
+        self._slaughter_key = None
+        self._slaughter = None
+
+    def compute(self, store: HerdStore, rules: SchlachtalterRules, today: date) -> HerdStats:
+        base = self._base_stats(store, today)
+        slaughter = self._slaughter_days(base, rules, store)
+
+        # Schlachtungen je Woche ab Montag der laufenden Woche
+        week_start = today - timedelta(days=today.weekday())
+        edges = np.array([(week_start + timedelta(weeks=n)).toordinal() for n in range(UPCOMING_WEEKS + 1)])
+        valid = slaughter[slaughter > 0]
+        counts = np.diff(np.searchsorted(np.sort(valid), edges, side="left"))
+        upcoming = []
+        for n, count in enumerate(counts):
+            iso_week = (week_start + timedelta(weeks=n)).isocalendar()[1]
+            upcoming.append((f"KW {iso_week}", int(count)))
+
+        return HerdStats(
+            total=base["total"],
+            age_distribution=base["ages"],
+            breeds=base["breeds"],
+            sexes=base["sexes"],
+            upcoming=upcoming,
+            overdue=int(np.count_nonzero(valid < edges[0])),
+        )
+
+    def _base_stats(self, store: HerdStore, today: date) -> dict:
+        if self._base is not None and self._store is store and self._today == today:
+            return self._base
+        self.invalidate()
+
+        births = store.births()
+        year = births.dt.year.to_numpy(dtype=float)
+        month = births.dt.month.to_numpy(dtype=float)
+        day = births.dt.day.to_numpy(dtype=float)
+        months = (today.year - year) * 12 + (today.month - month) - (today.day < day)
+        known = ~np.isnan(months)
+        bins = np.digitize(months[known], AGE_BINS[1:])
+        age_counts = np.bincount(bins, minlength=len(AGE_BINS))
+
+        rasse = pd.Series(store.labels(BREED_COLUMN), dtype=object)
+        geschlecht = pd.Series(store.labels(SEX_COLUMN), dtype=object)
+        breeds = rasse.value_counts()
+        sexes = geschlecht.value_counts()
+
+        self._store = store
+        self._today = today
+        self._base = {
+            "total": len(store),
+            "ages": list(zip(_age_labels(), (int(c) for c in age_counts))),
+            "breeds": [(str(k), int(v)) for k, v in breeds.items()],
+            "sexes": [(str(k), int(v)) for k, v in sexes.items()],
+            "births": births,
+            "rasse": rasse,
+            "geschlecht": geschlecht,
+        }
+        return self._base
+
+    def _slaughter_days(self, base: dict, rules: SchlachtalterRules, store: HerdStore) -> np.ndarray:
+        """Schlachttermine als Tagesnummer (0 = unbekannt), je Regelstand gecacht."""
+        rules_key = repr(sorted(rules.to_dict().items()))
+        if self._slaughter is not None and self._slaughter_key == rules_key:
+            return self._slaughter
+
+        # Monate je Tier: zuerst je Gruppe (Rasse, Geschlecht), dann Einzelregeln
+        groups = pd.MultiIndex.from_arrays([base["rasse"], base["geschlecht"]])
+        unique_groups = groups.unique()
+        group_months = pd.Series(
+            [rules.months_for(None, r, g) for r, g in unique_groups], index=unique_groups
+        )
+        months = group_months.reindex(groups).to_numpy()
+        # Einzelregeln sind wenige: direkt über den Store nachschlagen statt alle Ohrmarken zu normalisieren
+        for key, override in rules.by_tier.items():
+            position = store.position(key)
+            if position is not None:
+                months[position] = override
+
+        births = base["births"]
+        slaughter = pd.Series(pd.NaT, index=births.index, dtype="datetime64[ns]")
+        for m in np.unique(months):
+            mask = months == m
+            slaughter[mask] = births[mask] + pd.DateOffset(months=int(m))
+        # Tagesnummer wie date.toordinal() (0001-01-01 = 1)
+        epoch_ordinal = date(1970, 1, 1).toordinal()
+        days = slaughter.to_numpy(dtype="datetime64[D]").astype("int64") + epoch_ordinal
+        days[slaughter.isna().to_numpy()] = 0
+
+        self._slaughter_key = rules_key
+        self._slaughter = days
+        return days
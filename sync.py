@@ -0,0 +1,376 @@
+# sync.py
+"""
+Abgleich der Stallbelegung zwischen mehreren Terminals im Stallnetz.
+
+Ein Terminal (oder ein eigener Rechner, `python sync.py --port 8765`) betreibt
+den `SyncServer`, alle Terminals verbinden sich per WebSocket mit einem
+`SyncClient`. Ausgetauscht werden nur Deltas je Stallplatz, nie der ganze
+Zustand:
+
+    {"bereich": "einzelplaetze", "platz": 3, "wert": {"raw_id": ..., "tier": ...},
+     "vv": {"<terminal>": 4, ...}}
+
+Jeder Platz trägt einen Versionsvektor (Terminal → Änderungszähler). Ist der
+Vektor einer Änderung größer als der bekannte, gewinnt sie; sind zwei
+Änderungen parallel entstanden, entscheidet der Server reproduzierbar
+(größere Summe, dann Terminal-ID) und verteilt den Gewinner mit dem
+zusammengeführten Vektor an alle. Der Server nummeriert jede übernommene
+Änderung fortlaufend; ein Terminal holt nach einer Unterbrechung nur die
+Plätze nach, die sich seit seiner letzten Nummer geändert haben.
+
+Alles läuft auch vollständig auf localhost (Port 0 = freier Port).
+"""
+import argparse
+import json
+import os
+import sys
+import uuid
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, QUrl, Signal
+from PySide6.QtNetwork import QHostAddress
+from PySide6.QtWebSockets import QWebSocket, QWebSocketServer
+from shiboken6 import Shiboken
+
+from model import StallModel
+
+DEFAULT_PORT = 8765
+RECONNECT_MS = 3000
+
+# täglich neu berechnete Felder zählen nicht als Änderung eines Platzes
+DERIVED_KEYS = ("alter",)
+
+EQUAL, NEWER, OLDER, CONCURRENT = "gleich", "neuer", "aelter", "parallel"
+
+
+# --- Versionsvektoren ---
+def vv_compare(a: dict[str, int], b: dict[str, int]) -> str:
+    """Vergleicht Vektor `a` mit `b`: gleich, neuer, aelter oder parallel."""
+    a_greater = any(count > b.get(node, 0) for node, count in a.items())
+    b_greater = any(count > a.get(node, 0) for node, count in b.items())
+    if a_greater and b_greater:
+        return CONCURRENT
+    if a_greater:
+        return NEWER
+    if b_greater:
+        return OLDER
+    return EQUAL
+
+
+def vv_merge(a: dict[str, int], b: dict[str, int]) -> dict[str, int]:
+    merged = dict(a)
+    for node, count in b.items():
+        merged[node] = max(merged.get(node, 0), count)
+    return merged
+
+
+def _tie_break(delta: dict) -> tuple:
+    vv = delta["vv"]
+    return sum(vv.values()), max(vv, key=lambda node: (vv[node], node), default="")
+
+
+def fingerprint(value: dict) -> str:
+    tier = value.get("tier")
+    if isinstance(tier, dict):
+        tier = {k: v for k, v in tier.items() if k not in DERIVED_KEYS}
+    return json.dumps([value.get("raw_id", ""), tier], sort_keys=True, ensure_ascii=False)
+
+
+def _send(socket: QWebSocket, message: dict):
+    socket.sendTextMessage(json.dumps(message, ensure_ascii=False))
+
+
+# --- Server ---
+class SyncServer(QObject):
+    """Hält den letzten Stand je Platz und verteilt übernommene Änderungen."""
+    clientsChanged = Signal(int)
+
+    def __init__(self, port: int = DEFAULT_PORT, host: QHostAddress | None = None, parent=None):
+        super().__init__(parent)
+        self._host = host or QHostAddress(QHostAddress.SpecialAddress.Any)
+        self._requested_port = port
+        self._server = QWebSocketServer("Stalltafel", QWebSocketServer.SslMode.NonSecureMode, self)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._clients: list[QWebSocket] = []
+        # (bereich, platz) → {"bereich", "platz", "wert", "vv", "seq"}
+        self._slots: dict[tuple[str, int], dict] = {}
+        self._seq = 0
+        # neue Kennung je Serverstart: Terminals erkennen daran, dass sie alles neu senden müssen
+        self.epoch = uuid.uuid4().hex[:12]
+
+    def listen(self) -> bool:
+        return self._server.listen(self._host, self._requested_port)
+
+    @property
+    def port(self) -> int:
+        return self._server.serverPort()
+
+    def close(self):
+        clients, self._clients = self._clients, []
+        for socket in clients:
+            socket.close()
+        self._server.close()
+
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            socket.textMessageReceived.connect(lambda text, s=socket: self._on_message(s, text))
+            # Freigeben direkt in Qt: beim Abbau des Servers sind die Sockets
+            # schon gelöscht, wenn `disconnected` kommt
+            socket.disconnected.connect(socket.deleteLater)
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+            self._clients.append(socket)
+        self.clientsChanged.emit(len(self._clients))
+
+    def _on_disconnected(self, socket: QWebSocket):
+        if not Shiboken.isValid(self):
+            return  # der Server wird gerade abgebaut
+        if socket in self._clients:
+            self._clients.remove(socket)
+            self.clientsChanged.emit(len(self._clients))
+
+    def _on_message(self, socket: QWebSocket, text: str):
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if message.get("typ") == "hallo":
+            self._welcome(socket, message)
+        elif message.get("typ") == "deltas":
+            self._merge(socket, message.get("deltas", []))
+
+    def _welcome(self, socket: QWebSocket, message: dict):
+        full = message.get("epoch") != self.epoch
+        since = 0 if full else int(message.get("seit", 0))
+        _send(socket, {
+            "typ": "willkommen", "epoch": self.epoch, "seq": self._seq, "vollabgleich": full,
+            "deltas": [entry for entry in self._slots.values() if entry["seq"] > since],
+        })
+
+    def _merge(self, sender: QWebSocket, deltas: list[dict]):
+        others: list[dict] = []      # an alle anderen Terminals
+        everyone: list[dict] = []    # Konfliktgewinner, auch an den Absender
+        corrections: list[dict] = [] # veraltete Änderung: Absender bekommt den aktuellen Stand
+        for delta in deltas:
+            try:
+                key = (delta["bereich"], int(delta["platz"]))
+                vv = {str(k): int(v) for k, v in delta["vv"].items()}
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            incoming = {"bereich": key[0], "platz": key[1], "wert": delta.get("wert") or {}, "vv": vv}
+            current = self._slots.get(key)
+            order = vv_compare(vv, current["vv"]) if current else NEWER
+            if order == NEWER:
+                others.append(self._store(key, incoming))
+            elif order == CONCURRENT:
+                winner = max(current, incoming, key=_tie_break)
+                merged = dict(winner, vv=vv_merge(current["vv"], vv))
+                everyone.append(self._store(key, merged))
+            elif order == OLDER:
+                corrections.append(current)
+
+        if corrections:
+            self._send_deltas(sender, corrections)
+        for socket in self._clients:
+            batch = everyone if socket is sender else others + everyone
+            if batch:
+                self._send_deltas(socket, batch)
+
+    def _store(self, key: tuple[str, int], entry: dict) -> dict:
+        self._seq += 1
+        entry = {"bereich": entry["bereich"], "platz": entry["platz"], "wert": entry["wert"],
+                 "vv": entry["vv"], "seq": self._seq}
+        self._slots[key] = entry
+        return entry
+
+    def _send_deltas(self, socket: QWebSocket, deltas: list[dict]):
+        _send(socket, {"typ": "deltas", "epoch": self.epoch, "seq": self._seq, "deltas": deltas})
+
+
+# --- Client ---
+class SyncClient(QObject):
+    """
+    Verbindet ein `StallModel` mit dem Server. Lokale Änderungen werden je Platz
+    erkannt (Vergleich mit dem zuletzt bekannten Stand), gesammelt und in einer
+    Nachricht verschickt; eingehende Änderungen werden per `set_slot` nur auf
+    die betroffenen Plätze angewendet.
+    """
+    remoteApplied = Signal(str, list)
+    statusChanged = Signal(str)
+
+    def __init__(self, model: StallModel, url: str, state_path: str | None = None, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.url = url
+        self.state_path = state_path
+        self.terminal = uuid.uuid4().hex[:12]
+        self._epoch = ""
+        self._seq = 0
+        # "bereich/platz" → Versionsvektor bzw. Fingerabdruck des bekannten Werts
+        self._vv: dict[str, dict[str, int]] = {}
+        self._known: dict[str, str] = {}
+        self._pending: dict[str, dict] = {}
+        self._connected = False
+        self._load_state()
+
+        self._socket = QWebSocket()
+        self._socket.setParent(self)
+        self._socket.connected.connect(self._on_connected)
+        self._socket.disconnected.connect(self._on_disconnected)
+        self._socket.textMessageReceived.connect(self._on_message)
+        self._reconnect = QTimer(self)
+        self._reconnect.setInterval(RECONNECT_MS)
+        self._reconnect.timeout.connect(self._open)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+
+        # Offline entstandene Änderungen gegenüber dem gespeicherten Stand erkennen
+        for section in model.sections():
+            self._scan(section, range(len(model.slots(section))))
+        model.slotsChanged.connect(self._scan)
+        model.sectionReset.connect(lambda section: self._scan(section, range(len(model.slots(section)))))
+
+    # --- Verbindung ---
+    def start(self):
+        self._open()
+        self._reconnect.start()
+
+    def stop(self):
+        self._reconnect.stop()
+        self._socket.close()
+        self._save_state()
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def _open(self):
+        if not self._connected:
+            self._socket.open(QUrl(self.url))
+
+    def _on_connected(self):
+        self._connected = True
+        self.statusChanged.emit(f"Verbunden mit {self.url}")
+        _send(self._socket, {"typ": "hallo", "terminal": self.terminal, "epoch": self._epoch, "seit": self._seq})
+
+    def _on_disconnected(self):
+        if self._connected:
+            self.statusChanged.emit("Verbindung getrennt – neuer Versuch läuft")
+        self._connected = False
+
+    # --- Lokale Änderungen ---
+    @staticmethod
+    def _key(section: str, index: int) -> str:
+        return f"{section}/{index}"
+
+    def _value(self, section: str, index: int) -> dict:
+        raw_ids = self.model.raw_ids(section)
+        return {"raw_id": raw_ids[index] if index < len(raw_ids) else "",
+                "tier": self.model.tier(section, index)}
+
+    def _scan(self, section: str, indices):
+        """Vergleicht die Plätze mit dem bekannten Stand und merkt geänderte zum Senden vor."""
+        for index in indices:
+            key = self._key(section, index)
+            value = self._value(section, index)
+            fp = fingerprint(value)
+            if self._known.get(key) == fp:
+                continue
+            self._known[key] = fp
+            vv = dict(self._vv.get(key, {}))
+            vv[self.terminal] = vv.get(self.terminal, 0) + 1
+            self._vv[key] = vv
+            self._pending[key] = {"bereich": section, "platz": index, "wert": value, "vv": vv}
+        if self._pending and not self._flush_timer.isActive():
+            self._flush_timer.start(0)
+
+    def flush(self):
+        """Schickt alle vorgemerkten Änderungen in einer Nachricht (je Platz nur die letzte)."""
+        if not self._pending or not self._connected:
+            return
+        deltas = list(self._pending.values())
+        self._pending.clear()
+        _send(self._socket, {"typ": "deltas", "terminal": self.terminal, "deltas": deltas})
+        self._save_state()
+
+    # --- Eingehende Änderungen ---
+    def _on_message(self, text: str):
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if message.get("typ") == "willkommen" and message.get("vollabgleich"):
+            # Server ist neu gestartet: eigenen Stand vollständig anbieten
+            for key, vv in self._vv.items():
+                section, index = key.rsplit("/", 1)
+                if section in self.model.sections():
+                    self._pending.setdefault(key, {"bereich": section, "platz": int(index),
+                                                   "wert": self._value(section, int(index)), "vv": vv})
+        self._epoch = message.get("epoch", self._epoch)
+        self._apply(message.get("deltas", []))
+        self._seq = max(self._seq, int(message.get("seq", 0)))
+        self.flush()
+        self._save_state()
+
+    def _apply(self, deltas: list[dict]):
+        changed: dict[str, list[int]] = {}
+        for delta in deltas:
+            section, index = delta.get("bereich"), delta.get("platz")
+            if section not in self.model.sections() or not isinstance(index, int) or index < 0:
+                continue
+            key = self._key(section, index)
+            vv = delta.get("vv", {})
+            if vv_compare(vv, self._vv.get(key, {})) != NEWER:
+                continue
+            value = delta.get("wert") or {}
+            self._vv[key] = vv
+            self._known[key] = fingerprint(value)
+            self._pending.pop(key, None)
+            # Bekannten Stand vorher setzen, damit set_slot kein Echo erzeugt
+            self.model.set_raw_id(section, index, value.get("raw_id", ""))
+            self.model.set_slot(section, index, value.get("tier"))
+            changed.setdefault(section, []).append(index)
+        for section, indices in changed.items():
+            self.remoteApplied.emit(section, indices)
+
+    # --- Persistenz ---
+    def _load_state(self):
+        if not self.state_path or not os.path.isfile(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.terminal = state.get("terminal", self.terminal)
+        self._epoch = state.get("epoch", "")
+        self._seq = int(state.get("seq", 0))
+        self._vv = state.get("vv", {})
+        self._known = state.get("known", {})
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        state = {"terminal": self.terminal, "epoch": self._epoch, "seq": self._seq,
+                 "vv": self._vv, "known": self._known}
+        try:
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync-Server für die Stalltafel")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    app = QCoreApplication(sys.argv)
+    server = SyncServer(args.port)
+    if not server.listen():
+        print(f"Port {args.port} ist belegt.")
+        sys.exit(1)
+    server.clientsChanged.connect(lambda n: print(f"{n} Terminal(s) verbunden"))
+    print(f"Sync-Server läuft auf Port {server.port}")
+    sys.exit(app.exec())
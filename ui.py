@@ -15,10 +15,14 @@ from PySide6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QFrame, QGridLayout, QScrollArea,
     QStackedWidget, QSpacerItem, QSizePolicy,
-    QButtonGroup, QComboBox
+    QButtonGroup, QComboBox, QSpinBox, QTreeWidget,
+    QHeaderView, QLineEdit, QTableWidget, QAbstractItemView,
+    QCheckBox
 )
 import qtawesome as qta
 
+from charts import BarChart
+
 
 def get_base_path() -> str:
     """
@@ -89,10 +93,16 @@ class Ui_MainWindow(object):
         self.page_einzelplaetze = self._create_einzelplaetze_page()
         self.page_gruppenboxen = self._create_gruppenboxen_page()
         self.page_setup = self._create_setup_page()
+        self.page_planung = self._create_planung_page()
+        self.page_statistik = self._create_statistik_page()
+        self.page_verweildauer = self._create_verweildauer_page()
 
         self.stacked_widget.addWidget(self.page_einzelplaetze)
         self.stacked_widget.addWidget(self.page_gruppenboxen)
         self.stacked_widget.addWidget(self.page_setup)
+        self.stacked_widget.addWidget(self.page_planung)
+        self.stacked_widget.addWidget(self.page_statistik)
+        self.stacked_widget.addWidget(self.page_verweildauer)
 
     def _create_header(self) -> QWidget:
         """Erstellt die Kopfzeile mit Logo, Titel und Navigationsbuttons."""
@@ -137,11 +147,11 @@ class Ui_MainWindow(object):
         title_label = QLabel("Digitale Stalltafel")
         title_label.setObjectName("TitleLabel")
 
-        subtitle_label = QLabel("Hof Krenhuber")
-        subtitle_label.setObjectName("SubtitleLabel")
+        self.subtitle_label = QLabel("Hof Krenhuber")
+        self.subtitle_label.setObjectName("SubtitleLabel")
 
         title_layout.addWidget(title_label)
-        title_layout.addWidget(subtitle_label)
+        title_layout.addWidget(self.subtitle_label)
 
         header_layout.addLayout(title_layout)
         header_layout.addStretch()
@@ -167,8 +177,54 @@ class Ui_MainWindow(object):
         self.btn_setup.setIcon(qta.icon('fa5s.cog', color='white'))
         self.button_group.addButton(self.btn_setup, 2)
 
+        self.btn_planung = QPushButton("Planung")
+        self.btn_planung.setObjectName("HeaderButton")
+        self.btn_planung.setCheckable(True)
+        self.btn_planung.setIcon(qta.icon('fa5s.calendar-alt', color='white'))
+        self.button_group.addButton(self.btn_planung, 3)
+
+        self.btn_statistik = QPushButton("Statistik")
+        self.btn_statistik.setObjectName("HeaderButton")
+        self.btn_statistik.setCheckable(True)
+        self.btn_statistik.setIcon(qta.icon('fa5s.chart-bar', color='white'))
+        self.button_group.addButton(self.btn_statistik, 4)
+
+        self.btn_verweildauer = QPushButton("Verweildauer")
+        self.btn_verweildauer.setObjectName("HeaderButton")
+        self.btn_verweildauer.setCheckable(True)
+        self.btn_verweildauer.setIcon(qta.icon('fa5s.hourglass-half', color='white'))
+        self.button_group.addButton(self.btn_verweildauer, 5)
+
+        # --- Suche über alle Plätze (search.py) ---
+        self.search_edit = QLineEdit()
+        self.search_edit.setObjectName("SearchEdit")
+        self.search_edit.setPlaceholderText("Suchen: Ohrmarke, Rasse, Geschlecht …")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.addAction(qta.icon('fa5s.search', color='#7f8c8d'), QLineEdit.ActionPosition.LeadingPosition)
+        self.search_edit.setMinimumWidth(280)
+        self.search_window_combo = QComboBox()
+        self.search_window_combo.setObjectName("SearchWindowCombo")
+        self.search_window_combo.addItem("Schlachtung: alle", None)
+        self.search_window_combo.addItem("Schlachtung: überfällig", "overdue")
+        self.search_window_combo.addItem("Schlachtung: diese Woche", "week")
+        self.search_window_combo.addItem("Schlachtung: nächste 4 Wochen", "4weeks")
+        self.search_window_combo.addItem("Schlachtung: dieser Monat", "month")
+        self.search_result_label = QLabel("")
+        self.search_result_label.setObjectName("SearchResultLabel")
+        search_layout = QVBoxLayout()
+        search_layout.setSpacing(4)
+        search_row = QHBoxLayout()
+        search_row.addWidget(self.search_edit)
+        search_row.addWidget(self.search_window_combo)
+        search_layout.addLayout(search_row)
+        search_layout.addWidget(self.search_result_label)
+        header_layout.addLayout(search_layout)
+
         header_layout.addWidget(self.btn_einzelplaetze)
         header_layout.addWidget(self.btn_gruppenboxen)
+        header_layout.addWidget(self.btn_planung)
+        header_layout.addWidget(self.btn_statistik)
+        header_layout.addWidget(self.btn_verweildauer)
         header_layout.addWidget(self.btn_setup)
 
         return header_widget
@@ -198,6 +254,43 @@ class Ui_MainWindow(object):
         schlachtdatum_control_layout.addWidget(self.schlachtalter_combo)
         card_schlachtdatum_layout.addWidget(label_schlachtdatum_title)
         card_schlachtdatum_layout.addLayout(schlachtdatum_control_layout)
+
+        # Abweichende Regeln je Rasse, Geschlecht oder Einzeltier
+        label_regeln = QLabel("Abweichendes Schlachtalter (Tier vor Rasse vor Geschlecht):")
+        regel_control_layout = QHBoxLayout()
+        self.regel_typ_combo = QComboBox()
+        self.regel_typ_combo.addItem("Rasse", userData="rasse")
+        self.regel_typ_combo.addItem("Geschlecht", userData="geschlecht")
+        self.regel_typ_combo.addItem("Tier-ID", userData="tier")
+        self.regel_typ_combo.setFixedWidth(150)
+        self.regel_wert_edit = QLineEdit()
+        self.regel_wert_edit.setPlaceholderText("z. B. FL, Weibl. oder AT506278889")
+        self.regel_monate_spin = QSpinBox()
+        self.regel_monate_spin.setRange(1, 48)
+        self.regel_monate_spin.setValue(18)
+        self.regel_monate_spin.setSuffix(" Monate")
+        self.regel_monate_spin.setFixedWidth(120)
+        self.btn_regel_setzen = QPushButton("Regel setzen")
+        self.btn_regel_setzen.setObjectName("SecondaryButton")
+        self.btn_regel_entfernen = QPushButton("Entfernen")
+        self.btn_regel_entfernen.setObjectName("SecondaryButton")
+        regel_control_layout.addWidget(self.regel_typ_combo)
+        regel_control_layout.addWidget(self.regel_wert_edit)
+        regel_control_layout.addWidget(self.regel_monate_spin)
+        regel_control_layout.addWidget(self.btn_regel_setzen)
+        regel_control_layout.addWidget(self.btn_regel_entfernen)
+
+        self.regel_table = QTableWidget(0, 3)
+        self.regel_table.setHorizontalHeaderLabels(["Typ", "Wert", "Schlachtalter"])
+        self.regel_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.regel_table.verticalHeader().setVisible(False)
+        self.regel_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.regel_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.regel_table.setMaximumHeight(160)
+
+        card_schlachtdatum_layout.addWidget(label_regeln)
+        card_schlachtdatum_layout.addLayout(regel_control_layout)
+        card_schlachtdatum_layout.addWidget(self.regel_table)
         layout.addWidget(card_schlachtdatum)
 
         card_einzel = QFrame()
@@ -216,9 +309,17 @@ class Ui_MainWindow(object):
         self.btn_drucken_einzel = QPushButton("Drucken")
         self.btn_drucken_einzel.setObjectName("SecondaryButton")
         self.btn_drucken_einzel.setIcon(qta.icon('fa5s.print', color='#2c3e50'))
+        self.btn_etiketten_einzel = QPushButton("Etiketten")
+        self.btn_etiketten_einzel.setObjectName("SecondaryButton")
+        self.btn_etiketten_einzel.setIcon(qta.icon('fa5s.id-card', color='#2c3e50'))
+        self.btn_fenster_einzel = QPushButton("Eigenes Fenster")
+        self.btn_fenster_einzel.setObjectName("SecondaryButton")
+        self.btn_fenster_einzel.setIcon(qta.icon('fa5s.external-link-alt', color='#2c3e50'))
         btn_layout_einzel.addWidget(self.btn_bestand_einzel)
         btn_layout_einzel.addWidget(self.btn_aktualisieren_einzel)
         btn_layout_einzel.addWidget(self.btn_drucken_einzel)
+        btn_layout_einzel.addWidget(self.btn_etiketten_einzel)
+        btn_layout_einzel.addWidget(self.btn_fenster_einzel)
 
         card_einzel_layout.addWidget(label_einzel)
         card_einzel_layout.addLayout(btn_layout_einzel)
@@ -240,14 +341,256 @@ class Ui_MainWindow(object):
         self.btn_drucken_gruppe = QPushButton("Drucken")
         self.btn_drucken_gruppe.setObjectName("SecondaryButton")
         self.btn_drucken_gruppe.setIcon(qta.icon('fa5s.print', color='#2c3e50'))
+        self.btn_etiketten_gruppe = QPushButton("Etiketten")
+        self.btn_etiketten_gruppe.setObjectName("SecondaryButton")
+        self.btn_etiketten_gruppe.setIcon(qta.icon('fa5s.id-card', color='#2c3e50'))
+        self.btn_fenster_gruppe = QPushButton("Eigenes Fenster")
+        self.btn_fenster_gruppe.setObjectName("SecondaryButton")
+        self.btn_fenster_gruppe.setIcon(qta.icon('fa5s.external-link-alt', color='#2c3e50'))
         btn_layout_gruppe.addWidget(self.btn_bestand_gruppe)
         btn_layout_gruppe.addWidget(self.btn_aktualisieren_gruppe)
         btn_layout_gruppe.addWidget(self.btn_drucken_gruppe)
+        btn_layout_gruppe.addWidget(self.btn_etiketten_gruppe)
+        btn_layout_gruppe.addWidget(self.btn_fenster_gruppe)
 
         card_gruppe_layout.addWidget(label_gruppe)
         card_gruppe_layout.addLayout(btn_layout_gruppe)
         layout.addWidget(card_gruppe)
 
+        # Zeitmessung für Laden, Auflösen, Zeichnen und Drucken
+        card_diagnose = QFrame()
+        card_diagnose.setObjectName("Card")
+        card_diagnose_layout = QVBoxLayout(card_diagnose)
+        card_diagnose_layout.setSpacing(15)
+        label_diagnose = QLabel("Darstellung & Diagnose")
+        label_diagnose.setObjectName("CardTitle")
+        diagnose_control_layout = QHBoxLayout()
+        self.chk_profiling = QCheckBox("Zeitmessung aktiv")
+        self.chk_profiling_overlay = QCheckBox("Overlay anzeigen (F12)")
+        self.chk_low_cost = QCheckBox("Sparsame Darstellung (ohne Schatten)")
+        self.chk_low_cost.setToolTip("Selbst gezeichnete Karten – flüssiger auf Rechnern ohne Grafikbeschleunigung")
+        self.chk_instant_start = QCheckBox("Sofortstart mit Bild der Tafel")
+        self.chk_instant_start.setToolTip("Zeigt beim Start sofort die Tafel vom letzten Beenden, bis alles geladen ist")
+        self.btn_trace_export = QPushButton("Trace exportieren")
+        self.btn_trace_export.setObjectName("SecondaryButton")
+        self.btn_trace_export.setIcon(qta.icon('fa5s.stopwatch', color='#2c3e50'))
+        diagnose_control_layout.addWidget(self.chk_profiling)
+        diagnose_control_layout.addWidget(self.chk_profiling_overlay)
+        diagnose_control_layout.addWidget(self.chk_low_cost)
+        diagnose_control_layout.addWidget(self.chk_instant_start)
+        diagnose_control_layout.addStretch()
+        diagnose_control_layout.addWidget(self.btn_trace_export)
+        card_diagnose_layout.addWidget(label_diagnose)
+        card_diagnose_layout.addLayout(diagnose_control_layout)
+        layout.addWidget(card_diagnose)
+
+        # Abgleich der Belegung mit anderen Terminals im Stallnetz
+        card_sync = QFrame()
+        card_sync.setObjectName("Card")
+        card_sync_layout = QVBoxLayout(card_sync)
+        card_sync_layout.setSpacing(15)
+        label_sync = QLabel("Stallnetz")
+        label_sync.setObjectName("CardTitle")
+        sync_control_layout = QHBoxLayout()
+        self.chk_sync = QCheckBox("Mit anderen Terminals abgleichen")
+        self.chk_sync_server = QCheckBox("Dieses Terminal ist Server")
+        self.sync_url_edit = QLineEdit()
+        self.sync_url_edit.setPlaceholderText("Server, z. B. ws://stall-pc:8765 (leer = dieses Terminal)")
+        sync_control_layout.addWidget(self.chk_sync)
+        sync_control_layout.addWidget(self.chk_sync_server)
+        sync_control_layout.addWidget(self.sync_url_edit)
+        self.sync_status_label = QLabel("Abgleich aus")
+        self.sync_status_label.setObjectName("SubtitleLabel")
+        dashboard_control_layout = QHBoxLayout()
+        self.chk_dashboard = QCheckBox("Web-Ansicht für Handys")
+        self.chk_dashboard.setToolTip("Schreibgeschützte Übersicht der Belegung im Browser")
+        self.dashboard_status_label = QLabel("")
+        self.dashboard_status_label.setObjectName("SubtitleLabel")
+        self.dashboard_status_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        dashboard_control_layout.addWidget(self.chk_dashboard)
+        dashboard_control_layout.addWidget(self.dashboard_status_label)
+        dashboard_control_layout.addStretch()
+        # Ohrmarken, die im Bestandsexport fehlen, beim Tierregister nachschlagen (registry.py)
+        registry_control_layout = QHBoxLayout()
+        self.chk_registry = QCheckBox("Unbekannte Ohrmarken im Register nachschlagen")
+        self.registry_url_edit = QLineEdit()
+        self.registry_url_edit.setPlaceholderText("Register, z. B. http://stall-pc:8090/")
+        self.registry_status_label = QLabel("")
+        self.registry_status_label.setObjectName("SubtitleLabel")
+        registry_control_layout.addWidget(self.chk_registry)
+        registry_control_layout.addWidget(self.registry_url_edit)
+        registry_control_layout.addWidget(self.registry_status_label)
+        card_sync_layout.addWidget(label_sync)
+        card_sync_layout.addLayout(sync_control_layout)
+        card_sync_layout.addWidget(self.sync_status_label)
+        card_sync_layout.addLayout(dashboard_control_layout)
+        card_sync_layout.addLayout(registry_control_layout)
+        layout.addWidget(card_sync)
+
+        # Tabellen-Export (export.py) für Tierarzt und Schlachthof
+        card_export = QFrame()
+        card_export.setObjectName("Card")
+        card_export_layout = QVBoxLayout(card_export)
+        card_export_layout.setSpacing(15)
+        label_export = QLabel("Wochenberichte")
+        label_export.setObjectName("CardTitle")
+        export_control_layout = QHBoxLayout()
+        self.export_report_combo = QComboBox()
+        self.export_report_combo.addItem("Belegung (alle Plätze)", "belegung")
+        self.export_report_combo.addItem("Tierarzt (belegte Plätze)", "tierarzt")
+        self.export_report_combo.addItem("Schlachthof (fällig bis Wochenende)", "schlachthof")
+        self.btn_export = QPushButton("Exportieren (XLSX/CSV)")
+        self.btn_export.setObjectName("SecondaryButton")
+        self.btn_export.setIcon(qta.icon('fa5s.file-excel', color='#2c3e50'))
+        export_control_layout.addWidget(self.export_report_combo)
+        export_control_layout.addWidget(self.btn_export)
+        export_control_layout.addStretch()
+        card_export_layout.addWidget(label_export)
+        card_export_layout.addLayout(export_control_layout)
+        layout.addWidget(card_export)
+
+        # die Setup-Seite ist inzwischen höher als das Fenster: scrollbar machen
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setObjectName("ScrollArea")
+        scroll_area.setWidget(page)
+        return scroll_area
+
+    def _create_planung_page(self) -> QWidget:
+        """Erstellt die Seite für die Schlachtplanung über den gesamten Bestand."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(10, 20, 10, 10)
+
+        card = QFrame()
+        card.setObjectName("Card")
+        card_layout = QVBoxLayout(card)
+        card_layout.setSpacing(15)
+
+        title = QLabel("Schlachtplanung")
+        title.setObjectName("CardTitle")
+
+        control_layout = QHBoxLayout()
+        self.planung_period_combo = QComboBox()
+        self.planung_period_combo.addItem("Wochen", userData="week")
+        self.planung_period_combo.addItem("Monate", userData="month")
+        self.planung_period_combo.setFixedWidth(150)
+        self.planung_count_spin = QSpinBox()
+        self.planung_count_spin.setRange(1, 52)
+        self.planung_count_spin.setValue(8)
+        self.planung_count_spin.setFixedWidth(80)
+        self.planung_summary_label = QLabel()
+        self.planung_summary_label.setObjectName("SubtitleLabel")
+        control_layout.addWidget(QLabel("Fällig in den nächsten"))
+        control_layout.addWidget(self.planung_count_spin)
+        control_layout.addWidget(self.planung_period_combo)
+        control_layout.addSpacing(20)
+        control_layout.addWidget(self.planung_summary_label)
+        control_layout.addStretch()
+
+        self.planung_tree = QTreeWidget()
+        self.planung_tree.setHeaderLabels(["Zeitraum / Tier-ID", "Schlachtung", "Geboren", "Rasse", "Geschlecht", "Platz"])
+        self.planung_tree.setAlternatingRowColors(True)
+        self.planung_tree.setUniformRowHeights(True)
+        self.planung_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        card_layout.addWidget(title)
+        card_layout.addLayout(control_layout)
+        card_layout.addWidget(self.planung_tree)
+        layout.addWidget(card)
+
+        return page
+
+    def _create_kpi_card(self, caption: str) -> tuple[QFrame, QLabel]:
+        """Hilfsfunktion: kleine Karte mit großer Kennzahl und Beschriftung."""
+        card = QFrame()
+        card.setObjectName("Card")
+        card_layout = QVBoxLayout(card)
+        value_label = QLabel("–")
+        value_label.setObjectName("KpiValue")
+        caption_label = QLabel(caption)
+        caption_label.setObjectName("SubtitleLabel")
+        card_layout.addWidget(value_label)
+        card_layout.addWidget(caption_label)
+        return card, value_label
+
+    def _create_statistik_page(self) -> QWidget:
+        """Erstellt die Statistik-Seite mit Kennzahlen und Diagrammen zum Bestand."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(10, 20, 10, 10)
+        layout.setSpacing(20)
+
+        kpi_layout = QHBoxLayout()
+        kpi_layout.setSpacing(20)
+        card, self.stat_bestand_label = self._create_kpi_card("Tiere im Bestand")
+        kpi_layout.addWidget(card)
+        card, self.stat_einzel_label = self._create_kpi_card("Belegung Einzelplätze")
+        kpi_layout.addWidget(card)
+        card, self.stat_gruppe_label = self._create_kpi_card("Belegung Gruppenboxen")
+        kpi_layout.addWidget(card)
+        card, self.stat_faellig_label = self._create_kpi_card("Schlachtungen überfällig")
+        kpi_layout.addWidget(card)
+        layout.addLayout(kpi_layout)
+
+        chart_grid = QGridLayout()
+        chart_grid.setSpacing(20)
+        self.chart_alter = BarChart("Altersverteilung", "#3498db")
+        self.chart_rassen = BarChart("Rassen", "#27ae60")
+        self.chart_geschlecht = BarChart("Geschlecht", "#8e44ad")
+        self.chart_schlachtung = BarChart("Schlachtungen je Woche", "#e67e22")
+        for n, chart in enumerate((self.chart_alter, self.chart_rassen, self.chart_geschlecht, self.chart_schlachtung)):
+            card = QFrame()
+            card.setObjectName("Card")
+            card_layout = QVBoxLayout(card)
+            card_layout.addWidget(chart)
+            chart_grid.addWidget(card, n // 2, n % 2)
+        layout.addLayout(chart_grid)
+
+        self.stat_hinweis_label = QLabel()
+        self.stat_hinweis_label.setObjectName("SubtitleLabel")
+        layout.addWidget(self.stat_hinweis_label)
+
+        return page
+
+    def _create_verweildauer_page(self) -> QWidget:
+        """Erstellt die Seite zur Verweildauer auf dem Betrieb und auf den Plätzen."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(10, 20, 10, 10)
+        layout.setSpacing(20)
+
+        kpi_layout = QHBoxLayout()
+        kpi_layout.setSpacing(20)
+        card, self.dwell_betrieb_label = self._create_kpi_card("Zeit auf dem Betrieb (Median)")
+        kpi_layout.addWidget(card)
+        card, self.dwell_zugaenge_label = self._create_kpi_card("Zugänge letzte 4 Wochen")
+        kpi_layout.addWidget(card)
+        card, self.dwell_platz_label = self._create_kpi_card("Standzeit auf dem Platz (Median)")
+        kpi_layout.addWidget(card)
+        card, self.dwell_laengste_label = self._create_kpi_card("Längste Standzeit")
+        kpi_layout.addWidget(card)
+        layout.addLayout(kpi_layout)
+
+        chart_grid = QGridLayout()
+        chart_grid.setSpacing(20)
+        self.chart_betriebszeit = BarChart("Zeit auf dem Betrieb", "#16a085")
+        self.chart_zugaenge = BarChart("Zugänge je Woche", "#2980b9")
+        self.chart_standzeit = BarChart("Standzeit auf dem Platz", "#d35400")
+        self.chart_standzeit_bereich = BarChart("Standzeit je Bereich (Median, Tage)", "#7f8c8d")
+        for n, chart in enumerate((self.chart_betriebszeit, self.chart_zugaenge,
+                                   self.chart_standzeit, self.chart_standzeit_bereich)):
+            card = QFrame()
+            card.setObjectName("Card")
+            card_layout = QVBoxLayout(card)
+            card_layout.addWidget(chart)
+            chart_grid.addWidget(card, n // 2, n % 2)
+        layout.addLayout(chart_grid)
+
+        self.dwell_hinweis_label = QLabel()
+        self.dwell_hinweis_label.setObjectName("SubtitleLabel")
+        layout.addWidget(self.dwell_hinweis_label)
+
         return page
 
     def _create_scroll_area_with_grid(self) -> tuple[QScrollArea, QGridLayout]:
@@ -317,12 +660,40 @@ class Ui_MainWindow(object):
                 font-weight: bold;
                 color: #34495e;
             }
+            #KpiValue {
+                font-size: 26px;
+                font-weight: bold;
+                color: #2c3e50;
+            }
+            #ProfilerOverlay {
+                background-color: rgba(20, 30, 40, 200);
+                color: #ecf0f1;
+                border-radius: 6px;
+                padding: 8px;
+                font-size: 12px;
+            }
             #PlatzFreiLabel {
                 font-size: 16px;
                 font-style: italic;
                 color: #95a5a6;
             }
 
+            /* --- Suche in der Kopfzeile --- */
+            QLineEdit#SearchEdit {
+                padding: 8px;
+                font-size: 14px;
+                border: 1px solid #bdc3c7;
+                border-radius: 5px;
+                background-color: white;
+            }
+            QLineEdit#SearchEdit:focus {
+                border-color: #3498db;
+            }
+            QLabel#SearchResultLabel {
+                font-size: 12px;
+                color: #7f8c8d;
+            }
+
             /* --- Buttons in der Kopfzeile --- */
             QPushButton#HeaderButton {
                 background-color: #34495e;
@@ -371,6 +742,52 @@ class Ui_MainWindow(object):
                 border-radius: 8px;
             }
 
+            /* --- Stallkarten (Einzelplätze & Gruppenboxen), Zustand über Eigenschaft `state` --- */
+            QFrame#SlotCard {
+                background-color: #ffffff; /* expliziter Hintergrund, sonst scheint unter macOS das System durch */
+                border: 1px solid #e6e9ea;
+                border-radius: 10px;
+            }
+            QFrame#SlotCard[state="not_found"] {
+                border-color: #f5b7b1;
+            }
+            QFrame#SlotCard[highlight="true"] {
+                border: 2px solid #f39c12;
+            }
+            #SlotTitle {
+                font-size: 14px;
+                font-weight: bold;
+            }
+            #InfoValue {
+                font-weight: bold;
+            }
+            #BoxStatus {
+                color: #7f8c8d;
+            }
+            QFrame#BoxDivider {
+                color: #ecf0f1;
+            }
+            QLabel#SlotMessage[state="free"] {
+                color: #95a5a6;
+                font-style: italic;
+                padding-top: 6px;
+                padding-bottom: 6px;
+            }
+            QLabel#SlotMessage[state="not_found"] {
+                color: #c0392b;
+            }
+
+            /* --- Zeilenzähler im Eingabedialog --- */
+            QLabel#LineCountLabel {
+                color: #7f8c8d;
+            }
+            QLabel#LineCountLabel[state="warn"] {
+                color: #e67e22;
+            }
+            QLabel#LineCountLabel[state="ok"] {
+                color: #2ecc71;
+            }
+
             /* --- Scroll-Area --- */
             QScrollArea#ScrollArea {
                 border: none;